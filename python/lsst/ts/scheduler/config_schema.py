@@ -619,6 +619,25 @@ definitions:
                   anyOf:
                     - type: "null"
                     - type: number
+                change_tolerance:
+                  description: >-
+                    Absolute change in the telemetry value that does not
+                    require regenerating the targets generated ahead of time,
+                    in addition to the relative speculative_target_tolerance.
+                  type: number
+                  minimum: 0
+                  default: 0
+                period:
+                  description: >-
+                    Period of the telemetry value, for angles (e.g. 360 for a
+                    direction in degrees). Changes are computed with
+                    wrap-around and only the change_tolerance applies. If
+                    null, the value is not periodic.
+                  anyOf:
+                    - type: "null"
+                    - type: number
+                      exclusiveMinimum: 0
+                  default: null
       driver_type:
         description: >-
           Choose a driver to use from the available options.
@@ -650,6 +669,35 @@ definitions:
               Path to the observations database. This is an sqlite database the
               feature scheduler uses to store its observations history.
             type: string
+          profile_rewards:
+            description: >-
+              Time the reward computation of each survey and basis function
+              and periodically log the most expensive ones. This adds some
+              overhead to each request for observations.
+            type: boolean
+          reward_profile_window:
+            description: >-
+              Number of requests for observations in the rolling window used
+              to rank the surveys and basis functions. A summary is logged
+              every time this number of requests is made.
+            type: integer
+            minimum: 1
+          reward_profile_top:
+            description: Number of surveys and basis functions in the summary.
+            type: integer
+            minimum: 1
+          slew_time_table_resolution:
+            description: >-
+              Resolution (in degrees) of the altitude and azimuth grid of the
+              slew time lookup table. The approximate slew times to the grid
+              are computed once per filter each time the observatory state
+              changes and interpolated to compute the slew time map in the
+              conditions and to validate the targets, instead of computing the
+              slew to each target. Only the telescope altitude limits are
+              checked when validating the targets. If zero, the table is not
+              used.
+            type: number
+            minimum: 0
       driver_configuration:
         description: >-
           Configuration section dedicated to the driver. This is a dictionary with
@@ -682,6 +730,16 @@ definitions:
               cwfs_block_name:
                 description: Name of the CWFS block.
                 type: string
+              max_airmass:
+                description: >-
+                  Maximum airmass for targets generated ahead of time to
+                  remain valid.
+                type: number
+              max_sky_brightness_change:
+                description: >-
+                  Maximum increase in sky brightness (mag/arcsec^2) for
+                  targets generated ahead of time to remain valid.
+                type: number
           stop_tracking_observing_script_name:
             description: >-
               Name of the SAL script used to stop the telescope if there is no
@@ -707,7 +765,9 @@ definitions:
       mode:
         description: >-
           The mode of operation of the scheduler. This basically chooses one of
-          the available target production loops.
+          the available target production loops. In DRY mode the observations
+          are simulated as fast as possible, without the ScriptQueue, and
+          written to an opsim database; see dry_run.
         type: string
         enum:
         - SIMPLE
@@ -736,6 +796,44 @@ definitions:
       max_scripts:
         description: Maximum number of scripts to keep track of
         type: integer
+      max_concurrent_script_adds:
+        description: >-
+          Maximum number of scripts from a block being added to the ScriptQueue
+          concurrently. If 1, scripts are added one at a time. If the
+          ScriptQueue does not preserve the order of the scripts, the Scheduler
+          falls back to adding scripts one at a time.
+        type: integer
+        minimum: 1
+      script_add_rate:
+        description: >-
+          Maximum number of scripts added to the ScriptQueue per second. If 0,
+          there is no limit.
+        type: number
+        minimum: 0
+      speculative_target_tolerance:
+        description: >-
+          Targets are generated ahead of time, while the scheduled targets
+          execute. Before they are sent to the ScriptQueue, the telemetry is
+          refreshed and, if any value changed by more than this fraction, the
+          targets are regenerated. If 0, targets are regenerated on any change.
+        type: number
+        minimum: 0
+      telemetry_refresh_interval:
+        description: >-
+          How often to refresh the telemetry and the driver conditions while
+          the Scheduler is idle (in seconds). The general information is
+          published every heartbeat from the last night boundaries computed.
+          If 0, the telemetry is not refreshed while idle.
+        type: number
+        minimum: 0
+      loop_monitor_interval:
+        description: >-
+          How often to log statistics of the event loop lag and of the number
+          of calls waiting for an executor thread (in seconds). A warning is
+          also logged when the event loop is blocked long enough to put the
+          heartbeat at risk. If 0, the event loop is not monitored.
+        type: number
+        minimum: 0
       path_observing_blocks:
         description: >-
           Path to the directory containing the observing blocks definition.
@@ -775,6 +873,96 @@ definitions:
             type: array
             items:
               type: string
+      predicted_schedule_ensemble:
+        type: object
+        description: >-
+          Compute the predicted schedule under several weather scenarios, in
+          addition to the nominal predicted schedule.
+        additionalProperties: false
+        properties:
+          n_scenarios:
+            description: >-
+              Number of weather scenarios. If 0, only the nominal predicted
+              schedule is computed.
+            type: integer
+            minimum: 0
+          seeing_sigma:
+            description: Standard deviation of the log of the seeing scale factor.
+            type: number
+            minimum: 0
+          cloud_sigma:
+            description: Standard deviation of the bulk cloud coverage offset.
+            type: number
+            minimum: 0
+          mounted_filters:
+            description: >-
+              Alternative sets of mounted filters the scenarios cycle through.
+            type: array
+            items:
+              type: array
+              items:
+                type: string
+          max_workers:
+            description: Maximum number of processes used to compute the scenarios.
+            type: integer
+            minimum: 1
+          seed:
+            description: Seed for the random number generator.
+            type: integer
+      tracing:
+        type: object
+        description: >-
+          Record the duration of the stages of the target production, such as
+          updating the conditions, requesting observations and adding scripts
+          to the ScriptQueue.
+        additionalProperties: false
+        properties:
+          enable:
+            description: Record the duration of the stages?
+            type: boolean
+          filename:
+            description: >-
+              File to export the recorded spans to, in the Chrome trace event
+              format, which can be opened with Perfetto. Duration histograms
+              are included in the "otherData" entry.
+            type: string
+          max_events:
+            description: Maximum number of spans kept in memory.
+            type: integer
+            minimum: 1
+          export_interval:
+            description: How often to export the recorded spans (in seconds).
+            type: number
+            exclusiveMinimum: 0
+      dry_run:
+        type: object
+        description: >-
+          Configuration for the DRY mode, where the scheduler runs the target
+          production against a simulated clock and observatory state, instead
+          of the ScriptQueue, and writes the resulting schedule to an opsim
+          database.
+        additionalProperties: false
+        properties:
+          start_time:
+            description: >-
+              Time to start the simulation (TAI unix seconds). If zero, start
+              now or, if it is daytime, at the next sunset.
+            type: number
+            minimum: 0
+          duration:
+            description: >-
+              How long to simulate (in hours). If zero, simulate until the end
+              of the night.
+            type: number
+            minimum: 0
+          output_database:
+            description: Opsim database to write the simulated observations to.
+            type: string
+          reset_state:
+            description: >-
+              Reset the scheduler to its state before the simulation when it is
+              done?
+            type: boolean
 type: object
 additionalProperties: false
 properties:
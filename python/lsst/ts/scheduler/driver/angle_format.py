@@ -0,0 +1,181 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = ["format_ra", "format_dec"]
+
+import math
+import typing
+
+import numpy as np
+from astropy import units
+
+# Conversion factor used by astropy when converting degrees to hourangle. Use
+# the same value so the formatted strings are identical.
+DEGREE_TO_HOURANGLE = units.degree.to(units.hourangle)
+
+# Seconds values larger than this are rounded up to the next minute.
+SECONDS_ROUNDING_THRESHOLD = 60.0 - 1e-8
+
+
+def format_ra(ra: float | typing.Sequence[float] | np.ndarray) -> str | np.ndarray:
+    """Format right ascension as a colon-separated sexagesimal string.
+
+    This is equivalent to ``Angle(ra, unit=units.degree).to_string(
+    unit=units.hourangle, sep=":", alwayssign=True)``, but works directly with
+    numpy arrays, which makes it much faster, especially when formatting many
+    values at once.
+
+    Parameters
+    ----------
+    ra : `float` or array-like
+        Right ascension (degrees).
+
+    Returns
+    -------
+    `str` or `np.ndarray` [`str`]
+        Right ascension as sexagesimal string (+HH:MM:SS.S). If the input is
+        an array, return an array of strings with the same shape.
+    """
+    if np.ndim(ra) == 0:
+        return format_sexagesimal_scalar(float(ra) * DEGREE_TO_HOURANGLE)
+    return format_sexagesimal(np.asarray(ra, dtype=float) * DEGREE_TO_HOURANGLE)
+
+
+def format_dec(dec: float | typing.Sequence[float] | np.ndarray) -> str | np.ndarray:
+    """Format declination as a colon-separated sexagesimal string.
+
+    This is equivalent to ``Angle(dec, unit=units.degree).to_string(
+    unit=units.degree, sep=":", alwayssign=True)``.
+
+    Parameters
+    ----------
+    dec : `float` or array-like
+        Declination (degrees).
+
+    Returns
+    -------
+    `str` or `np.ndarray` [`str`]
+        Declination as sexagesimal string (+DD:MM:SS.S). If the input is an
+        array, return an array of strings with the same shape.
+    """
+    if np.ndim(dec) == 0:
+        return format_sexagesimal_scalar(float(dec))
+    return format_sexagesimal(np.asarray(dec, dtype=float))
+
+
+def format_sexagesimal_scalar(value: float) -> str:
+    """Format a single value as a colon-separated sexagesimal string, always
+    with a sign.
+
+    This is the scalar counterpart of `format_sexagesimal`, which avoids the
+    overhead of numpy arrays when formatting a single value.
+
+    Parameters
+    ----------
+    value : `float`
+        Value to format, in the unit of the first field (e.g. degrees or
+        hours).
+
+    Returns
+    -------
+    `str`
+        Formatted value.
+    """
+    if math.isnan(value):
+        return "nan"
+
+    fraction, first = math.modf(math.fabs(value))
+    fraction, second = math.modf(fraction * 60.0)
+    third = fraction * 60.0
+
+    if third >= SECONDS_ROUNDING_THRESHOLD:
+        third = 0.0
+        second += 1.0
+    if second >= 60.0:
+        second = 0.0
+        first += 1.0
+
+    third_str = f"{third:.8f}".rstrip("0").rstrip(".")
+    if len(third_str) == 1 or third_str[1] == ".":
+        third_str = "0" + third_str
+
+    sign = "-" if math.copysign(1.0, value) < 0.0 else "+"
+
+    return f"{sign}{int(first)}:{int(second):02d}:{third_str}"
+
+
+def format_sexagesimal(values: np.ndarray) -> str | np.ndarray:
+    """Format values as colon-separated sexagesimal strings, always with a
+    sign.
+
+    Seconds are formatted with up to 8 decimal places, removing trailing
+    zeros, following the astropy convention.
+
+    Parameters
+    ----------
+    values : `np.ndarray`
+        Values to format, in the unit of the first field (e.g. degrees or
+        hours).
+
+    Returns
+    -------
+    `str` or `np.ndarray` [`str`]
+        Formatted values.
+    """
+    is_nan = np.isnan(values)
+    values = np.where(is_nan, 0.0, values)
+
+    sign = np.copysign(1.0, values)
+    fraction, first = np.modf(np.fabs(values))
+    fraction, second = np.modf(fraction * 60.0)
+    third = fraction * 60.0
+
+    carry = third >= SECONDS_ROUNDING_THRESHOLD
+    third = np.where(carry, 0.0, third)
+    second = second + carry
+
+    carry = second >= 60.0
+    second = np.where(carry, 0.0, second)
+    first = first + carry
+
+    third_str = np.char.rstrip(np.char.rstrip(np.char.mod("%.8f", third), "0"), ".")
+    decimal_point = np.char.find(third_str, ".")
+    third_str = np.where(
+        (decimal_point == 1)
+        | ((decimal_point == -1) & (np.char.str_len(third_str) == 1)),
+        np.char.add("0", third_str),
+        third_str,
+    )
+
+    formatted = np.char.add(
+        np.char.add(
+            np.char.add(
+                np.where(sign < 0.0, "-", "+"),
+                np.char.mod("%d", first.astype(np.int64)),
+            ),
+            np.char.add(":", np.char.mod("%02d", second.astype(np.int64))),
+        ),
+        np.char.add(":", third_str),
+    )
+    formatted = np.where(is_nan, "nan", formatted)
+
+    return str(formatted) if formatted.ndim == 0 else formatted
@@ -19,6 +19,7 @@
 # You should have received a copy of the GNU General Public License
 
 import logging
+import math
 import os
 import types
 import typing
@@ -49,12 +50,16 @@ class DriverParameters:
     night_boundary: float = -12.0
     new_moon_phase_threshold: float = 20.0
     cwfs_block_name: str = "cwfs"
+    max_airmass: float = 2.5
+    max_sky_brightness_change: float = 0.5
 
     def setDefaults(self) -> None:
         """Set defaults for the LSST Scheduler's Driver."""
         self.night_boundary = -12.0
         self.new_moon_phase_threshold = 20.0
         self.cwfs_block_name = "cwfs"
+        self.max_airmass = 2.5
+        self.max_sky_brightness_change = 0.5
 
 
 class Driver:
@@ -348,6 +353,66 @@ class Driver:
 
         return [self.select_next_target()]
 
+    def get_first_invalid_target(self, targets: list[DriverTarget]) -> int:
+        """Find the first target, in a list of targets waiting to be queued,
+        that is no longer valid.
+
+        The targets are played back, in order, on the observatory model,
+        starting from its current state, and re-evaluated at the time they
+        would be observed, see `_is_queued_target_valid`.
+
+        Parameters
+        ----------
+        targets : `list` [`DriverTarget`]
+            Targets, in the order they will be observed.
+
+        Returns
+        -------
+        `int`
+            Index of the first invalid target, or the number of targets if they
+            are all still valid.
+        """
+        for index, target in enumerate(targets):
+            if not self._is_queued_target_valid(target):
+                return index
+            self.models["observatory_model"].observe(target)
+
+        return len(targets)
+
+    def _is_queued_target_valid(self, target: DriverTarget) -> bool:
+        """Check if a target waiting to be queued is still valid.
+
+        The base implementation checks that the observatory can slew to the
+        target and that its airmass is below ``max_airmass``.
+
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Target to check.
+
+        Returns
+        -------
+        `bool`
+            True if the target is valid.
+        """
+        _, error = self.models["observatory_model"].get_slew_delay(target)
+
+        if error > 0:
+            self.log.info(f"Error[{error}]: Cannot slew to queued target {target!s}.")
+            return False
+
+        if (
+            target.alt_rad <= 0.0
+            or 1.0 / math.sin(target.alt_rad) > self.parameters.max_airmass
+        ):
+            self.log.info(
+                f"Queued target {target!s} above maximum airmass "
+                f"({self.parameters.max_airmass})."
+            )
+            return False
+
+        return True
+
     def register_observed_target(self, target: DriverTarget) -> Observation:
         """Validates observed target and returns an observation.
 
@@ -501,12 +566,15 @@ class Driver:
         Returns
         -------
         observing.ObservingBlock
-            Survey observing block.
+            Survey observing block. This is the block template shared by all
+            targets of the survey and must not be modified; use
+            `DriverTarget.get_observing_block` to obtain the block with the
+            target-specific script parameters.
         """
 
         self.assert_survey_observing_script(survey_name=survey_name)
 
-        return self.observing_blocks[survey_name].copy(deep=True)
+        return self.observing_blocks[survey_name]
 
     def convert_efd_observations_to_targets(
         self, efd_observations: pandas.DataFrame
@@ -19,21 +19,51 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
 import logging
 import os
 import typing
-from string import Template
 
 import numpy as np
 import yaml
-from astropy import units
-from astropy.coordinates import Angle
 from lsst.ts.observatory.model import Target
 from lsst.ts.observing import ObservingBlock
 from lsst.ts.salobj import DefaultingValidator
 
 from ..exceptions.exceptions import NonConsecutiveIndexError
+from .angle_format import format_dec, format_ra
 from .observation import Observation
+from .script_configuration_template import get_script_configuration_templates
+
+_BLOCK_CONFIGURATION_VALIDATORS: dict[str, DefaultingValidator] = dict()
+
+
+def get_block_configuration_validator(
+    configuration_schema: str,
+) -> DefaultingValidator:
+    """Get a validator for an observing block configuration schema.
+
+    Validators are cached process-wide, keyed by the hash of the schema, so
+    that targets sharing the same block schema do not have to parse the
+    schema and build a new validator every time.
+
+    Parameters
+    ----------
+    configuration_schema : `str`
+        Observing block configuration schema, in yaml format.
+
+    Returns
+    -------
+    `DefaultingValidator`
+        Validator for the configuration schema.
+    """
+    schema_hash = hashlib.sha256(configuration_schema.encode()).hexdigest()
+
+    if (validator := _BLOCK_CONFIGURATION_VALIDATORS.get(schema_hash)) is None:
+        validator = DefaultingValidator(schema=yaml.safe_load(configuration_schema))
+        _BLOCK_CONFIGURATION_VALIDATORS[schema_hash] = validator
+
+    return validator
 
 
 class DriverTarget(Target):
@@ -45,7 +75,10 @@ class DriverTarget(Target):
     Parameters
     ----------
     observing_block : ObservingBlock
-        Observing block for this target.
+        Observing block for this target. The block is treated as a read-only
+        template and may be shared by many targets; the script parameters
+        for this target are only materialized, in a separate copy, when
+        `get_observing_block` is called.
     targetid : int
         A unique identifier for the given target.
     fieldid : int
@@ -90,6 +123,7 @@ class DriverTarget(Target):
             self.log = log.getChild(type(self).__name__)
 
         self.observing_block = observing_block
+        self._formatted_observing_block: ObservingBlock | None = None
         self.obs_time = obs_time
         super().__init__(
             targetid=targetid,
@@ -109,9 +143,8 @@ class DriverTarget(Target):
         self._scheduler_state_filename = ""
 
         if observing_block.configuration_schema:
-
-            block_configuration_validator = DefaultingValidator(
-                schema=yaml.safe_load(observing_block.configuration_schema)
+            block_configuration_validator = get_block_configuration_validator(
+                observing_block.configuration_schema
             )
             self.block_configuration = block_configuration_validator.validate(
                 block_configuration
@@ -152,10 +185,21 @@ class DriverTarget(Target):
                 f"Got {sal_index}, currently with {self._sal_indices}."
             )
 
-    def format_config(self) -> None:
+    def format_config(self) -> ObservingBlock:
         """Format the observing scripts configuration using the information
         for the driver.
 
+        The observing block template is left untouched. Instead, a shallow
+        copy of the block is returned, where only the scripts are replaced by
+        copies with the formatted parameters. The script configurations are
+        compiled once per block (see `get_script_configuration_templates`),
+        so formatting does not need to parse the configurations again.
+
+        Returns
+        -------
+        `ObservingBlock`
+            Observing block with the formatted script parameters.
+
         Raises
         ------
         RuntimeError
@@ -163,22 +207,24 @@ class DriverTarget(Target):
             `RuntimeError`.
         """
         script_config = self.get_script_config()
-        for observing_script in self.observing_block.scripts:
-            observing_script_config = observing_script.get_script_configuration()
+        scripts = []
+        for observing_script, script_configuration_template in zip(
+            self.observing_block.scripts,
+            get_script_configuration_templates(self.observing_block),
+        ):
             try:
-                observing_script_config = Template(observing_script_config).substitute(
-                    **script_config
-                )
-                observing_script.parameters = yaml.safe_load(
-                    Template(observing_script_config).substitute(**script_config)
-                )
+                parameters = script_configuration_template.format(script_config)
             except Exception:
                 self.log.exception(
                     f"Error parsing script configuration for observing block: {self.observing_block}."
                 )
                 raise RuntimeError(
-                    f"Failed to parse configuration: {observing_script_config}"
+                    "Failed to parse configuration: "
+                    f"{observing_script.get_script_configuration()}"
                 )
+            scripts.append(observing_script.copy(update=dict(parameters=parameters)))
+
+        return self.observing_block.copy(update=dict(scripts=scripts))
 
     def get_script_config(self) -> dict:
         """Returns a dictionary with the parameters to be used for the
@@ -223,12 +269,7 @@ class DriverTarget(Target):
         `str`
             Declination as hexagesimal string (DD:MM:SS.S).
         """
-        dec = str(
-            Angle(self.dec, unit=units.degree).to_string(
-                unit=units.degree, sep=":", alwayssign=True
-            )
-        )
-        return f"{dec!r}"
+        return f"{format_dec(self.dec)!r}"
 
     def get_ra(self) -> str:
         """Get right right ascension formatted as a colon-separated hexagesimal
@@ -242,12 +283,7 @@ class DriverTarget(Target):
         `str`
             Right ascension as hexagesimal string (HH:MM:SS.S).
         """
-        ra = str(
-            Angle(self.ra, unit=units.degree).to_string(
-                unit=units.hourangle, sep=":", alwayssign=True
-            )
-        )
-        return f"{ra!r}"
+        return f"{format_ra(self.ra)!r}"
 
     def get_target_name(self) -> str:
         """Parse the note field to get the target name.
@@ -262,13 +298,18 @@ class DriverTarget(Target):
     def get_observing_block(self) -> ObservingBlock:
         """Get observing block for this target.
 
+        The script parameters are materialized the first time this method is
+        called (usually when the target is put on the queue) and the result
+        is cached for subsequent calls.
+
         Returns
         -------
         `ObservingBlock`
             Observing Block.
         """
-        self.format_config()
-        return self.observing_block
+        if self._formatted_observing_block is None:
+            self._formatted_observing_block = self.format_config()
+        return self._formatted_observing_block
 
     def get_filter_name(self) -> str:
         """Get the name of the filter.
@@ -20,8 +20,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import asyncio
+import contextlib
+import copy
 import functools
 import importlib
+import itertools
 import math
 import os
 import pathlib
@@ -42,10 +45,13 @@ from rubin_scheduler.utils import _ra_dec2_hpid
 
 from ..lfa_client import DreamCloudMap
 from ..utils.fbs_utils import SchemaConverter, make_fbs_observation_from_target
+from ..utils.tracing import tracer
 from . import Driver, DriverParameters
 from .driver_target import DriverTarget
 from .feature_scheduler_target import FeatureSchedulerTarget
 from .observation import Observation
+from .reward_profiler import RewardProfiler
+from .slew_time_table import SlewTimeTable, radec2altaz
 
 __all__ = ["FeatureScheduler", "NoSchedulerError", "NoNsideError"]
 
@@ -111,6 +117,12 @@ class FeatureScheduler(Driver):
 
         self.schema_converter = SchemaConverter()
 
+        # Profiler of the survey rewards computation, None if disabled.
+        self.reward_profiler: RewardProfiler | None = None
+
+        # Lookup table of the slew times, None if disabled.
+        self.slew_time_table: SlewTimeTable | None = None
+
         super().__init__(
             models=models,
             raw_telemetry=raw_telemetry,
@@ -119,6 +131,21 @@ class FeatureScheduler(Driver):
             log=log,
         )
 
+    def __getstate__(self) -> dict[str, typing.Any]:
+        """Get the driver state for pickling.
+
+        The target id generator cannot be pickled, it is restarted when the
+        driver is unpickled.
+        """
+        state = self.__dict__.copy()
+        del state["index_gen"]
+        return state
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        """Restore the driver state when unpickling."""
+        self.__dict__.update(state)
+        self.index_gen = index_generator()
+
     def configure_scheduler(self, config=None):
         """This method is responsible for running the scheduler configuration
         and returning the survey topology, which specifies the number, name
@@ -146,6 +173,8 @@ class FeatureScheduler(Driver):
 
         self._desired_obs = None
         scheduler_config = self._pre_check_config(config=config)
+        self._configure_reward_profiler(config=config)
+        self._configure_slew_time_table(config=config)
 
         if self.scheduler is None:
             self.log.info(
@@ -197,6 +226,8 @@ class FeatureScheduler(Driver):
 
         self._desired_obs = None
         scheduler_config = self._pre_check_config(config=config)
+        self._configure_reward_profiler(config=config)
+        self._configure_slew_time_table(config=config)
 
         if self.scheduler is None:
             self.log.info(
@@ -275,12 +306,15 @@ class FeatureScheduler(Driver):
     def update_conditions(self):
         """Update conditions on the scheduler."""
 
-        super().update_conditions()
+        with tracer.span("update_conditions"):
+            super().update_conditions()
 
-        self._format_conditions()
+            with tracer.span("format_conditions"):
+                self._format_conditions()
 
-        # Update conditions on the scheduler
-        self.scheduler.update_conditions(self.conditions)
+            # Update conditions on the scheduler
+            with tracer.span("scheduler.update_conditions"):
+                self.scheduler.update_conditions(self.conditions)
 
         # Set time for next observation based on the current time on the
         # observatory model, which accounts for current observations on the
@@ -301,20 +335,24 @@ class FeatureScheduler(Driver):
                 "Time for next observation not set. Call `update_conditions` before requesting a target."
             )
 
-        desired_obs = (
-            self.scheduler.request_observation(mjd=self.next_observation_mjd)
-            if self._desired_obs is None
-            else self._desired_obs
-        )
+        with tracer.span("request_observation"), self._profile_request():
+            desired_obs = (
+                self.scheduler.request_observation(mjd=self.next_observation_mjd)
+                if self._desired_obs is None
+                else self._desired_obs
+            )
 
-        return self._handle_desired_observation(desired_observation=desired_obs)
+        with tracer.span("validate_observation"):
+            return self._handle_desired_observation(desired_observation=desired_obs)
 
     def select_next_targets(self) -> list[FeatureSchedulerTarget]:
         """Pick a target and return it as a list of target objects.
 
         Instead of requesting a single target like `select_next_target`, this
         method will inquire the scheduling algorithm for a list of potential
-        next targets.
+        next targets. The candidates are validated in batch and candidates
+        that fail validation are dropped from the list, without discarding
+        the others.
 
         Returns
         -------
@@ -327,24 +365,34 @@ class FeatureScheduler(Driver):
                 "Call `update_conditions` before requesting a target."
             )
 
-        observations = self.scheduler.request_observation(
-            mjd=self.next_observation_mjd, whole_queue=True
-        )
+        with tracer.span(
+            "request_observation", whole_queue=True
+        ), self._profile_request():
+            observations = self.scheduler.request_observation(
+                mjd=self.next_observation_mjd, whole_queue=True
+            )
 
         if observations is None:
             return None
 
-        desired_observations = []
-        for observation in observations:
-            desired_observations.append(
-                self._handle_desired_observation(desired_observation=observation)
+        with tracer.span("validate_observation", n_observations=len(observations)):
+            desired_targets = self._get_validated_targets_from_observations(
+                observations
             )
 
-            if self._desired_obs is not None:
-                desired_observations.append(
-                    self._get_validated_target_from_observation(self._desired_obs)
-                )
+        desired_observations = []
+        for observation, desired_target in zip(observations, desired_targets):
+            if desired_target is None:
+                # Skip candidates that fail validation but keep the others.
                 self._desired_obs = None
+                continue
+            elif self._check_need_cwfs(desired_target):
+                self.log.debug(f"Scheduling cwfs observation before {desired_target}.")
+                cwfs_target = self._get_cwfs_target_for_observation(observation)
+                if cwfs_target is not None:
+                    desired_observations.append(cwfs_target)
+            desired_observations.append(desired_target)
+            self._desired_obs = None
 
         return desired_observations
 
@@ -386,6 +434,8 @@ class FeatureScheduler(Driver):
         """Validate a feature based scheduler observation and convert it to a
         Target.
 
+        If the observation fails validation, the scheduler queue is flushed.
+
         Parameters
         ----------
         desired_observation : `np.array`
@@ -396,73 +446,386 @@ class FeatureScheduler(Driver):
         Target
         """
 
-        observing_block = self.get_survey_observing_block(
-            self._get_survey_name_from_observation(observation)
-        )
+        (target,) = self._get_validated_targets_from_observations([observation])
 
-        target = FeatureSchedulerTarget(
-            observing_block=observing_block,
-            observation=observation,
-            log=self.log,
-        )
+        if target is None:
+            self.scheduler.flush_queue()
+
+        return target
+
+    def _get_validated_targets_from_observations(
+        self, observations
+    ) -> list[FeatureSchedulerTarget | None]:
+        """Validate a list of feature based scheduler observations and convert
+        them to Targets.
+
+        The slew time is computed for each observation individually, unless
+        the slew time table is enabled, in which case the slew times are
+        interpolated from the table for all the observations at once. The
+        healpix ids, sky brightness, seeing and airmass lookups are done for
+        all the valid observations at once.
 
-        slew_time, error = self.models["observatory_model"].get_slew_delay(target)
+        Parameters
+        ----------
+        observations : `list` [`np.array`]
+            Feature based scheduler observations.
+
+        Returns
+        -------
+        `list` [`FeatureSchedulerTarget` | `None`]
+            Validated targets, with `None` for the observations that fail
+            validation.
+        """
 
-        if error > 0:
-            observatory_state = self.models["observatory_model"].current_state
-            self.log.error(
-                f"Error[{error}]: Cannot slew to target @ ra={target.ra}, dec={target.dec}.\n"
-                f"target={target}.\n"
-                f"{observation=}.\n"
-                f"Observatory State:{observatory_state}.\n"
+        if self.slew_time_table is not None:
+            targets, valid_targets, slew_times = (
+                self._get_targets_slew_times_from_table(observations)
             )
-            self.scheduler.flush_queue()
-            return None
         else:
-            target.slewtime = slew_time
+            targets, valid_targets, slew_times = self._get_targets_slew_times(
+                observations
+            )
+
+        if not valid_targets:
+            return targets
 
-            target.observation["mjd"] = (
-                self.conditions.mjd + slew_time / 60.0 / 60.0 / 24.0
+        hpids = np.atleast_1d(
+            _ra_dec2_hpid(
+                self.nside,
+                np.array([target.ra_rad for target in valid_targets]),
+                np.array([target.dec_rad for target in valid_targets]),
             )
-            target.observation["night"] = self.conditions.night
-            target.observation["slewtime"] = slew_time
+        )
 
-            hpid = _ra_dec2_hpid(self.nside, target.ra_rad, target.dec_rad)
-
-            effective_filter_name = target.filter
-            if effective_filter_name not in self.conditions.skybrightness:
-                for filter_name in self.conditions.skybrightness:
-                    if filter_name in effective_filter_name:
-                        self.log.debug(
-                            f"Using effective filter name {filter_name} instead of {effective_filter_name}."
-                        )
-                        effective_filter_name = filter_name
-                        break
-                else:
-                    available_filters = list(self.conditions.skybrightness.keys())
-                    mid_range = int(len(available_filters) / 2)
-                    effective_filter_name = available_filters[mid_range]
-                    self.log.warning(
-                        f"Could not find effective filter name for {target.filter} in {available_filters},"
-                        f"using mid range {effective_filter_name}."
-                    )
+        effective_filter_names = dict()
+        for target in valid_targets:
+            if target.filter not in effective_filter_names:
+                effective_filter_names[target.filter] = self._get_effective_filter_name(
+                    target.filter
+                )
+        effective_filters = np.array(
+            [effective_filter_names[target.filter] for target in valid_targets]
+        )
 
-            target.observation["skybrightness"] = self.conditions.skybrightness[
-                effective_filter_name
-            ][hpid]
-            target.observation["FWHMeff"] = self.conditions.fwhm_eff[
-                effective_filter_name
-            ][hpid]
-            target.observation["airmass"] = self.conditions.airmass[hpid]
+        skybrightness = np.empty(len(valid_targets))
+        fwhm_eff = np.empty(len(valid_targets))
+        for effective_filter_name in set(effective_filter_names.values()):
+            mask = effective_filters == effective_filter_name
+            skybrightness[mask] = self.conditions.skybrightness[effective_filter_name][
+                hpids[mask]
+            ]
+            fwhm_eff[mask] = self.conditions.fwhm_eff[effective_filter_name][
+                hpids[mask]
+            ]
+
+        airmass = self.conditions.airmass[hpids]
+        mjd = self.conditions.mjd + np.array(slew_times) / 60.0 / 60.0 / 24.0
+
+        for i, (target, slew_time) in enumerate(zip(valid_targets, slew_times)):
+            target.slewtime = slew_time
+
+            target.observation["mjd"] = mjd[i]
+            target.observation["night"] = self.conditions.night
+            target.observation["slewtime"] = slew_time
+            target.observation["skybrightness"] = skybrightness[i]
+            target.observation["FWHMeff"] = fwhm_eff[i]
+            target.observation["airmass"] = airmass[i]
             target.observation["alt"] = target.alt_rad
             target.observation["az"] = target.az_rad
             target.observation["clouds"] = self.conditions.bulk_cloud
 
-            target.slewtime = slew_time
             target.airmass = target.observation["airmass"][0]
             target.sky_brightness = target.observation["skybrightness"][0]
 
-            return target
+        return targets
+
+    def _get_targets_slew_times(
+        self, observations
+    ) -> tuple[
+        list[FeatureSchedulerTarget | None], list[FeatureSchedulerTarget], list[float]
+    ]:
+        """Convert feature based scheduler observations to Targets and
+        compute the slew time to each of them with the observatory model.
+
+        Parameters
+        ----------
+        observations : `list` [`np.array`]
+            Feature based scheduler observations.
+
+        Returns
+        -------
+        targets : `list` [`FeatureSchedulerTarget` | `None`]
+            Targets, with `None` for the observations that cannot be reached.
+        valid_targets : `list` [`FeatureSchedulerTarget`]
+            Targets that can be reached.
+        slew_times : `list` [`float`]
+            Slew time to each valid target (seconds).
+        """
+        targets = []
+        valid_targets = []
+        slew_times = []
+
+        for observation in observations:
+            observing_block = self.get_survey_observing_block(
+                self._get_survey_name_from_observation(observation)
+            )
+
+            target = FeatureSchedulerTarget(
+                observing_block=observing_block,
+                observation=observation,
+                log=self.log,
+            )
+
+            slew_time, error = self.models["observatory_model"].get_slew_delay(target)
+
+            if error > 0:
+                observatory_state = self.models["observatory_model"].current_state
+                self.log.error(
+                    f"Error[{error}]: Cannot slew to target @ ra={target.ra}, dec={target.dec}.\n"
+                    f"target={target}.\n"
+                    f"{observation=}.\n"
+                    f"Observatory State:{observatory_state}.\n"
+                )
+                targets.append(None)
+            else:
+                targets.append(target)
+                valid_targets.append(target)
+                slew_times.append(slew_time)
+
+        return targets, valid_targets, slew_times
+
+    def _get_targets_slew_times_from_table(
+        self, observations
+    ) -> tuple[
+        list[FeatureSchedulerTarget | None], list[FeatureSchedulerTarget], list[float]
+    ]:
+        """Convert feature based scheduler observations to Targets and
+        interpolate the slew time to each of them from the slew time table.
+
+        The altitude and azimuth of all the observations are computed at once.
+        Only the telescope altitude limits and the mounted filters are
+        checked, the other limits are checked when the observation is
+        simulated in the observatory model.
+
+        Parameters
+        ----------
+        observations : `list` [`np.array`]
+            Feature based scheduler observations.
+
+        Returns
+        -------
+        targets : `list` [`FeatureSchedulerTarget` | `None`]
+            Targets, with `None` for the observations that cannot be reached.
+        valid_targets : `list` [`FeatureSchedulerTarget`]
+            Targets that can be reached.
+        slew_times : `list` [`float`]
+            Slew time to each valid target (seconds).
+        """
+        observatory_model = self.models["observatory_model"]
+
+        all_targets = [
+            FeatureSchedulerTarget(
+                observing_block=self.get_survey_observing_block(
+                    self._get_survey_name_from_observation(observation)
+                ),
+                observation=observation,
+                log=self.log,
+            )
+            for observation in observations
+        ]
+
+        alt_rad, az_rad = radec2altaz(
+            ra_rad=np.array([target.ra_rad for target in all_targets]),
+            dec_rad=np.array([target.dec_rad for target in all_targets]),
+            lst_rad=observatory_model.dateprofile.lst_rad,
+            latitude_rad=self.models["location"].latitude_rad,
+        )
+
+        band_filters = np.array([target.filter for target in all_targets])
+        all_slew_times = np.empty(len(all_targets))
+        for band_filter in set(band_filters):
+            mask = band_filters == band_filter
+            all_slew_times[mask] = self.slew_time_table.get_slew_delay(
+                observatory_model=observatory_model,
+                alt_rad=alt_rad[mask],
+                az_rad=az_rad[mask],
+                goal_filter=band_filter,
+            )
+
+        reachable = (
+            (alt_rad >= observatory_model.params.telalt_minpos_rad)
+            & (alt_rad <= observatory_model.params.telalt_maxpos_rad)
+            & np.isin(band_filters, list(self.conditions.mounted_bands))
+        )
+
+        targets = []
+        valid_targets = []
+        slew_times = []
+
+        for i, target in enumerate(all_targets):
+            if reachable[i]:
+                target.alt_rad = alt_rad[i]
+                target.az_rad = az_rad[i]
+                targets.append(target)
+                valid_targets.append(target)
+                slew_times.append(float(all_slew_times[i]))
+            else:
+                self.log.error(
+                    f"Cannot slew to target @ ra={target.ra}, dec={target.dec}, "
+                    f"alt={np.degrees(alt_rad[i]):.2f}, filter={target.filter}.\n"
+                    f"target={target}.\n"
+                    f"Observatory State:{observatory_model.current_state}.\n"
+                )
+                targets.append(None)
+
+        return targets, valid_targets, slew_times
+
+    def get_first_invalid_target(self, targets: list[DriverTarget]) -> int:
+        """Find the first target, in a list of targets waiting to be queued,
+        that is no longer valid.
+
+        Override the base class to also re-evaluate the sky brightness and the
+        reward of the survey that produced the target. For each target, the
+        conditions are formatted at the time the target would be observed,
+        using the last telemetry received. This is done on a copy of the
+        current conditions, which are restored afterwards.
+
+        Parameters
+        ----------
+        targets : `list` [`DriverTarget`]
+            Targets, in the order they will be observed.
+
+        Returns
+        -------
+        `int`
+            Index of the first invalid target, or the number of targets if they
+            are all still valid.
+        """
+        conditions = self.conditions
+        self.conditions = copy.deepcopy(conditions)
+        try:
+            return super().get_first_invalid_target(targets)
+        finally:
+            self.conditions = conditions
+
+    def _is_queued_target_valid(self, target: DriverTarget) -> bool:
+        """Check if a target waiting to be queued is still valid.
+
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Target to check.
+
+        Returns
+        -------
+        `bool`
+            True if the target is valid.
+        """
+        if not super()._is_queued_target_valid(target):
+            return False
+
+        # Observatory model is at the time the target would be observed.
+        self._format_conditions()
+
+        hpid = _ra_dec2_hpid(self.nside, target.ra_rad, target.dec_rad)
+
+        sky_brightness = self.conditions.skybrightness[
+            self._get_effective_filter_name(target.filter)
+        ][hpid]
+
+        # Sky brightness is in mag/arcsec^2, smaller values are brighter.
+        if (
+            not np.isfinite(sky_brightness)
+            or target.sky_brightness - sky_brightness
+            > self.parameters.max_sky_brightness_change
+        ):
+            self.log.info(
+                f"Sky brightness for queued target {target!s} changed from "
+                f"{target.sky_brightness} to {sky_brightness}."
+            )
+            return False
+
+        reward = self._get_survey_reward(
+            self._get_survey_name_from_observation(target.observation), hpid
+        )
+
+        if reward is not None and (np.ma.is_masked(reward) or not np.isfinite(reward)):
+            self.log.info(f"Queued target {target!s} no longer has a valid reward.")
+            return False
+
+        return True
+
+    def _get_survey_reward(self, survey_name: str, hpid: int) -> float | None:
+        """Get the reward of a survey at a healpix with the current
+        conditions.
+
+        Parameters
+        ----------
+        survey_name : `str`
+            Name of the survey.
+        hpid : `int`
+            Healpix id.
+
+        Returns
+        -------
+        `float` or `None`
+            Reward, or `None` if there is no survey with the given name.
+
+        Notes
+        -----
+        `calc_reward_function` stores the reward in the survey (e.g.
+        ``reward`` and ``reward_checked``), so this overwrites the reward of
+        the last target selection. The scheduler computes the rewards of all
+        surveys again every time a target is requested, so this does not
+        affect the next selection.
+        """
+        for survey in itertools.chain.from_iterable(self.scheduler.survey_lists):
+            if survey_name in {
+                survey.survey_name,
+                getattr(survey, "science_program", None),
+            }:
+                reward = survey.calc_reward_function(self.conditions)
+                break
+        else:
+            return None
+
+        if np.isscalar(reward):
+            return reward
+
+        return reward[hpid]
+
+    def _get_effective_filter_name(self, filter_name: str) -> str:
+        """Get the name of the filter used to lookup sky brightness and seeing
+        in the conditions.
+
+        Parameters
+        ----------
+        filter_name : `str`
+            Target filter name.
+
+        Returns
+        -------
+        effective_filter_name : `str`
+            Effective filter name.
+        """
+        if filter_name in self.conditions.skybrightness:
+            return filter_name
+
+        for effective_filter_name in self.conditions.skybrightness:
+            if effective_filter_name in filter_name:
+                self.log.debug(
+                    f"Using effective filter name {effective_filter_name} instead of {filter_name}."
+                )
+                return effective_filter_name
+
+        available_filters = list(self.conditions.skybrightness.keys())
+        mid_range = int(len(available_filters) / 2)
+        effective_filter_name = available_filters[mid_range]
+        self.log.warning(
+            f"Could not find effective filter name for {filter_name} in {available_filters},"
+            f"using mid range {effective_filter_name}."
+        )
+        return effective_filter_name
 
     def _check_need_cwfs(self, target):
         """Check if the target needs curvature wavefront sensing (cwfs).
@@ -635,20 +998,22 @@ class FeatureScheduler(Driver):
         FWHM_500 = self.raw_telemetry.get("seeing", np.nan)
 
         # Use the model to get the seeing at this time and airmasses.
-        seeing_dict = self.models["seeing"](FWHM_500, self.conditions.airmass[good])
-        fwhm_eff = seeing_dict["fwhmEff"]
-        for i, key in enumerate(self.models["seeing"].band_list):
-            _fwhm_eff = np.empty(hp.nside2npix(self.conditions.nside))
-            _fwhm_eff.fill(np.nan)
-            _fwhm_eff[good] = fwhm_eff[i, :]
-            self.conditions.fwhm_eff[key] = _fwhm_eff
+        with tracer.span("format_conditions.seeing"):
+            seeing_dict = self.models["seeing"](FWHM_500, self.conditions.airmass[good])
+            fwhm_eff = seeing_dict["fwhmEff"]
+            for i, key in enumerate(self.models["seeing"].band_list):
+                _fwhm_eff = np.empty(hp.nside2npix(self.conditions.nside))
+                _fwhm_eff.fill(np.nan)
+                _fwhm_eff[good] = fwhm_eff[i, :]
+                self.conditions.fwhm_eff[key] = _fwhm_eff
 
         # sky brightness
-        self.conditions.skybrightness = self.models[
-            "sky"
-        ].sky_brightness_pre.return_mags(
-            self.conditions.mjd,
-        )
+        with tracer.span("format_conditions.sky_brightness"):
+            self.conditions.skybrightness = self.models[
+                "sky"
+            ].sky_brightness_pre.return_mags(
+                self.conditions.mjd,
+            )
 
         self.conditions.mounted_bands = self.models["observatory_state"].mountedfilters
         # Use observatory_model current state because some target in the queue
@@ -663,19 +1028,31 @@ class FeatureScheduler(Driver):
         slewtimes = np.empty(alts.size, dtype=float)
         slewtimes.fill(np.nan)
 
-        slewtimes[good] = self.models["observatory_model"].get_approximate_slew_delay(
-            alt_rad=alts[good],
-            az_rad=azs[good],
-            goal_filter=self.models["observatory_model"].current_state.filter,
-            lax_dome=True,
-        )
+        with tracer.span("format_conditions.slewtime"):
+            if self.slew_time_table is not None:
+                slewtimes[good] = self.slew_time_table.get_slew_delay(
+                    observatory_model=self.models["observatory_model"],
+                    alt_rad=alts[good],
+                    az_rad=azs[good],
+                    goal_filter=self.models["observatory_model"].current_state.filter,
+                )
+            else:
+                slewtimes[good] = self.models[
+                    "observatory_model"
+                ].get_approximate_slew_delay(
+                    alt_rad=alts[good],
+                    az_rad=azs[good],
+                    goal_filter=self.models["observatory_model"].current_state.filter,
+                    lax_dome=True,
+                )
 
         self.conditions.slewtime = slewtimes
 
         # Let's get the sun and moon
-        sun_moon_info = self.models["sky"].get_moon_sun_info(
-            np.array([0.0]), np.array([0.0])
-        )
+        with tracer.span("format_conditions.sun_moon"):
+            sun_moon_info = self.models["sky"].get_moon_sun_info(
+                np.array([0.0]), np.array([0.0])
+            )
 
         # self.almanac.get_sun_moon_positions(self.mjd)
         # convert these to scalars
@@ -764,9 +1141,10 @@ class FeatureScheduler(Driver):
         self.conditions.altaz_limit_pad = np.radians(2.0)
 
         # Planet positions from almanac
-        self.conditions.planet_positions = self.almanac.get_planet_positions(
-            self.conditions.mjd
-        )
+        with tracer.span("format_conditions.planet_positions"):
+            self.conditions.planet_positions = self.almanac.get_planet_positions(
+                self.conditions.mjd
+            )
 
         if "too_alerts" in self.raw_telemetry:
             self.log.debug("Passing ToO alerts.")
@@ -862,6 +1240,9 @@ class FeatureScheduler(Driver):
         with open(filename, "rb") as fp:
             self.scheduler, _, _ = pickle.load(fp)
 
+        if self.reward_profiler is not None:
+            self.reward_profiler.install(self.scheduler)
+
     def _get_survey_name_from_observation(self, observation):
         """Get the survey name for the feature scheduler observation.
 
@@ -1008,6 +1389,61 @@ class FeatureScheduler(Driver):
 
         return scheduler_config
 
+    def _configure_reward_profiler(self, config):
+        """Configure profiling of the survey rewards computation.
+
+        If the scheduler is already loaded, the profiler is installed or
+        removed right away, otherwise it is installed by `_set_scheduler`.
+
+        Parameters
+        ----------
+        config : `types.SimpleNamespace`
+            Configuration, as described by ``schema/Scheduler.yaml``
+        """
+        driver_config = config.feature_scheduler_driver_configuration
+
+        if driver_config.get("profile_rewards", False):
+            self.reward_profiler = RewardProfiler(
+                window=driver_config.get("reward_profile_window", 100),
+                top=driver_config.get("reward_profile_top", 10),
+                log=self.log,
+            )
+            if self.scheduler is not None:
+                self.reward_profiler.install(self.scheduler)
+        else:
+            if self.scheduler is not None:
+                RewardProfiler.uninstall(self.scheduler)
+            self.reward_profiler = None
+
+    def _configure_slew_time_table(self, config):
+        """Configure the lookup table of the slew times.
+
+        Parameters
+        ----------
+        config : `types.SimpleNamespace`
+            Configuration, as described by ``schema/Scheduler.yaml``
+        """
+        resolution = config.feature_scheduler_driver_configuration.get(
+            "slew_time_table_resolution", 0.0
+        )
+
+        self.slew_time_table = (
+            SlewTimeTable(resolution=resolution) if resolution > 0.0 else None
+        )
+
+    def _profile_request(self) -> typing.ContextManager[None]:
+        """Profile the survey rewards computation of a request for
+        observations, if enabled.
+
+        Returns
+        -------
+        `typing.ContextManager`
+            Context manager wrapping the request.
+        """
+        if self.reward_profiler is None:
+            return contextlib.nullcontext()
+        return self.reward_profiler.profile_request()
+
     def _set_scheduler(self, scheduler, nside, seed):
         """Set the scheduler information.
 
@@ -1044,6 +1480,10 @@ class FeatureScheduler(Driver):
             ]
         )
 
+        if self.reward_profiler is not None:
+            n_wrapped = self.reward_profiler.install(self.scheduler)
+            self.log.info(f"Profiling {n_wrapped} reward computation methods.")
+
     def _finish_scheduler_configuration(self, config):
         """Finish the scheduler configuration.
 
@@ -0,0 +1,241 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["ProfiledCall", "RewardProfiler"]
+
+import collections
+import contextlib
+import logging
+import time
+import typing
+
+
+class ProfiledCall:
+    """Wrapper that times the calls to a bound method.
+
+    When pickled or copied, the wrapper is replaced by the original method, so
+    the profiler is not saved with the scheduler state.
+
+    Parameters
+    ----------
+    profiler : `RewardProfiler`
+        Profiler to report the call durations to.
+    key : `str`
+        Name to report the call durations under.
+    method : `callable`
+        Bound method to time.
+    """
+
+    def __init__(
+        self, profiler: "RewardProfiler", key: str, method: typing.Callable
+    ) -> None:
+        self.profiler = profiler
+        self.key = key
+        self.method = method
+
+    def __call__(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        self.profiler.start_call()
+        start = time.perf_counter()
+        try:
+            return self.method(*args, **kwargs)
+        finally:
+            self.profiler.end_call(self.key, time.perf_counter() - start)
+
+    def __reduce__(self) -> tuple[typing.Callable, tuple[typing.Any, str]]:
+        return getattr, (self.method.__self__, self.method.__name__)
+
+
+class RewardProfiler:
+    """Profile the reward computation of the feature based scheduler.
+
+    Times each survey ``calc_reward_function`` and each basis function
+    ``_calc_value``, accumulated per call to ``request_observation``, and
+    reports the most expensive ones over a rolling window of requests. The
+    time of a survey excludes the time spent in its basis functions, so the
+    time of a basis function is not counted twice.
+
+    Parameters
+    ----------
+    window : `int`
+        Number of requests in the rolling window. A summary is logged every
+        ``window`` requests.
+    top : `int`
+        Number of entries in the summary.
+    log : `logging.Logger`
+        Logger.
+    """
+
+    def __init__(self, window: int, top: int, log: logging.Logger) -> None:
+        self.window = window
+        self.top = top
+        self.log = log
+
+        self._requests: collections.deque = collections.deque(maxlen=window)
+        self._current: dict[str, float] | None = None
+        self._n_requests = 0
+
+        # Time spent in the profiled calls made by each of the profiled calls
+        # in progress, innermost last.
+        self._children_durations: list[float] = []
+
+    def install(self, scheduler: typing.Any) -> int:
+        """Wrap the reward computation of the surveys of a scheduler.
+
+        Wrappers installed previously are replaced.
+
+        Parameters
+        ----------
+        scheduler : `CoreScheduler`
+            Feature based scheduler.
+
+        Returns
+        -------
+        `int`
+            Number of methods wrapped.
+        """
+        self.uninstall(scheduler)
+
+        n_wrapped = 0
+        for survey_list in scheduler.survey_lists:
+            for survey in survey_list:
+                survey_name = survey.survey_name
+                survey.calc_reward_function = ProfiledCall(
+                    self, survey_name, survey.calc_reward_function
+                )
+                n_wrapped += 1
+                for i, basis_function in enumerate(
+                    getattr(survey, "basis_functions", [])
+                ):
+                    if not hasattr(basis_function, "_calc_value"):
+                        continue
+                    basis_function._calc_value = ProfiledCall(
+                        self,
+                        f"{survey_name}/{type(basis_function).__name__}[{i}]",
+                        basis_function._calc_value,
+                    )
+                    n_wrapped += 1
+
+        return n_wrapped
+
+    @staticmethod
+    def uninstall(scheduler: typing.Any) -> None:
+        """Remove the wrappers from the surveys of a scheduler.
+
+        Parameters
+        ----------
+        scheduler : `CoreScheduler`
+            Feature based scheduler.
+        """
+        for survey_list in scheduler.survey_lists:
+            for survey in survey_list:
+                for obj, name in [(survey, "calc_reward_function")] + [
+                    (basis_function, "_calc_value")
+                    for basis_function in getattr(survey, "basis_functions", [])
+                ]:
+                    if isinstance(obj.__dict__.get(name), ProfiledCall):
+                        del obj.__dict__[name]
+
+    def start_call(self) -> None:
+        """Start timing a profiled call."""
+        self._children_durations.append(0.0)
+
+    def end_call(self, key: str, duration: float) -> None:
+        """Finish timing a profiled call.
+
+        Parameters
+        ----------
+        key : `str`
+            Name of the survey or basis function.
+        duration : `float`
+            Call duration, including the profiled calls it made (in seconds).
+        """
+        children_duration = self._children_durations.pop()
+        if self._children_durations:
+            self._children_durations[-1] += duration
+        self.add(key, duration - children_duration)
+
+    def add(self, key: str, duration: float) -> None:
+        """Add the duration of a call.
+
+        Parameters
+        ----------
+        key : `str`
+            Name of the survey or basis function.
+        duration : `float`
+            Call duration (in seconds).
+        """
+        if self._current is not None:
+            self._current[key] = self._current.get(key, 0.0) + duration
+
+    @contextlib.contextmanager
+    def profile_request(self) -> typing.Iterator[None]:
+        """Accumulate the call durations of a ``request_observation``."""
+        self._current = dict()
+        try:
+            yield
+        finally:
+            self._requests.append(self._current)
+            self._current = None
+            self._n_requests += 1
+            if self._n_requests % self.window == 0:
+                self.log.info(self.format_summary())
+
+    def get_top_offenders(self) -> list[tuple[str, float]]:
+        """Get the most expensive surveys and basis functions in the rolling
+        window.
+
+        Returns
+        -------
+        `list` [`tuple` [`str`, `float`]]
+            Name and mean time spent per request (in seconds), sorted by
+            decreasing time.
+        """
+        totals: dict[str, float] = collections.defaultdict(float)
+        for request in self._requests:
+            for key, duration in request.items():
+                totals[key] += duration
+
+        n_requests = max(len(self._requests), 1)
+
+        return sorted(
+            [(key, total / n_requests) for key, total in totals.items()],
+            key=lambda item: item[1],
+            reverse=True,
+        )[: self.top]
+
+    def format_summary(self) -> str:
+        """Format the most expensive surveys and basis functions.
+
+        Returns
+        -------
+        `str`
+            Summary.
+        """
+        offenders = "\n".join(
+            [
+                f"  {key}: {duration * 1000.0:.2f}ms"
+                for key, duration in self.get_top_offenders()
+            ]
+        )
+        return (
+            "Reward computation time per request over the last "
+            f"{len(self._requests)} requests:\n{offenders}"
+        )
@@ -0,0 +1,246 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = [
+    "ScriptConfigurationTemplate",
+    "get_script_configuration_templates",
+]
+
+import copy
+import functools
+import threading
+import typing
+import uuid
+from collections import OrderedDict
+from string import Template
+
+import yaml
+from lsst.ts.observing import ObservingBlock
+
+# Maximum number of observing blocks with compiled script configurations kept
+# in the cache.
+MAX_COMPILED_OBSERVING_BLOCKS = 256
+
+_COMPILED_OBSERVING_BLOCKS: OrderedDict[
+    uuid.UUID, tuple[list, list["ScriptConfigurationTemplate"]]
+] = OrderedDict()
+_COMPILED_OBSERVING_BLOCKS_LOCK = threading.Lock()
+
+
+class _Placeholder:
+    """A slot in a compiled script configuration.
+
+    Parameters
+    ----------
+    template : `str`
+        The original string value, containing one or more placeholders.
+    """
+
+    def __init__(self, template: str) -> None:
+        self.template = Template(template)
+
+        match = self.template.pattern.fullmatch(template)
+        self.identifier = (
+            match.group("named") or match.group("braced") if match is not None else None
+        )
+
+    def fill(self, script_config: dict[str, typing.Any]) -> typing.Any:
+        """Fill the slot with the values from the script configuration.
+
+        Parameters
+        ----------
+        script_config : `dict`
+            Script configuration.
+
+        Returns
+        -------
+        `typing.Any`
+            Value for the slot.
+        """
+        if self.identifier is None:
+            return Template(self.template.substitute(script_config)).substitute(
+                script_config
+            )
+
+        value = script_config[self.identifier]
+
+        if isinstance(value, str):
+            return _load_scalar(value)
+
+        return copy.deepcopy(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_scalar(value: str) -> typing.Any:
+    """Load a string value as if it was written in a yaml document.
+
+    Parameters
+    ----------
+    value : `str`
+        Value to load.
+
+    Returns
+    -------
+    `typing.Any`
+        Loaded value.
+    """
+    if len(value) > 1 and value[0] == value[-1] == "'" and "'" not in value[1:-1]:
+        return value[1:-1]
+
+    return yaml.safe_load(value)
+
+
+class ScriptConfigurationTemplate:
+    """Observing script configuration compiled into a parsed structure with
+    placeholder slots.
+
+    The script configuration is parsed only once. Formatting the configuration
+    for a target then consists of filling in the slots, without going through
+    string substitution and yaml parsing of the whole configuration.
+
+    Parameters
+    ----------
+    configuration : `str`
+        Script configuration, in yaml format, with ``$name`` placeholders.
+
+    Notes
+    -----
+    A value consisting of a single placeholder is replaced by the value in the
+    script configuration, string values being interpreted as yaml, which is
+    the same result as substituting the placeholder in the yaml document.
+    Placeholders embedded in larger strings are substituted as strings.
+    Placeholders in mapping keys are not supported.
+    """
+
+    def __init__(self, configuration: str) -> None:
+        self._parameters = self._compile(yaml.safe_load(configuration))
+
+    @classmethod
+    def _compile(cls, node: typing.Any) -> typing.Any:
+        """Compile a node of the script configuration.
+
+        Parameters
+        ----------
+        node : `typing.Any`
+            Node to compile.
+
+        Returns
+        -------
+        `typing.Any`
+            Compiled node.
+        """
+        if isinstance(node, dict):
+            return {key: cls._compile(value) for key, value in node.items()}
+        elif isinstance(node, list):
+            return [cls._compile(value) for value in node]
+        elif isinstance(node, str) and "$" in node:
+            return _Placeholder(node)
+        return node
+
+    @classmethod
+    def _fill(
+        cls, node: typing.Any, script_config: dict[str, typing.Any]
+    ) -> typing.Any:
+        """Fill a compiled node with the script configuration.
+
+        Parameters
+        ----------
+        node : `typing.Any`
+            Compiled node.
+        script_config : `dict`
+            Script configuration.
+
+        Returns
+        -------
+        `typing.Any`
+            Filled node.
+        """
+        if isinstance(node, dict):
+            return {key: cls._fill(value, script_config) for key, value in node.items()}
+        elif isinstance(node, list):
+            return [cls._fill(value, script_config) for value in node]
+        elif isinstance(node, _Placeholder):
+            return node.fill(script_config)
+        return node
+
+    def format(self, script_config: dict[str, typing.Any]) -> typing.Any:
+        """Format the script configuration.
+
+        Parameters
+        ----------
+        script_config : `dict`
+            Values for the placeholders.
+
+        Returns
+        -------
+        `typing.Any`
+            Formatted script parameters.
+
+        Raises
+        ------
+        KeyError
+            If a placeholder is missing from ``script_config``.
+        ValueError
+            If the configuration contains an invalid placeholder.
+        """
+        return self._fill(self._parameters, script_config)
+
+
+def get_script_configuration_templates(
+    observing_block: ObservingBlock,
+) -> list[ScriptConfigurationTemplate]:
+    """Get the compiled script configurations for an observing block.
+
+    The compiled configurations are cached by block id, which allows blocks
+    to be compiled once, when they are loaded, and reused by all targets
+    sharing the block. The cache entry is only reused while the block still
+    holds the same list of scripts it was compiled from.
+
+    Parameters
+    ----------
+    observing_block : `ObservingBlock`
+        Observing block.
+
+    Returns
+    -------
+    `list` [`ScriptConfigurationTemplate`]
+        Compiled configuration for each script in the block.
+    """
+    with _COMPILED_OBSERVING_BLOCKS_LOCK:
+        cached = _COMPILED_OBSERVING_BLOCKS.get(observing_block.id)
+
+        if cached is not None and cached[0] is observing_block.scripts:
+            _COMPILED_OBSERVING_BLOCKS.move_to_end(observing_block.id)
+            return cached[1]
+
+        templates = [
+            ScriptConfigurationTemplate(script.get_script_configuration())
+            for script in observing_block.scripts
+        ]
+        _COMPILED_OBSERVING_BLOCKS[observing_block.id] = (
+            observing_block.scripts,
+            templates,
+        )
+        while len(_COMPILED_OBSERVING_BLOCKS) > MAX_COMPILED_OBSERVING_BLOCKS:
+            _COMPILED_OBSERVING_BLOCKS.popitem(last=False)
+
+        return templates
@@ -20,12 +20,14 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import math
 import os
 import pickle
 import typing
 
 import astropy.units as u
 import jsonschema
+import numpy as np
 import yaml
 from astropy.coordinates import Angle
 from astropy.time import Time
@@ -35,9 +37,15 @@ from lsst.ts.utils import index_generator
 from .driver import Driver, DriverParameters
 from .driver_target import DriverTarget
 from .observation import Observation
+from .slew_time_table import radec2altaz
 
 __all__ = ["SequentialParameters", "SequentialScheduler"]
 
+# Targets this far outside the telescope altitude limits are discarded without
+# computing the slew to them. The margin leaves the targets close to the limits
+# to the observatory model.
+_ALTITUDE_LIMIT_MARGIN_RAD = math.radians(1.0)
+
 
 class SequentialParameters(DriverParameters):
     """Sequential driver parameters.
@@ -108,6 +116,13 @@ class SequentialScheduler(Driver):
     ):
         self.observing_list_dict = dict()
 
+        # Coordinates of the targets in the observing list, in the same order,
+        # parsed by `_index_observing_list`. None if they need to be parsed.
+        self._observing_list_ids: list[str] | None = None
+        self._observing_list_ra_rad = np.array([])
+        self._observing_list_dec_rad = np.array([])
+        self._observing_list_ang_rad = np.array([])
+
         self.index_gen = index_generator()
 
         self.validator = jsonschema.Draft7Validator(self.schema())
@@ -161,10 +176,84 @@ class SequentialScheduler(Driver):
         for target in observing_list_dict["targets"]:
             self.observing_list_dict[f"target_{next(self.index_gen)}"] = target
 
+        self._index_observing_list()
+
         self.log.debug(f"Got {len(self.observing_list_dict)} objects.")
 
         return super().configure_scheduler(config)
 
+    def _index_observing_list(self) -> None:
+        """Parse the coordinates of the targets in the observing list."""
+        self._observing_list_ids = list(self.observing_list_dict)
+
+        if not self._observing_list_ids:
+            self._observing_list_ra_rad = np.array([])
+            self._observing_list_dec_rad = np.array([])
+            self._observing_list_ang_rad = np.array([])
+            return
+
+        configs = list(self.observing_list_dict.values())
+
+        self._observing_list_ra_rad = np.atleast_1d(
+            Angle([config["ra"] for config in configs], unit=u.hourangle)
+            .to(u.rad)
+            .value
+        )
+        self._observing_list_dec_rad = np.atleast_1d(
+            Angle([config["dec"] for config in configs], unit=u.deg).to(u.rad).value
+        )
+        self._observing_list_ang_rad = np.atleast_1d(
+            Angle([config.get("rot", 0.0) for config in configs], unit=u.deg)
+            .to(u.rad)
+            .value
+        )
+
+    def _remove_from_observing_list(self, index: int) -> None:
+        """Remove a target from the observing list.
+
+        Parameters
+        ----------
+        index : `int`
+            Index of the target in the observing list.
+        """
+        tid = self._observing_list_ids.pop(index)
+        self.observing_list_dict.pop(tid)
+
+        self._observing_list_ra_rad = np.delete(self._observing_list_ra_rad, index)
+        self._observing_list_dec_rad = np.delete(self._observing_list_dec_rad, index)
+        self._observing_list_ang_rad = np.delete(self._observing_list_ang_rad, index)
+
+    def _get_observing_list_candidates(self) -> np.ndarray:
+        """Get the targets in the observing list within the telescope
+        altitude limits.
+
+        Returns
+        -------
+        `np.ndarray`
+            Indices of the candidate targets in the observing list, in order.
+        """
+        observatory_model = self.models["observatory_model"]
+
+        alt_rad, _ = radec2altaz(
+            ra_rad=self._observing_list_ra_rad,
+            dec_rad=self._observing_list_dec_rad,
+            lst_rad=observatory_model.dateprofile.lst_rad,
+            latitude_rad=self.models["location"].latitude_rad,
+        )
+
+        return np.flatnonzero(
+            (
+                alt_rad
+                >= observatory_model.params.telalt_minpos_rad
+                - _ALTITUDE_LIMIT_MARGIN_RAD
+            )
+            & (
+                alt_rad
+                <= observatory_model.params.telalt_maxpos_rad
+                + _ALTITUDE_LIMIT_MARGIN_RAD
+            )
+        )
+
     def cold_start(self, observations: list[Observation]) -> None:
         """Rebuilds the internal state of the scheduler from a list of
         observations.
@@ -192,7 +281,11 @@ class SequentialScheduler(Driver):
 
         self.targetid += 1
 
-        for tid in self.observing_list_dict:
+        if self._observing_list_ids is None:
+            self._index_observing_list()
+
+        for index in self._get_observing_list_candidates():
+            tid = self._observing_list_ids[index]
             program = self.observing_list_dict[tid]["program"]
             observing_block = self.get_survey_observing_block(survey_name=program)
 
@@ -202,13 +295,13 @@ class SequentialScheduler(Driver):
             target = DriverTarget(
                 observing_block=observing_block,
                 targetid=self.targetid,
-                ra_rad=Angle(config["ra"], unit=u.hourangle).to(u.rad).value,
-                dec_rad=Angle(config["dec"], unit=u.deg).to(u.rad).value,
+                ra_rad=self._observing_list_ra_rad[index],
+                dec_rad=self._observing_list_dec_rad[index],
                 band_filter=config["instrument_setup"][0]["filter"],
                 exp_times=[
                     config["instrument_setup"][i]["exptime"] for i in range(num_exp)
                 ],
-                ang_rad=Angle(config.get("rot", 0.0), unit=u.deg).to(u.rad).value,
+                ang_rad=self._observing_list_ang_rad[index],
                 note=config["name"],
             )
 
@@ -224,7 +317,7 @@ class SequentialScheduler(Driver):
 
                 self.log.debug(f"Slewtime to target: {slew_time}s.")
 
-                self.observing_list_dict.pop(tid)
+                self._remove_from_observing_list(index)
 
                 return target
 
@@ -343,6 +436,8 @@ properties:
                 target
             ]
 
+        self._observing_list_ids = None
+
         self.log.debug(f"Got {len(new_targets)} objects.")
 
     def save_state(self, targets_queue=None):
@@ -377,3 +472,5 @@ properties:
         """
         with open(filename, "rb") as fp:
             self.observing_list_dict = pickle.load(fp)
+
+        self._observing_list_ids = None
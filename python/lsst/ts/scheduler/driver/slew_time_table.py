@@ -0,0 +1,244 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = ["SlewTimeTable", "radec2altaz"]
+
+import math
+import typing
+
+import numpy as np
+
+
+def radec2altaz(
+    ra_rad: np.ndarray, dec_rad: np.ndarray, lst_rad: float, latitude_rad: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convert equatorial coordinates to horizontal coordinates.
+
+    Parameters
+    ----------
+    ra_rad : `np.ndarray`
+        Right ascension (radians).
+    dec_rad : `np.ndarray`
+        Declination (radians).
+    lst_rad : `float`
+        Local sidereal time (radians).
+    latitude_rad : `float`
+        Latitude of the observatory (radians).
+
+    Returns
+    -------
+    alt_rad : `np.ndarray`
+        Altitude (radians).
+    az_rad : `np.ndarray`
+        Azimuth (radians), measured from north towards east, in the range
+        [0, 2pi).
+    """
+    ha_rad = lst_rad - np.asarray(ra_rad, dtype=float)
+    dec_rad = np.asarray(dec_rad, dtype=float)
+
+    sin_alt = np.sin(dec_rad) * np.sin(latitude_rad) + np.cos(dec_rad) * np.cos(
+        latitude_rad
+    ) * np.cos(ha_rad)
+    alt_rad = np.arcsin(np.clip(sin_alt, -1.0, 1.0))
+    az_rad = np.arctan2(
+        -np.cos(dec_rad) * np.sin(ha_rad),
+        np.sin(dec_rad) * np.cos(latitude_rad)
+        - np.cos(dec_rad) * np.cos(ha_rad) * np.sin(latitude_rad),
+    ) % (2.0 * np.pi)
+
+    return alt_rad, az_rad
+
+
+class SlewTimeTable:
+    """Lookup table of the approximate slew time from the current observatory
+    state to a grid of altitude and azimuth, for each filter.
+
+    The slew time to each grid point is computed with the observatory model
+    ``get_approximate_slew_delay`` and interpolated for the requested
+    positions. The table for a filter is computed the first time it is
+    needed, and all tables are discarded when the observatory state changes.
+    The telescope and dome positions are compared with the same resolution as
+    the grid, so the tables are reused while the observatory is tracking or
+    waiting for a target.
+
+    Parameters
+    ----------
+    resolution : `float`
+        Spacing of the altitude and azimuth grid (degrees).
+    """
+
+    def __init__(self, resolution: float) -> None:
+        self.resolution = resolution
+
+        self._state_key: tuple | None = None
+        self._tables: dict[str, np.ndarray] = dict()
+        self._alt_grid = np.array([])
+        self._az_grid = np.array([])
+
+        # Number of times the table was computed for a filter.
+        self.n_computed = 0
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        """Get the table state for pickling, without the computed tables."""
+        state = self.__dict__.copy()
+        state["_state_key"] = None
+        state["_tables"] = dict()
+        return state
+
+    def get_state_key(self, observatory_model: typing.Any) -> tuple:
+        """Get the observatory state values the slew time depends on.
+
+        Parameters
+        ----------
+        observatory_model : `ObservatoryModel`
+            Observatory model.
+
+        Returns
+        -------
+        `tuple`
+            Telescope, rotator and dome positions, in units of the grid
+            resolution, and current filter.
+        """
+        state = observatory_model.current_state
+        resolution_rad = math.radians(self.resolution)
+        return (
+            round(state.telalt_rad / resolution_rad),
+            round(state.telaz_rad / resolution_rad),
+            round(state.telrot_rad / resolution_rad),
+            round(state.domalt_rad / resolution_rad),
+            round(state.domaz_rad / resolution_rad),
+            state.filter,
+        )
+
+    def update(self, observatory_model: typing.Any) -> bool:
+        """Discard the tables if the observatory state changed.
+
+        Parameters
+        ----------
+        observatory_model : `ObservatoryModel`
+            Observatory model.
+
+        Returns
+        -------
+        `bool`
+            True if the tables were discarded.
+        """
+        state_key = self.get_state_key(observatory_model)
+
+        if state_key == self._state_key:
+            return False
+
+        self._state_key = state_key
+        self._tables = dict()
+
+        resolution_rad = math.radians(self.resolution)
+        n_alt = (
+            math.ceil(
+                (
+                    observatory_model.params.telalt_maxpos_rad
+                    - observatory_model.params.telalt_minpos_rad
+                )
+                / resolution_rad
+            )
+            + 1
+        )
+        self._alt_grid = np.linspace(
+            observatory_model.params.telalt_minpos_rad,
+            observatory_model.params.telalt_maxpos_rad,
+            n_alt,
+        )
+        self._az_grid = np.linspace(
+            0.0, 2.0 * np.pi, math.ceil(2.0 * np.pi / resolution_rad), endpoint=False
+        )
+
+        return True
+
+    def get_slew_delay(
+        self,
+        observatory_model: typing.Any,
+        alt_rad: np.ndarray,
+        az_rad: np.ndarray,
+        goal_filter: str,
+    ) -> np.ndarray:
+        """Get the approximate slew time from the current observatory state.
+
+        Parameters
+        ----------
+        observatory_model : `ObservatoryModel`
+            Observatory model.
+        alt_rad : `np.ndarray`
+            Altitude of the targets (radians). Values outside the telescope
+            altitude limits are clipped to the limits.
+        az_rad : `np.ndarray`
+            Azimuth of the targets (radians).
+        goal_filter : `str`
+            Filter of the targets.
+
+        Returns
+        -------
+        `np.ndarray`
+            Slew time to each target (seconds).
+        """
+        self.update(observatory_model)
+
+        if goal_filter not in self._tables:
+            alt_grid, az_grid = np.meshgrid(
+                self._alt_grid, self._az_grid, indexing="ij"
+            )
+            self._tables[goal_filter] = np.reshape(
+                observatory_model.get_approximate_slew_delay(
+                    alt_rad=alt_grid.ravel(),
+                    az_rad=az_grid.ravel(),
+                    goal_filter=goal_filter,
+                    lax_dome=True,
+                ),
+                alt_grid.shape,
+            )
+            self.n_computed += 1
+
+        table = self._tables[goal_filter]
+
+        n_alt, n_az = table.shape
+        alt_step = self._alt_grid[1] - self._alt_grid[0] if n_alt > 1 else 1.0
+        az_step = self._az_grid[1] - self._az_grid[0]
+
+        alt_index = np.clip(
+            (np.asarray(alt_rad, dtype=float) - self._alt_grid[0]) / alt_step,
+            0.0,
+            n_alt - 1,
+        )
+        alt_index_0 = np.minimum(np.floor(alt_index).astype(int), max(n_alt - 2, 0))
+        alt_index_1 = np.minimum(alt_index_0 + 1, n_alt - 1)
+        alt_weight = alt_index - alt_index_0
+
+        az_index = (np.asarray(az_rad, dtype=float) % (2.0 * np.pi)) / az_step
+        az_index_0 = np.floor(az_index).astype(int) % n_az
+        az_index_1 = (az_index_0 + 1) % n_az
+        az_weight = az_index - np.floor(az_index)
+
+        return (1.0 - alt_weight) * (
+            (1.0 - az_weight) * table[alt_index_0, az_index_0]
+            + az_weight * table[alt_index_0, az_index_1]
+        ) + alt_weight * (
+            (1.0 - az_weight) * table[alt_index_1, az_index_0]
+            + az_weight * table[alt_index_1, az_index_1]
+        )
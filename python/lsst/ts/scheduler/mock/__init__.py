@@ -20,3 +20,4 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from .observatory_state_mock import *
+from .script_queue_simulator import *
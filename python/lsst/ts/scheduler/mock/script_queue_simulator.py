@@ -0,0 +1,349 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["ScriptQueueSimulator"]
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import yaml
+from lsst.ts import salobj, utils
+from lsst.ts.xml.enums import Script, ScriptQueue
+
+
+@dataclass
+class SimulatedScript:
+    """Script added to the `ScriptQueueSimulator`."""
+
+    path: str
+    is_standard: bool
+    duration: float
+    # How long the script takes to execute (in seconds).
+
+
+class ScriptQueueSimulator:
+    """Simulate the ScriptQueue commands and events used by the Scheduler.
+
+    Scripts are not executed. Instead, each script is marked as done once the
+    slew and exposure times in its configuration elapse.
+
+    Parameters
+    ----------
+    index : `int`, optional
+        ScriptQueue SAL index.
+    time_scale : `float`, optional
+        Factor applied to the duration of the scripts. Values smaller than one
+        run faster than real time.
+    script_overhead : `float`, optional
+        Additional duration of each script, before applying ``time_scale``
+        (in seconds).
+    first_sal_index : `int`, optional
+        SAL index of the first script added to the queue.
+    log : `logging.Logger`, optional
+        Logger.
+
+    Attributes
+    ----------
+    idle_gaps : `list` [`float`]
+        How long the queue waited for the next script to start after
+        finishing the previous one, for each script (in seconds).
+    number_of_scripts_done : `int`
+        Number of scripts that finished executing.
+    """
+
+    def __init__(
+        self,
+        index: int = 1,
+        time_scale: float = 1.0,
+        script_overhead: float = 0.0,
+        first_sal_index: int = 100000,
+        log: logging.Logger | None = None,
+    ) -> None:
+        self.controller = salobj.Controller("ScriptQueue", index=index)
+
+        self.log = (
+            self.controller.log if log is None else log.getChild(type(self).__name__)
+        )
+
+        self.time_scale = time_scale
+        self.script_overhead = script_overhead
+
+        self.scripts: dict[int, SimulatedScript] = dict()
+        self.queue: list[int] = []
+        self.past_queue: list[int] = []
+        self.current_sal_index = 0
+
+        self.idle_gaps: list[float] = []
+        self.number_of_scripts_done = 0
+
+        self._next_sal_index = first_sal_index
+        self._idle_start: float | None = None
+        self._queue_changed = asyncio.Event()
+        self._stop_current_script = asyncio.Event()
+        self._run_scripts_task = utils.make_done_future()
+
+        self.controller.cmd_add.callback = self.do_add
+        self.controller.cmd_stopScripts.callback = self.do_stopScripts
+        self.controller.cmd_showQueue.callback = self.do_showQueue
+        self.controller.cmd_showSchema.callback = self.do_showSchema
+
+        self._started = False
+        self.start_task = asyncio.create_task(self.start())
+
+    def get_script_duration(self, config: str) -> float:
+        """Get how long a script takes to execute from its configuration.
+
+        Parameters
+        ----------
+        config : `str`
+            Script configuration, in yaml.
+
+        Returns
+        -------
+        `float`
+            Script duration (in seconds).
+        """
+        script_config = yaml.safe_load(config) if config else None
+
+        if not isinstance(script_config, dict):
+            script_config = dict()
+
+        exp_times = script_config.get("exp_times", [])
+        exposure_time = (
+            float(sum(exp_times)) if isinstance(exp_times, list) else float(exp_times)
+        )
+        slew_time = float(script_config.get("estimated_slew_time", 0.0))
+
+        return (exposure_time + slew_time + self.script_overhead) * self.time_scale
+
+    async def do_add(
+        self, data: salobj.type_hints.BaseMsgType
+    ) -> salobj.type_hints.AckCmdDataType:
+        """Add a script to the queue.
+
+        Parameters
+        ----------
+        data : `ScriptQueue_command_addC`
+            Command data.
+
+        Returns
+        -------
+        `salobj.type_hints.AckCmdDataType`
+            Command acknowledgement, with the script SAL index as result.
+        """
+        sal_index = self._next_sal_index
+        self._next_sal_index += 1
+
+        self.scripts[sal_index] = SimulatedScript(
+            path=data.path,
+            is_standard=data.isStandard,
+            duration=self.get_script_duration(data.config),
+        )
+
+        await self.write_script(
+            sal_index,
+            process_state=ScriptQueue.ScriptProcessState.CONFIGURED,
+            script_state=Script.ScriptState.CONFIGURED,
+        )
+
+        if data.location == ScriptQueue.Location.FIRST:
+            self.queue.insert(0, sal_index)
+        else:
+            self.queue.append(sal_index)
+
+        self._queue_changed.set()
+        await self.write_queue()
+
+        return self.controller.salinfo.make_ackcmd(
+            private_seqNum=data.private_seqNum,
+            ack=salobj.SalRetCode.CMD_COMPLETE,
+            result=str(sal_index),
+        )
+
+    async def do_stopScripts(self, data: salobj.type_hints.BaseMsgType) -> None:
+        """Stop scripts.
+
+        Parameters
+        ----------
+        data : `ScriptQueue_command_stopScriptsC`
+            Command data.
+        """
+        for sal_index in data.salIndices[: data.length]:
+            if sal_index == self.current_sal_index:
+                self._stop_current_script.set()
+            elif sal_index in self.queue:
+                self.queue.remove(sal_index)
+                await self.write_script(
+                    sal_index,
+                    process_state=ScriptQueue.ScriptProcessState.TERMINATED,
+                    script_state=Script.ScriptState.STOPPED,
+                )
+                self.scripts.pop(sal_index)
+                self.past_queue.insert(0, sal_index)
+
+        await self.write_queue()
+
+    async def do_showQueue(self, data: salobj.type_hints.BaseMsgType) -> None:
+        """Output the queue event.
+
+        Parameters
+        ----------
+        data : `ScriptQueue_command_showQueueC`
+            Command data.
+        """
+        await self.write_queue()
+
+    async def do_showSchema(self, data: salobj.type_hints.BaseMsgType) -> None:
+        """Output the configuration schema of a script.
+
+        The simulator does not know the scripts, so the schema is empty, which
+        means the Scheduler does not validate the script configuration.
+
+        Parameters
+        ----------
+        data : `ScriptQueue_command_showSchemaC`
+            Command data.
+        """
+        await self.controller.evt_configSchema.set_write(
+            isStandard=data.isStandard,
+            path=data.path,
+            configSchema="",
+            force_output=True,
+        )
+
+    async def write_queue(self) -> None:
+        """Output the queue event."""
+        n_indices = len(self.controller.evt_queue.data.salIndices)
+        n_past_indices = len(self.controller.evt_queue.data.pastSalIndices)
+
+        await self.controller.evt_queue.set_write(
+            enabled=True,
+            running=True,
+            currentSalIndex=self.current_sal_index,
+            length=len(self.queue),
+            salIndices=(self.queue + [0] * n_indices)[:n_indices],
+            pastLength=min(len(self.past_queue), n_past_indices),
+            pastSalIndices=(self.past_queue + [0] * n_past_indices)[:n_past_indices],
+            force_output=True,
+        )
+
+    async def write_script(
+        self,
+        sal_index: int,
+        process_state: ScriptQueue.ScriptProcessState,
+        script_state: Script.ScriptState,
+    ) -> None:
+        """Output the script event.
+
+        Parameters
+        ----------
+        sal_index : `int`
+            SAL index of the script.
+        process_state : `ScriptQueue.ScriptProcessState`
+            State of the script process.
+        script_state : `Script.ScriptState`
+            State of the script.
+        """
+        script = self.scripts[sal_index]
+
+        await self.controller.evt_script.set_write(
+            scriptSalIndex=sal_index,
+            path=script.path,
+            isStandard=script.is_standard,
+            processState=process_state,
+            scriptState=script_state,
+            force_output=True,
+        )
+
+    async def run_scripts(self) -> None:
+        """Execute the scripts in the queue, in order."""
+        while True:
+            while not self.queue:
+                self._queue_changed.clear()
+                await self._queue_changed.wait()
+
+            sal_index = self.queue.pop(0)
+
+            if self._idle_start is not None:
+                self.idle_gaps.append(time.monotonic() - self._idle_start)
+
+            self.current_sal_index = sal_index
+            self._stop_current_script.clear()
+
+            await self.write_script(
+                sal_index,
+                process_state=ScriptQueue.ScriptProcessState.RUNNING,
+                script_state=Script.ScriptState.RUNNING,
+            )
+            await self.write_queue()
+
+            try:
+                await asyncio.wait_for(
+                    self._stop_current_script.wait(),
+                    timeout=self.scripts[sal_index].duration,
+                )
+                script_state = Script.ScriptState.STOPPED
+            except asyncio.TimeoutError:
+                script_state = Script.ScriptState.DONE
+
+            self.current_sal_index = 0
+            self.past_queue.insert(0, sal_index)
+            self.number_of_scripts_done += 1
+            self._idle_start = time.monotonic()
+
+            await self.write_script(
+                sal_index,
+                process_state=ScriptQueue.ScriptProcessState.DONE,
+                script_state=script_state,
+            )
+            self.scripts.pop(sal_index)
+
+            await self.write_queue()
+
+    async def start(self) -> None:
+        if not self._started:
+            self._started = True
+            await self.controller.start_task
+
+            await self.controller.evt_summaryState.set_write(
+                summaryState=salobj.State.ENABLED
+            )
+            await self.write_queue()
+
+            self._run_scripts_task = asyncio.create_task(self.run_scripts())
+
+    async def close(self) -> None:
+        self._run_scripts_task.cancel()
+        try:
+            await self._run_scripts_task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.controller.close()
+
+    async def __aenter__(self) -> "ScriptQueueSimulator":
+        await self.start_task
+        return self
+
+    async def __aexit__(self, type, value, traceback) -> None:
+        await self.close()
@@ -23,12 +23,14 @@ __all__ = ["Model"]
 
 import asyncio
 import functools
+import itertools
 import logging
 import pathlib
 import types
 import typing
 import urllib.request
 import uuid
+from collections import OrderedDict
 
 import numpy as np
 from jsonschema import ValidationError
@@ -43,6 +45,7 @@ from rubin_scheduler.site_models.seeing_model import SeeingModel
 
 from .driver import Driver, DriverFactory, DriverType
 from .driver.driver_target import DriverTarget
+from .driver.script_configuration_template import get_script_configuration_templates
 from .driver.survey_topology import SurveyTopology
 from .exceptions.exceptions import TargetScriptFailedError, UpdateTelemetryError
 from .lfa_client import LFAClient
@@ -57,7 +60,10 @@ from .utils.csc_utils import (
     is_uri,
     is_valid_efd_query,
 )
-from .utils.scheduled_targets_info import ScheduledTargetsInfo
+from .utils.fbs_utils import SchemaConverter, make_fbs_observation_from_target
+from .utils.predicted_schedule_progress import PredictedScheduleProgress
+from .utils.scheduled_targets_info import ScheduledTargetStatus, ScheduledTargetsInfo
+from .utils.tracing import tracer
 from .utils.types import ValidationRules
 
 _MAX_OBSERVATIONS_FOR_SYNC_REGISTER = 100
@@ -91,15 +97,18 @@ class Model:
         Dictionary to store the scheduler models.
     raw_telemetry : `dict`[`str`, `Any`]
         Dictionary to store raw telemetry.
-    script_info : `dict`[`int`, `BaseDdsDataType`]
+    script_info : `collections.OrderedDict`[`int`, `BaseDdsDataType`]
         Dictionary to store information about the scripts sent to the
-        script queue.
+        script queue, ordered from the oldest to the newest script.
     observing_blocks : `dict`[`str`, `observing.ObservingBlock`]
         Observing blocks.
     driver : `Driver`
         Scheduler driver.
     max_scripts : `int`
         Maximum number of scripts to keep track of.
+    scheduled_targets_transitions : `asyncio.Queue`
+        Queue with the scheduled targets that reached a final status, as
+        (`ScheduledTargetStatus`, `DriverTarget`) tuples.
     startup_type : dict[str, coroutine]
         Dictionary with the startup types and functions.
     """
@@ -121,10 +130,23 @@ class Model:
         self.raw_telemetry: dict[str, typing.Any] = dict()
 
         # Dictionary to store information about the scripts put on the queue
-        self.script_info: dict[int, BaseDdsDataType] = dict()
+        self.script_info: OrderedDict[int, BaseDdsDataType] = OrderedDict()
         self._block_scripts_final_state: dict[uuid.UUID, dict[int, asyncio.Future]] = (
             dict()
         )
+        # Reverse index mapping script sal index to the block that owns it.
+        self._script_block_uid: dict[int, uuid.UUID] = dict()
+        # Scripts in each block that have not reached a final state yet.
+        self._block_pending_scripts: dict[uuid.UUID, set[int]] = dict()
+        # Blocks with all scripts in a final state, in the order they finished.
+        self._blocks_done: OrderedDict[uuid.UUID, None] = OrderedDict()
+        # Scheduled targets indexed by the sal index of their scripts.
+        self._scheduled_targets_by_sal_index: dict[int, DriverTarget] = dict()
+        # Scheduled targets that reached a final status, waiting to be
+        # processed by the CSC.
+        self.scheduled_targets_transitions: asyncio.Queue[
+            tuple[ScheduledTargetStatus, DriverTarget]
+        ] = asyncio.Queue()
 
         # Dictionary to store observing blocks
         self.observing_blocks: dict[str, observing.ObservingBlock] = dict()
@@ -331,6 +353,7 @@ class Model:
                 bad_block_programs.add(observing_block.program)
                 continue
             self.observing_blocks[observing_block.program] = observing_block
+            get_script_configuration_templates(observing_block)
 
         if bad_block_programs:
             bad_blocks = ", ".join(bad_block_programs)
@@ -354,7 +377,7 @@ class Model:
 
         for block_id in self.observing_blocks:
             target_validate = DriverTarget(
-                observing_block=self.observing_blocks[block_id].copy(deep=True)
+                observing_block=self.observing_blocks[block_id]
             )
             observing_block = target_validate.get_observing_block()
             for script in observing_block.scripts:
@@ -539,10 +562,15 @@ class Model:
     def reset_scheduled_targets(self) -> None:
         """Reset the list of scheduled targets."""
         self.raw_telemetry["scheduled_targets"] = []
+        self._scheduled_targets_by_sal_index = dict()
+        self.scheduled_targets_transitions = asyncio.Queue()
 
     def add_scheduled_target(self, target: DriverTarget) -> None:
         """Append target to scheduled target list.
 
+        The status of the target is updated as information about its scripts
+        arrives, see `callback_script_info`.
+
         Parameters
         ----------
         target : `DriverTarget`
@@ -550,6 +578,13 @@ class Model:
         """
         self.raw_telemetry["scheduled_targets"].append(target)
 
+        for sal_index in target.get_sal_indices():
+            self._scheduled_targets_by_sal_index[sal_index] = target
+
+        # Information about the scripts may have arrived before the target was
+        # added to the list.
+        self._update_scheduled_target_status(target)
+
     def get_scheduled_targets(self) -> list[DriverTarget]:
         """Return the list of scheduled targets.
 
@@ -589,56 +624,79 @@ class Model:
 
         self.script_info[data.scriptSalIndex] = data
 
-        block_all_done: list[uuid.UUID] = []
-
         self.log.trace(f"Script[{sal_index}]::{script_state!r}")
 
-        for block_uid in self._block_scripts_final_state:
-            self.log.trace(
-                f"Checking {block_uid=}::{self._block_scripts_final_state[block_uid]}"
-            )
-            if (
-                sal_index in self._block_scripts_final_state[block_uid]
-                and script_state not in NonFinalStates
-            ):
-                self.log.trace(f"{block_uid=}::{sal_index=}::{script_state!r}")
-                # Script in a final state set value of the future.
-                if (
-                    script_state in FailedStates
-                    and not self._block_scripts_final_state[block_uid][sal_index].done()
-                ):
-                    self._block_scripts_final_state[block_uid][sal_index].set_exception(
-                        TargetScriptFailedError(
-                            f"Script {sal_index} failed, state is " f"{script_state!r}."
-                        )
-                    )
-                elif not self._block_scripts_final_state[block_uid][sal_index].done():
-                    self._block_scripts_final_state[block_uid][sal_index].set_result(
-                        script_state
+        block_uid = self._script_block_uid.get(sal_index)
+
+        if (
+            block_uid is not None
+            and script_state not in NonFinalStates
+            and sal_index in self._block_scripts_final_state.get(block_uid, dict())
+        ):
+            self.log.trace(f"{block_uid=}::{sal_index=}::{script_state!r}")
+            script_final_state = self._block_scripts_final_state[block_uid][sal_index]
+            # Script in a final state set value of the future.
+            if script_final_state.done():
+                pass
+            elif script_state in FailedStates:
+                script_final_state.set_exception(
+                    TargetScriptFailedError(
+                        f"Script {sal_index} failed, state is " f"{script_state!r}."
                     )
-            all_done = all(
-                [
-                    task.done()
-                    for task in self._block_scripts_final_state[block_uid].values()
-                ]
-            )
-            if all_done:
-                block_all_done.append(block_uid)
+                )
+            else:
+                script_final_state.set_result(script_state)
+            self._set_block_script_done(block_uid=block_uid, sal_index=sal_index)
+
+        if (target := self._scheduled_targets_by_sal_index.get(sal_index)) is not None:
+            self._update_scheduled_target_status(target)
 
-        script_info_size = len(self.script_info)
-        if script_info_size > self.max_scripts:
+        while len(self.script_info) > self.max_scripts:
             # Removes old entries
-            items_to_remove = list(self.script_info.keys())[
-                : script_info_size - self.max_scripts
-            ]
-            for key in items_to_remove:
-                del self.script_info[key]
+            self.script_info.popitem(last=False)
 
-        if len(block_all_done) > self.max_scripts:
-            blocks_to_remove = block_all_done[: self.max_scripts - 1]
+        if len(self._blocks_done) > self.max_scripts:
+            blocks_to_remove = list(
+                itertools.islice(self._blocks_done, self.max_scripts - 1)
+            )
             self.log.debug(f"Removing done blocks: {blocks_to_remove}")
             for block_uid_done in blocks_to_remove:
-                del self._block_scripts_final_state[block_uid_done]
+                self._remove_block(block_uid_done)
+
+    def _set_block_script_done(self, block_uid: uuid.UUID, sal_index: int) -> None:
+        """Update the pending scripts of a block when one of its scripts
+        reaches a final state.
+
+        Parameters
+        ----------
+        block_uid : `uuid.UUID`
+            Block id.
+        sal_index : `int`
+            Index of the SAL Script.
+        """
+        pending_scripts = self._block_pending_scripts.get(block_uid)
+
+        if pending_scripts is None:
+            return
+
+        pending_scripts.discard(sal_index)
+
+        if not pending_scripts:
+            self._blocks_done[block_uid] = None
+
+    def _remove_block(self, block_uid: uuid.UUID) -> None:
+        """Stop tracking the scripts of a block.
+
+        Parameters
+        ----------
+        block_uid : `uuid.UUID`
+            Block id.
+        """
+        for sal_index in self._block_scripts_final_state.pop(block_uid, dict()):
+            if self._script_block_uid.get(sal_index) == block_uid:
+                del self._script_block_uid[sal_index]
+        self._block_pending_scripts.pop(block_uid, None)
+        self._blocks_done.pop(block_uid, None)
 
     def register_new_block(self, id: uuid.UUID) -> None:
         """Register new block.
@@ -650,6 +708,8 @@ class Model:
         """
         if id not in self._block_scripts_final_state:
             self._block_scripts_final_state[id] = dict()
+            self._block_pending_scripts[id] = set()
+            self._blocks_done[id] = None
 
     async def add_scheduled_script(
         self, id: uuid.UUID, sal_index: int
@@ -668,8 +728,17 @@ class Model:
             script, or an exception, in case the script final state is a
             `FailedStates`.
         """
-        self._block_scripts_final_state[id][sal_index] = asyncio.Future()
-        return self._block_scripts_final_state[id][sal_index]
+        script_final_state = asyncio.Future()
+        script_final_state.add_done_callback(
+            lambda _: self._set_block_script_done(block_uid=id, sal_index=sal_index)
+        )
+
+        self._block_scripts_final_state[id][sal_index] = script_final_state
+        self._script_block_uid[sal_index] = id
+        self._block_pending_scripts.setdefault(id, set()).add(sal_index)
+        self._blocks_done.pop(id, None)
+
+        return script_final_state
 
     async def check_block_scripts(self, id: uuid.UUID) -> None:
         """Check the input script states.
@@ -712,6 +781,8 @@ class Model:
 
             for sal_index in done_scripts:
                 del self._block_scripts_final_state[id][sal_index]
+                if self._script_block_uid.get(sal_index) == id:
+                    del self._script_block_uid[sal_index]
 
     async def mark_block_done(self, id: uuid.UUID) -> None:
         """Mark all scripts from a block as done.
@@ -726,125 +797,133 @@ class Model:
                 self._block_scripts_final_state[id][sal_index].set_exception(
                     RuntimeError(f"Marking script {sal_index} as done.")
                 )
+                self._set_block_script_done(block_uid=id, sal_index=sal_index)
 
-    async def check_scheduled_targets(self) -> ScheduledTargetsInfo:
-        """Loop through the scheduled targets list, check status and tell
-        driver of completed observations.
-
-        Returns
-        -------
-        scheduled_targets_info : `ScheduledTargetsInfo`
-            Information about scheduled targets.
-        """
-        scheduled_targets = self.get_scheduled_targets()
-
-        number_of_targets = len(scheduled_targets)
-
-        scheduled_targets_info = ScheduledTargetsInfo()
-
-        self.log.debug(f"Checking {number_of_targets} scheduled targets")
+    def _update_scheduled_target_status(self, target: DriverTarget) -> None:
+        """Update the status of a scheduled target from the information about
+        its scripts.
 
-        report = ""
-        debug_report = ""
+        If the target reached a final status, it is removed from the list of
+        scheduled targets, the information about its scripts is discarded and
+        the transition is put in the `scheduled_targets_transitions` queue.
 
-        for _ in range(number_of_targets):
-            target = scheduled_targets.pop(0)
-            sal_indices = target.get_sal_indices()
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Scheduled target.
+        """
+        sal_indices = target.get_sal_indices()
 
-            script_info = [
-                self.script_info[sal_index]
+        try:
+            scripts_state = [
+                Script.ScriptState(self.script_info[sal_index].scriptState)
                 for sal_index in sal_indices
                 if sal_index in self.script_info
             ]
-            try:
+        except Exception:
+            self.log.exception(
+                f"Failed to check scheduled target {target}.\n{sal_indices}."
+            )
+            return
 
-                scripts_state = [
-                    Script.ScriptState(info.scriptState) for info in script_info
-                ]
+        status: ScheduledTargetStatus | None = None
 
-                if not script_info or len(script_info) != len(sal_indices):
-                    if any([state in FailedStates for state in scripts_state]):
-                        report += (
-                            f"No information on all scripts on queue for {target.note}, "
-                            "but scripts failed. Mark as failed and continue.\n"
-                        )
-                        scheduled_targets_info.failed.append(target)
-                        for index in sal_indices:
-                            self.script_info.pop(index)
-                    else:
-                        report += (
-                            f"No information on all scripts on queue for {target}, "
-                            "put it back and continue.\n"
-                        )
-                        # No information on all scripts on queue,
-                        # put it back and continue
-                        self.raw_telemetry["scheduled_targets"].append(target)
-                    continue
-
-                if all([state == Script.ScriptState.DONE for state in scripts_state]):
-                    # All scripts completed successfully
-                    report += f"\n\t{target.note} observation completed successfully."
-
-                    scheduled_targets_info.observed.append(target)
-                    # Remove related script from the list
-                    for index in sal_indices:
-                        self.script_info.pop(index)
-                    # target now simply disappears... Should I keep it in for
-                    # future refs?
-                elif any([state in FailedStates for state in scripts_state]):
-                    # one or more script failed
-                    report += f"\n\t{target.note} failed. Not registering observation."
-                    # Remove related script from the list
-                    scheduled_targets_info.failed.append(target)
-                    for index in sal_indices:
-                        self.script_info.pop(index)
-                elif any([state in NonFinalStates for state in scripts_state]):
-                    # one or more script in a non-final state, just put it
-                    # back on
-                    # the list.
-                    debug_report += (
-                        f"\n\t{target} scripts still executing.\n"
-                        f"{target.observing_block}\n"
-                        f"{sal_indices}::{scripts_state}."
-                    )
-                    self.raw_telemetry["scheduled_targets"].append(target)
-                else:
-                    report += (
-                        (
-                            f"\n\tOne or more state unrecognized [{scripts_state}] for observations "
-                            f"{sal_indices} for target {target}."
-                        ),
-                    )
-                    scheduled_targets_info.unrecognized.extend(sal_indices)
-                    # Remove related script from the list
-                    for index in sal_indices:
-                        self.script_info.pop(index)
-            except Exception:
-                self.log.exception(
-                    f"Failed to check scheduled target {target}.\n"
-                    f"{sal_indices}."
-                    f"Report:\n\t{report}\n\tFull report: {debug_report}"
+        if not scripts_state or len(scripts_state) != len(sal_indices):
+            if any([state in FailedStates for state in scripts_state]):
+                self.log.info(
+                    f"No information on all scripts on queue for {target.note}, "
+                    "but scripts failed. Mark as failed."
                 )
-
-        if report:
+                status = ScheduledTargetStatus.FAILED
+        elif all([state == Script.ScriptState.DONE for state in scripts_state]):
+            self.log.info(f"{target.note} observation completed successfully.")
+            status = ScheduledTargetStatus.OBSERVED
+        elif any([state in FailedStates for state in scripts_state]):
+            self.log.info(f"{target.note} failed. Not registering observation.")
+            status = ScheduledTargetStatus.FAILED
+        elif not any([state in NonFinalStates for state in scripts_state]):
             self.log.info(
-                f"Check scheduled report:\n\n{report}\n\nFull report: {debug_report}."
+                f"One or more state unrecognized [{scripts_state}] for observations "
+                f"{sal_indices} for target {target}."
             )
-        else:
-            self.log.debug(f"Full report: {debug_report}")
+            status = ScheduledTargetStatus.UNRECOGNIZED
+
+        if status is None:
+            self.log.trace(
+                f"{target} scripts still executing: {sal_indices}::{scripts_state}."
+            )
+            return
+
+        for sal_index in sal_indices:
+            self.script_info.pop(sal_index, None)
+            if self._scheduled_targets_by_sal_index.get(sal_index) is target:
+                del self._scheduled_targets_by_sal_index[sal_index]
+
+        scheduled_targets = self.raw_telemetry["scheduled_targets"]
+        for index, scheduled_target in enumerate(scheduled_targets):
+            if scheduled_target is target:
+                del scheduled_targets[index]
+                break
+
+        self.scheduled_targets_transitions.put_nowait((status, target))
+
+    async def check_scheduled_targets(self) -> ScheduledTargetsInfo:
+        """Collect the scheduled targets that reached a final status.
+
+        The status of the scheduled targets is updated incrementally, as
+        information about their scripts arrive. This method simply drains the
+        `scheduled_targets_transitions` queue, so its cost is proportional to
+        the number of targets that changed status, not the number of
+        scheduled targets.
+
+        Returns
+        -------
+        scheduled_targets_info : `ScheduledTargetsInfo`
+            Information about scheduled targets.
+        """
+        scheduled_targets_info = ScheduledTargetsInfo()
+
+        while not self.scheduled_targets_transitions.empty():
+            status, target = self.scheduled_targets_transitions.get_nowait()
+            scheduled_targets_info.add(status=status, target=target)
+
+        self.log.debug(
+            f"Scheduled targets: {len(self.get_scheduled_targets())}, "
+            f"observed: {len(scheduled_targets_info.observed)}, "
+            f"failed: {len(scheduled_targets_info.failed)}, "
+            f"unrecognized: {len(scheduled_targets_info.unrecognized)}."
+        )
 
         return scheduled_targets_info
 
-    def get_general_info(self) -> dict[str, bool | float | int | str]:
+    def get_general_info(
+        self, time: float | None = None
+    ) -> dict[str, bool | float | int | str]:
         """Get general information from the driver.
 
+        Parameters
+        ----------
+        time : `float`, optional
+            Time to evaluate whether it is night (unix time). The night
+            boundaries computed the last time the driver conditions were
+            updated are used, so this does not require updating the
+            conditions. If None, use the driver night flag.
+
         Returns
         -------
         `dict`[`str`, `bool` | `float` | `int` | `str`]
             Dictionary with general information.
         """
+        is_night = self.driver.is_night
+        if (
+            time is not None
+            and self.driver.current_sunset is not None
+            and self.driver.current_sunrise is not None
+        ):
+            is_night = self.driver.current_sunset <= time < self.driver.current_sunrise
+
         return dict(
-            isNight=self.driver.is_night,
+            isNight=is_night,
             night=self.driver.night,
             sunset=self.driver.current_sunset,
             sunrise=self.driver.current_sunrise,
@@ -926,6 +1005,36 @@ class Model:
                 f"Generated {self.get_number_of_scheduled_targets()} targets."
             )
 
+    async def get_first_invalid_target(self, targets_queue: list[DriverTarget]) -> int:
+        """Find the first target in the targets queue that is no longer valid
+        with the current conditions.
+
+        The targets are evaluated against the last telemetry collected (see
+        `update_telemetry`), the telemetry is not refreshed here.
+
+        Parameters
+        ----------
+        targets_queue : `list`[`DriverTarget`]
+            Targets waiting to be sent to the ScriptQueue, in order.
+
+        Returns
+        -------
+        `int`
+            Index of the first invalid target, or the number of targets if they
+            are all still valid.
+        """
+        self.synchronize_observatory_model()
+
+        for target in self.get_scheduled_targets():
+            self.models["observatory_model"].observe(target)
+
+        loop = asyncio.get_event_loop()
+
+        with tracer.span("validate_targets", n_targets=len(targets_queue)):
+            return await loop.run_in_executor(
+                None, self.driver.get_first_invalid_target, targets_queue
+            )
+
     def register_scheduled_targets(self, targets_queue: list[DriverTarget]) -> None:
         """Register scheduled targets.
 
@@ -951,13 +1060,19 @@ class Model:
         """Synchronize observatory model state with current observatory
         state.
         """
-        self.models["observatory_model"].set_state(self.models["observatory_state"])
-        self.models["observatory_model"].start_tracking(
-            self.models["observatory_state"].time
-        )
+        with tracer.span("synchronize_observatory_model"):
+            self.models["observatory_model"].set_state(self.models["observatory_state"])
+            self.models["observatory_model"].start_tracking(
+                self.models["observatory_state"].time
+            )
 
     async def generate_targets_in_time_window(
-        self, max_targets, time_window, pre_computed_targets=[]
+        self,
+        max_targets,
+        time_window,
+        pre_computed_targets=[],
+        on_target=None,
+        progress=None,
     ):
         """Generate targets from the driver in given time window.
 
@@ -971,6 +1086,19 @@ class Model:
             A list of pre-computed targets. These targets will
             be played back into the observatory model before
             generating the targets.
+        on_target : `callable`, optional
+            Function called with each new target, as soon as it is generated.
+        progress : `asyncio.Queue`, optional
+            Queue to stream the progress of the computation. A
+            `PredictedScheduleProgress` is put in the queue after each step
+            of the simulation.
+
+        Notes
+        -----
+        The computation can be cancelled by cancelling the task running it.
+        The driver calls running in the executor cannot be interrupted, so
+        the cancellation only propagates once the current call finishes,
+        which guarantees the driver is not modified after the task is done.
 
         Returns
         -------
@@ -982,8 +1110,6 @@ class Model:
             List of targets.
         """
 
-        loop = asyncio.get_running_loop()
-
         time_start = self.models["observatory_model"].current_state.time
         time_scheduler_evaluation = time_start
 
@@ -995,6 +1121,7 @@ class Model:
         self._number_of_targets_predicted = 0
 
         keep_alive_elapsed_time_start = utils.current_tai()
+        wall_time_start = keep_alive_elapsed_time_start
 
         while (
             len(targets) < max_targets
@@ -1010,11 +1137,11 @@ class Model:
                 keep_alive_elapsed_time_start = utils.current_tai()
                 await asyncio.sleep(self._keep_alive_wait_time)
 
-            await loop.run_in_executor(None, self.driver.update_conditions)
+            await self._run_prediction_step(self.driver.update_conditions)
 
             await asyncio.sleep(0)
 
-            target = await loop.run_in_executor(None, self.driver.select_next_target)
+            target = await self._run_prediction_step(self.driver.select_next_target)
 
             await asyncio.sleep(0)
 
@@ -1033,12 +1160,96 @@ class Model:
                     "observatory_model"
                 ].current_state.time
                 targets.append(target)
+                if on_target is not None:
+                    on_target(target)
                 await self.register_observations([target])
 
+            if progress is not None:
+                progress.put_nowait(
+                    PredictedScheduleProgress(
+                        number_of_targets=len(targets),
+                        simulated_time=time_scheduler_evaluation,
+                        elapsed_time=utils.current_tai() - wall_time_start,
+                    )
+                )
+
         self._number_of_targets_predicted = None
 
         return time_scheduler_evaluation, time_start, targets
 
+    async def _run_prediction_step(
+        self, func: typing.Callable[[], typing.Any]
+    ) -> typing.Any:
+        """Run a step of the predicted schedule computation in the executor.
+
+        If the calling task is cancelled, wait for the step to finish before
+        propagating the cancellation.
+
+        Parameters
+        ----------
+        func : `callable`
+            Function to run.
+
+        Returns
+        -------
+        `typing.Any`
+            Value returned by the function.
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, func)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    def get_night_boundaries(self, time: float) -> tuple[float, float]:
+        """Get the boundaries of the night at, or following, a given time.
+
+        Parameters
+        ----------
+        time : `float`
+            Time (unix time).
+
+        Returns
+        -------
+        sunset : `float`
+            Time of the sunset (unix time).
+        sunrise : `float`
+            Time of the sunrise (unix time).
+        """
+        self.models["sky"].update(time)
+        return self.models["sky"].get_night_boundaries(
+            self.driver.parameters.night_boundary
+        )
+
+    def write_opsim_database(self, targets: list[DriverTarget], filename: str) -> None:
+        """Write targets to an opsim database, replacing any existing file.
+
+        Parameters
+        ----------
+        targets : `list`[`DriverTarget`]
+            Targets, with ``obs_time`` set to the time they are observed (MJD).
+        filename : `str`
+            Name of the database file.
+        """
+        if not targets:
+            self.log.warning(f"No targets to write to {filename}.")
+            return
+
+        observations = []
+        for target in targets:
+            observation = (
+                target.observation.copy()
+                if hasattr(target, "observation")
+                else make_fbs_observation_from_target(target)
+            )
+            observation["mjd"][0] = target.obs_time
+            observations.append(observation)
+
+        SchemaConverter().obs2opsim(
+            np.concatenate(observations), filename=filename, delete_past=True
+        )
+
     def get_number_of_scheduled_targets(self) -> int:
         """Get the number of scheduled targets.
 
@@ -1139,7 +1350,8 @@ class Model:
         `str`
             Name of the file with the stored state.
         """
-        return self.driver.save_state(targets_queue)
+        with tracer.span("save_state"):
+            return self.driver.save_state(targets_queue)
 
     def reset_state(self, last_scheduler_state_filename: str) -> None:
         """Reset driver state from file.
@@ -1152,7 +1364,8 @@ class Model:
         self.log.debug(
             f"Resetting scheduler state from {last_scheduler_state_filename}."
         )
-        self.driver.reset_from_state(last_scheduler_state_filename)
+        with tracer.span("reset_from_state"):
+            self.driver.reset_from_state(last_scheduler_state_filename)
 
     async def _handle_driver_configure_scheduler(
         self, config: typing.Any
@@ -1442,47 +1655,127 @@ class Model:
         """Update data on all the telemetry values."""
 
         try:
-            if self.telemetry_stream_handler is not None:
-                self.log.trace("Updating telemetry stream.")
+            await self.update_telemetry_streams()
+
+            self.models["observatory_model"].update_state(
+                utils.astropy_time_from_tai_unix(utils.current_tai()).unix
+            )
+
+            loop = asyncio.get_event_loop()
 
-                for telemetry in self.telemetry_stream_handler.telemetry_streams:
+            await loop.run_in_executor(None, self.driver.update_conditions)
+
+        except Exception as exception:
+            raise UpdateTelemetryError("Failed to update telemetry.") from exception
+
+    async def update_telemetry_streams(self) -> None:
+        """Update the raw telemetry values, without updating the driver
+        conditions.
+        """
+        if self.telemetry_stream_handler is not None:
+            self.log.trace("Updating telemetry stream.")
+
+            for telemetry in self.telemetry_stream_handler.telemetry_streams:
+                with tracer.span(f"update_telemetry.{telemetry}"):
                     telemetry_data = (
                         await self.telemetry_stream_handler.retrieve_telemetry(
                             telemetry
                         )
                     )
 
-                    self.raw_telemetry[telemetry] = (
-                        telemetry_data[0]
-                        if len(telemetry_data) == 1
-                        else telemetry_data
-                    )
-            else:
-                self.log.debug("Telemetry stream not configured.")
+                self.raw_telemetry[telemetry] = (
+                    telemetry_data[0] if len(telemetry_data) == 1 else telemetry_data
+                )
+        else:
+            self.log.debug("Telemetry stream not configured.")
 
-            if self.too_client is not None:
-                self.log.trace("Retrieving ToO alerts.")
+        if self.too_client is not None:
+            self.log.trace("Retrieving ToO alerts.")
+            with tracer.span("update_telemetry.too_alerts"):
                 too_alerts = await self.too_client.get_too_alerts()
-                if too_alerts:
-                    self.log.debug(f"{too_alerts=}")
-                    self.raw_telemetry["too_alerts"] = list(too_alerts.values())
+            if too_alerts:
+                self.log.debug(f"{too_alerts=}")
+                self.raw_telemetry["too_alerts"] = list(too_alerts.values())
 
-            if self.lfa_client is not None:
-                self.log.trace("Retrieving LFA alerts.")
+        if self.lfa_client is not None:
+            self.log.trace("Retrieving LFA alerts.")
+            with tracer.span("update_telemetry.lfa_data"):
                 lfa_data = await self.lfa_client.retrieve_lfa_data()
-                if lfa_data:
-                    self.raw_telemetry["lfa_data"] = list(lfa_data.values())
+            if lfa_data:
+                self.raw_telemetry["lfa_data"] = list(lfa_data.values())
 
-            self.models["observatory_model"].update_state(
-                utils.astropy_time_from_tai_unix(utils.current_tai()).unix
-            )
+    def get_telemetry_snapshot(self) -> dict[str, float]:
+        """Return the current scalar telemetry values.
 
-            loop = asyncio.get_event_loop()
+        Returns
+        -------
+        `dict` [`str`, `float`]
+            Telemetry values, by telemetry stream name.
+        """
+        return {
+            name: float(value)
+            for name, value in self.raw_telemetry.items()
+            if isinstance(value, (float, int, np.number))
+            and not isinstance(value, bool)
+        }
+
+    def telemetry_changed(
+        self, telemetry_snapshot: dict[str, float], tolerance: float
+    ) -> bool:
+        """Check if the telemetry changed materially since a snapshot was
+        taken.
+
+        A value changed materially if the change is larger than both the
+        relative tolerance and the ``change_tolerance`` of its telemetry
+        stream. For periodic values (telemetry streams with a ``period``,
+        e.g. angles) the change is computed with wrap-around and only the
+        ``change_tolerance`` applies.
 
-            await loop.run_in_executor(None, self.driver.update_conditions)
+        Parameters
+        ----------
+        telemetry_snapshot : `dict` [`str`, `float`]
+            Telemetry values, as returned by `get_telemetry_snapshot`.
+        tolerance : `float`
+            Maximum relative change in any telemetry value.
 
-        except Exception as exception:
-            raise UpdateTelemetryError("Failed to update telemetry.") from exception
+        Returns
+        -------
+        `bool`
+            True if any telemetry value changed by more than the tolerance,
+            became available or stopped being available.
+        """
+        current_telemetry = self.get_telemetry_snapshot()
+
+        if current_telemetry.keys() != telemetry_snapshot.keys():
+            return True
+
+        telemetry_streams = (
+            self.telemetry_stream_handler.telemetry_streams
+            if self.telemetry_stream_handler is not None
+            else dict()
+        )
+
+        for name, value in telemetry_snapshot.items():
+            current_value = current_telemetry[name]
+            if np.isnan(value) or np.isnan(current_value):
+                if np.isnan(value) != np.isnan(current_value):
+                    return True
+                continue
+
+            telemetry_stream = telemetry_streams.get(name, dict())
+            change_tolerance = telemetry_stream.get("change_tolerance", 0.0)
+            period = telemetry_stream.get("period")
+
+            if period is not None:
+                change = abs(current_value - value) % period
+                if min(change, period - change) > change_tolerance:
+                    return True
+            elif abs(current_value - value) > max(
+                tolerance * abs(value), change_tolerance
+            ):
+                return True
+
+        return False
 
     def get_number_of_predicted_targets(self):
         """Return the number of targets that are currently in the predicted
@@ -0,0 +1,348 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "PredictedScheduleEnsembleSummary",
+    "ScenarioTarget",
+    "WeatherScenario",
+    "init_scenario_worker",
+    "make_weather_scenarios",
+    "run_weather_scenario",
+    "summarize_weather_scenarios",
+]
+
+import pickle
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from .driver.driver_target import DriverTarget
+
+# Scheduler state shared by the scenarios, set in each worker process by
+# `init_scenario_worker`.
+_scenario_state: bytes | None = None
+
+
+@dataclass
+class WeatherScenario:
+    """Perturbation of the current conditions used to compute a predicted
+    schedule.
+    """
+
+    seeing_scale: float = 1.0
+    # Factor applied to the seeing.
+
+    cloud_offset: float = 0.0
+    # Offset added to the bulk cloud coverage, the result is clipped to
+    # [0, 1].
+
+    mounted_filters: list[str] | None = None
+    # Filters mounted in the camera, None to keep the current filters.
+
+    def apply(self, driver: typing.Any) -> None:
+        """Apply the scenario to a driver.
+
+        Parameters
+        ----------
+        driver : `Driver`
+            Driver to apply the scenario to. This should be a copy of the live
+            driver.
+        """
+        if "seeing" in driver.raw_telemetry:
+            driver.raw_telemetry["seeing"] = (
+                np.asarray(driver.raw_telemetry["seeing"], dtype=float)
+                * self.seeing_scale
+            )
+
+        if "bulk_cloud" in driver.raw_telemetry:
+            driver.raw_telemetry["bulk_cloud"] = np.clip(
+                np.asarray(driver.raw_telemetry["bulk_cloud"], dtype=float)
+                + self.cloud_offset,
+                0.0,
+                1.0,
+            )
+
+        if self.mounted_filters is not None:
+            driver.models["observatory_state"].mountedfilters = list(
+                self.mounted_filters
+            )
+            driver.models["observatory_model"].current_state.mountedfilters = list(
+                self.mounted_filters
+            )
+
+
+@dataclass
+class ScenarioTarget:
+    """Summary of a target in a predicted schedule."""
+
+    note: str
+    band_filter: str
+    ra: float
+    dec: float
+    start_time: float
+    # Time when the target starts being observed (MJD).
+
+    @classmethod
+    def from_target(cls, target: DriverTarget) -> "ScenarioTarget":
+        """Summarize a target.
+
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Target, with ``obs_time`` set to the start time (MJD).
+
+        Returns
+        -------
+        `ScenarioTarget`
+            Target summary.
+        """
+        return cls(
+            note=str(target.note),
+            band_filter=target.filter,
+            ra=target.ra,
+            dec=target.dec,
+            start_time=target.obs_time,
+        )
+
+    def matches(self, other: "ScenarioTarget") -> bool:
+        """Check if this is the same target as another one, regardless of
+        when it is observed.
+
+        Parameters
+        ----------
+        other : `ScenarioTarget`
+            Target to compare with.
+
+        Returns
+        -------
+        `bool`
+            True if the targets match.
+        """
+        return (
+            self.note == other.note
+            and self.band_filter == other.band_filter
+            and bool(np.isclose(self.ra, other.ra))
+            and bool(np.isclose(self.dec, other.dec))
+        )
+
+
+@dataclass
+class PredictedScheduleEnsembleSummary:
+    """Summary of the predicted schedule computed under several weather
+    scenarios.
+
+    The arrays follow the order of the targets in the nominal predicted
+    schedule.
+    """
+
+    n_scenarios: int
+    # Number of scenarios computed.
+
+    probability: np.ndarray
+    # Fraction of the scenarios in which each target is observed.
+
+    start_time_mean: np.ndarray
+    # Mean start time of each target (MJD) in the scenarios in which it is
+    # observed, nan if it is never observed.
+
+    start_time_std: np.ndarray
+    # Standard deviation of the start time of each target (seconds) in the
+    # scenarios in which it is observed, nan if it is never observed.
+
+
+def make_weather_scenarios(
+    n_scenarios: int,
+    seeing_sigma: float,
+    cloud_sigma: float,
+    mounted_filters: list[list[str]],
+    seed: int,
+) -> list[WeatherScenario]:
+    """Make a set of random weather scenarios.
+
+    Parameters
+    ----------
+    n_scenarios : `int`
+        Number of scenarios.
+    seeing_sigma : `float`
+        Standard deviation of the log of the seeing scale factor.
+    cloud_sigma : `float`
+        Standard deviation of the bulk cloud coverage offset.
+    mounted_filters : `list` [`list` [`str`]]
+        Alternative sets of mounted filters. The scenarios cycle through them.
+        If empty, the current filters are kept.
+    seed : `int`
+        Seed for the random number generator.
+
+    Returns
+    -------
+    `list` [`WeatherScenario`]
+        Weather scenarios.
+    """
+    rng = np.random.default_rng(seed)
+
+    seeing_scales = np.exp(rng.normal(0.0, seeing_sigma, n_scenarios))
+    cloud_offsets = rng.normal(0.0, cloud_sigma, n_scenarios)
+
+    return [
+        WeatherScenario(
+            seeing_scale=float(seeing_scales[i]),
+            cloud_offset=float(cloud_offsets[i]),
+            mounted_filters=(
+                mounted_filters[i % len(mounted_filters)] if mounted_filters else None
+            ),
+        )
+        for i in range(n_scenarios)
+    ]
+
+
+def init_scenario_worker(scenario_state: bytes) -> None:
+    """Initialize a worker process to run weather scenarios.
+
+    Parameters
+    ----------
+    scenario_state : `bytes`
+        Pickled tuple with the driver and the list of targets already
+        scheduled, to play back before generating new targets.
+    """
+    global _scenario_state
+    _scenario_state = scenario_state
+
+
+def run_weather_scenario(
+    scenario: WeatherScenario,
+    max_targets: int,
+    time_window: float,
+    time_delta_no_target: float,
+) -> list[ScenarioTarget]:
+    """Compute a predicted schedule under a weather scenario.
+
+    This follows `Model.generate_targets_in_time_window`, on a copy of the
+    driver loaded from the state given to `init_scenario_worker`.
+
+    Parameters
+    ----------
+    scenario : `WeatherScenario`
+        Weather scenario.
+    max_targets : `int`
+        Maximum number of targets.
+    time_window : `float`
+        Length of time in the future to compute targets (in seconds).
+    time_delta_no_target : `float`
+        How long to step in time when there is no target (in seconds).
+
+    Returns
+    -------
+    `list` [`ScenarioTarget`]
+        Predicted targets.
+    """
+    if _scenario_state is None:
+        raise RuntimeError("Worker not initialized. Call init_scenario_worker first.")
+
+    driver, pre_computed_targets = pickle.loads(_scenario_state)
+
+    scenario.apply(driver)
+
+    observatory_model = driver.models["observatory_model"]
+
+    time_start = observatory_model.current_state.time
+    time_scheduler_evaluation = time_start
+
+    observatory_model.update_state(time_scheduler_evaluation)
+    for target in pre_computed_targets:
+        observatory_model.observe(target)
+
+    targets = []
+
+    while (
+        len(targets) < max_targets
+        and (time_scheduler_evaluation - time_start) < time_window
+    ):
+        driver.update_conditions()
+
+        target = driver.select_next_target()
+
+        if target is None:
+            time_scheduler_evaluation += time_delta_no_target
+            observatory_model.update_state(time_scheduler_evaluation)
+        else:
+            target.obs_time = observatory_model.dateprofile.mjd
+            observatory_model.observe(target)
+            time_scheduler_evaluation = observatory_model.current_state.time
+            driver.register_observed_target(target)
+            targets.append(ScenarioTarget.from_target(target))
+
+    return targets
+
+
+def summarize_weather_scenarios(
+    nominal_targets: list[ScenarioTarget],
+    scenarios_targets: list[list[ScenarioTarget]],
+) -> PredictedScheduleEnsembleSummary:
+    """Summarize the predicted schedules computed under several weather
+    scenarios.
+
+    Parameters
+    ----------
+    nominal_targets : `list` [`ScenarioTarget`]
+        Targets in the nominal predicted schedule.
+    scenarios_targets : `list` [`list` [`ScenarioTarget`]]
+        Targets in the predicted schedule of each scenario.
+
+    Returns
+    -------
+    `PredictedScheduleEnsembleSummary`
+        Summary, following the order of the nominal targets.
+    """
+    n_targets = len(nominal_targets)
+    n_scenarios = len(scenarios_targets)
+
+    start_times = np.full((n_scenarios, n_targets), np.nan)
+
+    for i, scenario_targets in enumerate(scenarios_targets):
+        for j, nominal_target in enumerate(nominal_targets):
+            for scenario_target in scenario_targets:
+                if nominal_target.matches(scenario_target):
+                    start_times[i, j] = scenario_target.start_time
+                    break
+
+    observed = ~np.isnan(start_times)
+    n_observed = observed.sum(axis=0)
+
+    probability = n_observed / n_scenarios if n_scenarios > 0 else np.zeros(n_targets)
+
+    start_time_mean = np.full(n_targets, np.nan)
+    start_time_std = np.full(n_targets, np.nan)
+    has_observations = n_observed > 0
+    if np.any(has_observations):
+        start_time_mean[has_observations] = np.nanmean(
+            start_times[:, has_observations], axis=0
+        )
+        start_time_std[has_observations] = (
+            np.nanstd(start_times[:, has_observations], axis=0) * 24.0 * 60.0 * 60.0
+        )
+
+    return PredictedScheduleEnsembleSummary(
+        n_scenarios=n_scenarios,
+        probability=probability,
+        start_time_mean=start_time_mean,
+        start_time_std=start_time_std,
+    )
@@ -30,6 +30,7 @@ import dataclasses
 import functools
 import logging
 import os
+import pickle
 import shutil
 import subprocess
 import time
@@ -37,10 +38,11 @@ import traceback
 import types
 import typing
 import uuid
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
 import yaml
+from astropy.time import Time
 from lsst.ts import salobj, utils
 from lsst.ts.astrosky.model import version as astrosky_version
 
@@ -70,15 +72,25 @@ from .exceptions.exceptions import (
     UpdateTelemetryError,
 )
 from .model import Model
+from .predicted_schedule_ensemble import (
+    PredictedScheduleEnsembleSummary,
+    ScenarioTarget,
+    init_scenario_worker,
+    make_weather_scenarios,
+    run_weather_scenario,
+    summarize_weather_scenarios,
+)
 from .utils.csc_utils import (
-    OBSERVATION_NAMED_PARAMETERS,
     BlockStatus,
     DetailedState,
+    PredictedScheduleBuffer,
+    RateLimiter,
     SchedulerModes,
     set_detailed_state,
 )
 from .utils.error_codes import (
     ADVANCE_LOOP_ERROR,
+    DRY_LOOP_ERROR,
     NO_QUEUE,
     OBSERVATORY_STATE_UPDATE,
     PUT_ON_QUEUE,
@@ -86,8 +98,17 @@ from .utils.error_codes import (
     UNABLE_TO_FIND_TARGET,
     UPDATE_TELEMETRY_ERROR,
 )
-from .utils.parameters import ObservatoryStatus, SchedulerCscParameters
+from .utils.loop_monitor import EventLoopMonitor, InstrumentedThreadPoolExecutor
+from .utils.parameters import (
+    DryRun,
+    ObservatoryStatus,
+    PredictedScheduleEnsemble,
+    SchedulerCscParameters,
+    Tracing,
+)
+from .utils.predicted_schedule_progress import PredictedScheduleProgress
 from .utils.s3_utils import handle_lfoa
+from .utils.tracing import tracer
 from .utils.types import ValidationRules
 
 SchedulerObservatoryStatus = Scheduler.ObservatoryStatus
@@ -230,6 +251,22 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         # The maximum number of targets in the predicted schedule.
         self.max_predicted_targets = 1000
 
+        # Column buffers used to assemble the predicted schedule.
+        self._predicted_schedule_buffer = PredictedScheduleBuffer(
+            size=self.max_predicted_targets
+        )
+
+        # Targets from the last predicted schedule, including the targets
+        # queue, and the scheduler state at the end of the prediction.
+        self._predicted_schedule_targets: list[DriverTarget] = []
+        self._predicted_schedule_checkpoint: str | None = None
+
+        # Summary of the last predicted schedule computed under several
+        # weather scenarios.
+        self.predicted_schedule_ensemble_summary: (
+            PredictedScheduleEnsembleSummary | None
+        ) = None
+
         # Default command response timeout, in seconds.
         self.default_command_timeout = 60.0
 
@@ -259,6 +296,24 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         self._max_queue_capacity = 10
         self._queue_capacity = asyncio.Semaphore(self._max_queue_capacity)
 
+        # Limit the rate at which scripts are added to the ScriptQueue.
+        self._script_add_rate_limiter = RateLimiter(
+            rate=self.parameters.script_add_rate
+        )
+        # Add the scripts of a block concurrently? This is disabled if the
+        # ScriptQueue does not preserve the order the scripts are added.
+        self._pipelined_script_submission = True
+
+        # Default executor of the event loop, instrumented to monitor how
+        # many calls are waiting for a thread, and event loop monitor.
+        self._executor = InstrumentedThreadPoolExecutor()
+        self._loop_monitor = EventLoopMonitor(
+            log=self.log,
+            sample_interval=self.heartbeat_interval / 10.0,
+            warning_lag=self.heartbeat_interval / 2.0,
+            executor=self._executor,
+        )
+
         # dictionary to store background tasks
         self._tasks = dict()
 
@@ -271,6 +326,15 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         # Telemetry loop. This will take care of observatory state.
         self._tasks["telemetry_loop_task"] = None
 
+        # Refresh the telemetry while the Scheduler is idle.
+        self._tasks["telemetry_refresh_task"] = None
+
+        # Monitor the event loop lag and executor queue depth.
+        self._tasks["loop_monitor_task"] = None
+
+        # Export the duration of the target production stages.
+        self._tasks["trace_export_task"] = None
+
         # List of targets used in the ADVANCE target loop
         self.targets_queue: list[DriverTarget] = []
 
@@ -278,6 +342,15 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         # scheduler.
         self._no_target_handled = False
 
+        # Telemetry values when the targets in the targets_queue were
+        # generated.
+        self._targets_queue_telemetry: dict[str, float] | None = None
+
+        # Queue version and telemetry values when the targets in the
+        # targets_queue were last validated.
+        self._targets_queue_validated_version: int | None = None
+        self._targets_queue_validated_telemetry: dict[str, float] | None = None
+
         # Future to store the results or target_queue check.
         self.targets_queue_condition = utils.make_done_future()
         self._should_compute_predicted_schedule = False
@@ -299,6 +372,13 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         # Add callback to script info
         self.queue_remote.evt_script.callback = self.check_script_info
 
+        # Mirror of the ScriptQueue state, maintained by the queue event
+        # callback, and a counter incremented every time it changes.
+        self._queue_state: salobj.type_hints.BaseMsgType | None = None
+        self._queue_version = 0
+        self._queue_changed_event = asyncio.Event()
+        self.queue_remote.evt_queue.callback = self._update_queue_state
+
         # Future to store the task to monitor observatory status.
         self._observatory_status_task = utils.make_done_future()
 
@@ -344,6 +424,7 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         """
 
         await super().start()
+        asyncio.get_running_loop().set_default_executor(self._executor)
         await self.set_observatory_status(
             status=SchedulerObservatoryStatus.UNKNOWN,
             note=(
@@ -355,6 +436,11 @@ class SchedulerCSC(salobj.ConfigurableCsc):
     async def close(self):
         await super().close()
         self.model.close()
+        # The instrumented executor was made the default executor of the
+        # event loop in `start`, replace it with a plain one so it can be
+        # shut down without breaking other users of the event loop.
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor())
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     async def begin_start(self, data):
         if (
@@ -432,10 +518,7 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         # enabled.
         self.run_target_loop.clear()
 
-        if (
-            self.simulation_mode == SchedulerModes.SIMULATION
-            or self.parameters.mode == "DRY"
-        ):
+        if self.simulation_mode == SchedulerModes.SIMULATION:
             self.log.info(
                 "Running with no target production loop. "
                 f"Operation mode: {self.parameters.mode}. "
@@ -453,6 +536,11 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                 self.advance_target_production_loop()
             )
 
+        elif self.parameters.mode == "DRY":
+            self._tasks["target_production_task"] = asyncio.create_task(
+                self.dry_target_production_loop()
+            )
+
         else:
             # This will just reject the command
             raise RuntimeError("Unrecognized scheduler mode %s" % self.parameters.mode)
@@ -469,6 +557,20 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             self._tasks["telemetry_loop_task"] = asyncio.create_task(
                 self.telemetry_loop()
             )
+            self._tasks["telemetry_refresh_task"] = asyncio.create_task(
+                self.telemetry_refresh_loop()
+            )
+            if self.parameters.loop_monitor_interval > 0.0:
+                self._tasks["loop_monitor_task"] = asyncio.create_task(
+                    self._loop_monitor.run(
+                        report_interval=self.parameters.loop_monitor_interval,
+                        keep_running=lambda: self.run_loop,
+                    )
+                )
+            if self.parameters.tracing.enable:
+                self._tasks["trace_export_task"] = asyncio.create_task(
+                    self.trace_export_loop()
+                )
 
             await self.reset_handle_no_targets_on_queue()
 
@@ -627,6 +729,10 @@ class SchedulerCSC(salobj.ConfigurableCsc):
     async def do_stop(self, data):
         """Stop target production loop.
 
+        If the target production loop is not running but the predicted
+        schedule is being computed by the computePredictedSchedule command,
+        cancel the computation instead.
+
         Parameters
         ----------
         data : `DataType`
@@ -637,6 +743,12 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         self.assert_enabled()
 
         if not self.run_target_loop.is_set():
+            compute_task = self._tasks.get("compute_predicted_schedule")
+            if compute_task is not None and not compute_task.done():
+                self.log.info("Cancelling predicted schedule computation.")
+                compute_task.cancel()
+                await asyncio.wait([compute_task])
+                return
             raise RuntimeError("Target production loop is not running.")
 
         await asyncio.sleep(self.heartbeat_interval / 2)
@@ -764,44 +876,82 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             result="Computing predicted schedule.",
         )
 
+        progress = asyncio.Queue()
+
         async with self.idle_to_running():
-            self._tasks["compute_predicted_schedule"] = asyncio.create_task(
-                self.compute_predicted_schedule()
+            compute_task = asyncio.create_task(
+                self.compute_predicted_schedule(progress=progress)
             )
-            number_of_predicted_targets = None
-            while number_of_predicted_targets is None:
-                number_of_predicted_targets = (
-                    self.model.get_number_of_predicted_targets()
+            self._tasks["compute_predicted_schedule"] = compute_task
+
+            # Stall detection only starts once the first step of the
+            # computation is done, as setting up the scheduler state may take
+            # some time.
+            last_progress = None
+            last_ack_time = utils.current_tai()
+
+            while not compute_task.done():
+                progress_task = asyncio.create_task(progress.get())
+                done, _ = await asyncio.wait(
+                    [compute_task, progress_task],
+                    timeout=self.default_command_timeout / 2.0,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-                await asyncio.sleep(self.heartbeat_interval)
+                if progress_task.done():
+                    last_progress = progress_task.result()
+                    while not progress.empty():
+                        last_progress = progress.get_nowait()
+                else:
+                    progress_task.cancel()
+
+                if not done and last_progress is not None:
+                    compute_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await compute_task
+                    raise RuntimeError(
+                        "Predicted schedule computation not making progress in the "
+                        f"last {self.default_command_timeout / 2.0}s; "
+                        f"got {last_progress.number_of_targets} targets. Cancelled."
+                    )
 
-            while not self._tasks["compute_predicted_schedule"]:
-                for task in asyncio.as_completed(
-                    [
-                        asyncio.sleep(self.default_command_timeout / 2.0),
-                        self._tasks["compute_predicted_schedule"],
-                    ]
+                if (
+                    not compute_task.done()
+                    and utils.current_tai() - last_ack_time >= self.heartbeat_interval
                 ):
-                    n_targets = self.model.get_number_of_predicted_targets()
-                    if (
-                        n_targets is not None
-                        and n_targets <= number_of_predicted_targets
-                    ):
-                        self._tasks["compute_predicted_schedule"].cancel()
-                        raise RuntimeError(
-                            "Predict scheduler loop not making progress. "
-                            f"Got {n_targets}."
-                        )
-                    else:
-                        number_of_predicted_targets = n_targets
-                        break
-                await self.cmd_computePredictedSchedule.ack_in_progress(
-                    data,
-                    timeout=self.default_command_timeout,
-                    result=f"Computing predicted schedule ({number_of_predicted_targets}).",
-                )
+                    last_ack_time = utils.current_tai()
+                    await self.cmd_computePredictedSchedule.ack_in_progress(
+                        data,
+                        timeout=self.default_command_timeout,
+                        result=self._format_predicted_schedule_progress(last_progress),
+                    )
+
+            await compute_task
+
+    @staticmethod
+    def _format_predicted_schedule_progress(
+        progress: PredictedScheduleProgress | None,
+    ) -> str:
+        """Format the progress of the predicted schedule computation.
+
+        Parameters
+        ----------
+        progress : `PredictedScheduleProgress` or `None`
+            Last progress of the computation, None if it did not start yet.
 
-            await self._tasks["compute_predicted_schedule"]
+        Returns
+        -------
+        `str`
+            Progress message.
+        """
+        if progress is None:
+            return "Computing predicted schedule (setting up)."
+
+        # The observatory model time is UTC unix time.
+        simulated_time = Time(progress.simulated_time, format="unix")
+        return (
+            f"Computing predicted schedule ({progress.number_of_targets} targets, "
+            f"up to {simulated_time.isot}, elapsed {progress.elapsed_time:.1f}s)."
+        )
 
     async def do_addBlock(self, data):
         """Implement add block command.
@@ -1131,6 +1281,70 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
             await timer_task
 
+    async def telemetry_refresh_loop(self) -> None:
+        """Refresh the telemetry and the driver conditions while the
+        Scheduler is idle.
+
+        While the Scheduler is running, the target loop updates the
+        telemetry, so this only refreshes it when it is idle, every
+        ``telemetry_refresh_interval`` seconds. The interval is checked on
+        every iteration, the telemetry is not refreshed while it is 0.
+        """
+
+        last_refresh_time = None
+
+        while self.run_loop:
+            if (
+                self.parameters.telemetry_refresh_interval > 0.0
+                and self.evt_detailedState.data.substate == DetailedState.IDLE
+                and (
+                    last_refresh_time is None
+                    or time.monotonic() - last_refresh_time
+                    >= self.parameters.telemetry_refresh_interval
+                )
+            ):
+                try:
+                    async with self._detailed_state_lock:
+                        await self.model.update_telemetry()
+                except Exception:
+                    self.log.exception("Error refreshing telemetry. Ignoring...")
+                last_refresh_time = time.monotonic()
+
+            # Sleep in short intervals to stop promptly when the CSC leaves
+            # DISABLED/ENABLED.
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def trace_export_loop(self) -> None:
+        """Periodically export the duration of the target production stages.
+
+        The spans are written to ``tracing.filename`` every
+        ``tracing.export_interval`` seconds, and once more when the loop
+        stops.
+        """
+
+        export_time = time.monotonic() + self.parameters.tracing.export_interval
+
+        while self.run_loop:
+            if time.monotonic() >= export_time:
+                await self._export_trace()
+                export_time = time.monotonic() + self.parameters.tracing.export_interval
+
+            await asyncio.sleep(self.heartbeat_interval)
+
+        await self._export_trace()
+
+    async def _export_trace(self) -> None:
+        """Export the recorded spans and log a summary."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                tracer.export_chrome_trace,
+                self.parameters.tracing.filename,
+            )
+            self.log.info(f"Target production stages timing:\n{tracer.get_summary()}")
+        except Exception:
+            self.log.exception("Error exporting trace. Ignoring...")
+
     async def _cleanup_script_tasks(self) -> None:
         """Cleanup completed script tasks."""
         script_tasks_done = [
@@ -1211,13 +1425,32 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             A list of targets to put on the queue.
         """
 
-        for target in targets:
-            observing_block = target.get_observing_block()
+        with tracer.span("put_on_queue", n_targets=len(targets)):
+            for target in targets:
+                if not await self._put_target_on_queue(target):
+                    return
 
-            self.log.info(f"Adding {target=!s} scripts on the queue.")
+    async def _put_target_on_queue(self, target: DriverTarget) -> bool:
+        """Append the scripts of a target on the queue.
+
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Target to put on the queue.
+
+        Returns
+        -------
+        `bool`
+            False if the block of the target was marked as failed, True
+            otherwise.
+        """
+        observing_block = target.get_observing_block()
 
-            self.model.register_new_block(id=observing_block.id)
-            initial_sal_index = None
+        self.log.info(f"Adding {target=!s} scripts on the queue.")
+
+        self.model.register_new_block(id=observing_block.id)
+        initial_sal_index = None
+        try:
             async for sal_index in self._queue_block_scripts(observing_block):
                 self.log.info(f"{observing_block.name}::{sal_index=}.")
                 if initial_sal_index is None:
@@ -1235,20 +1468,32 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                         block_status=BlockStatus.ERROR,
                         observing_block=observing_block,
                     )
-                    return
-                finally:
-                    await asyncio.sleep(self.heartbeat_interval)
-
-            # publishes target event
-            target_data = target.as_dict()
-            target_data["blockId"] = initial_sal_index
-            await self.evt_target.set_write(**target_data)
-
+                    return False
+        except salobj.AckError:
+            self.log.exception(
+                f"ScriptQueue rejected a script of block {observing_block.name}::{observing_block.id}. "
+                "Marking block as failed."
+            )
+            await self.remove_from_queue(targets=[target])
             await self._update_block_status(
                 block_id=observing_block.program,
-                block_status=BlockStatus.EXECUTING,
+                block_status=BlockStatus.ERROR,
                 observing_block=observing_block,
             )
+            raise
+
+        # publishes target event
+        target_data = target.as_dict()
+        target_data["blockId"] = initial_sal_index
+        await self.evt_target.set_write(**target_data)
+
+        await self._update_block_status(
+            block_id=observing_block.program,
+            block_status=BlockStatus.EXECUTING,
+            observing_block=observing_block,
+        )
+
+        return True
 
     async def _queue_block_scripts(
         self, observing_block: ObservingBlock
@@ -1267,13 +1512,44 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
         Notes
         -----
-        This method will use `_queue_one_script` to queue the scripts by
-        creating a list of background tasks and waiting for them to finish.
-        The background tasks will acquire a semaphore that will limit the
-        number of consecutive scripts running in the ScriptQueue. If the limit
-        is not met, the method will return soon after all scripts are
-        scheduled. If the limit is reached, the method will block and only
-        make progress once the scripts finish executing.
+        This method will use `_queue_one_script` to queue the scripts. The
+        underlying method will acquire a semaphore that will limit the number
+        of consecutive scripts running in the ScriptQueue. If the limit is not
+        met, the method will return soon after all scripts are scheduled. If
+        the limit is reached, the method will block and only make progress
+        once the scripts finish executing.
+
+        If pipelined submission is enabled (``max_concurrent_script_adds`` >
+        1), the scripts are added concurrently, see
+        `_queue_block_scripts_pipelined`, otherwise they are added one at a
+        time.
+        """
+        if (
+            self._pipelined_script_submission
+            and self.parameters.max_concurrent_script_adds > 1
+            and len(observing_block.scripts) > 1
+        ):
+            queue_block_scripts = self._queue_block_scripts_pipelined
+        else:
+            queue_block_scripts = self._queue_block_scripts_serial
+
+        async for sal_index in queue_block_scripts(observing_block):
+            yield sal_index
+
+    async def _queue_block_scripts_serial(
+        self, observing_block: ObservingBlock
+    ) -> typing.Generator[int, None, None]:
+        """Queue block scripts in the ScriptQueue, one at a time.
+
+        Parameters
+        ----------
+        observing_block : `ObservingBlock`
+            Observing block to queue scripts from.
+
+        Yields
+        ------
+        sal_index : `int`
+            A sequence of SAL indices of Scripts.
         """
         start_block = True
         block_size = len(observing_block.scripts)
@@ -1288,6 +1564,152 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             start_block = False
             yield sal_index
 
+    async def _queue_block_scripts_pipelined(
+        self, observing_block: ObservingBlock
+    ) -> typing.Generator[int, None, None]:
+        """Queue block scripts in the ScriptQueue concurrently.
+
+        Parameters
+        ----------
+        observing_block : `ObservingBlock`
+            Observing block to queue scripts from.
+
+        Yields
+        ------
+        sal_index : `int`
+            A sequence of SAL indices of Scripts.
+
+        Notes
+        -----
+        Up to ``max_concurrent_script_adds`` add commands are in flight at the
+        same time. The commands are still sent in the order of the scripts in
+        the block, so the ScriptQueue should assign them consecutive SAL
+        indices. If it does not, the scripts added are stopped and the block
+        is queued again one script at a time. Pipelined submission is then
+        disabled until the CSC is reconfigured.
+
+        While an add command is being retried, no other add command of the
+        block is sent. Commands already in flight when the retry started may
+        still be accepted before the retried one, in which case the SAL
+        indices are out of order and the block is queued again serially.
+
+        If the ScriptQueue rejects one of the commands, or a previous script
+        of the block fails, no more scripts are added, the SAL indices of the
+        scripts already added are yielded and the exception is raised.
+        """
+        block_size = len(observing_block.scripts)
+        add_concurrency = asyncio.Semaphore(self.parameters.max_concurrent_script_adds)
+        abort = asyncio.Event()
+        no_add_retry_pending = asyncio.Event()
+        no_add_retry_pending.set()
+
+        previous_add_started = utils.make_done_future()
+        add_tasks = []
+        for i, script in enumerate(observing_block.scripts):
+            add_started = asyncio.Future()
+            add_tasks.append(
+                asyncio.create_task(
+                    self._queue_one_script_in_order(
+                        previous_add_started=previous_add_started,
+                        add_started=add_started,
+                        add_concurrency=add_concurrency,
+                        abort=abort,
+                        no_add_retry_pending=no_add_retry_pending,
+                        block_uid=observing_block.id,
+                        script=script,
+                        block_name=observing_block.program,
+                        start_block=i == 0,
+                        block_size=block_size,
+                    )
+                )
+            )
+            previous_add_started = add_started
+
+        sal_indices = []
+        error = None
+        for add_task in add_tasks:
+            try:
+                sal_indices.append(await add_task)
+            except Exception as e:
+                abort.set()
+                if error is None:
+                    error = e
+
+        out_of_order = any(
+            next_sal_index != sal_index + 1
+            for sal_index, next_sal_index in zip(sal_indices, sal_indices[1:])
+        )
+
+        if out_of_order:
+            self.log.warning(
+                "ScriptQueue did not accept the scripts of block "
+                f"{observing_block.program} in order ({sal_indices=}). "
+                "Falling back to adding scripts one at a time."
+            )
+            self._pipelined_script_submission = False
+            await self._stop_scripts(sal_indices)
+            await self.model.mark_block_done(observing_block.id)
+            await self.model.remove_block_done_scripts(observing_block.id)
+
+            async for sal_index in self._queue_block_scripts_serial(observing_block):
+                yield sal_index
+            return
+
+        for sal_index in sal_indices:
+            yield sal_index
+
+        if error is not None:
+            raise error
+
+    async def _queue_one_script_in_order(
+        self,
+        previous_add_started: asyncio.Future,
+        add_started: asyncio.Future,
+        add_concurrency: asyncio.Semaphore,
+        abort: asyncio.Event,
+        **kwargs: typing.Any,
+    ) -> int:
+        """Queue one script, after the previous script in the block started
+        being added.
+
+        Parameters
+        ----------
+        previous_add_started : `asyncio.Future`
+            Future that is done when the add command of the previous script
+            is sent.
+        add_started : `asyncio.Future`
+            Future to set when the add command for this script is sent.
+        add_concurrency : `asyncio.Semaphore`
+            Semaphore that limits the number of concurrent add commands.
+        abort : `asyncio.Event`
+            Event set when adding a script of the block failed.
+        **kwargs
+            Arguments for `_queue_one_script`.
+
+        Returns
+        -------
+        sal_index : `int`
+            SAL index of the script.
+        """
+
+        def start_add() -> None:
+            if abort.is_set():
+                raise RuntimeError("Adding block scripts aborted.")
+            add_started.set_result(None)
+
+        try:
+            await previous_add_started
+            async with add_concurrency:
+                if abort.is_set():
+                    raise RuntimeError("Adding block scripts aborted.")
+                return await self._queue_one_script(on_add_start=start_add, **kwargs)
+        except Exception:
+            abort.set()
+            raise
+        finally:
+            if not add_started.done():
+                add_started.set_result(None)
+
     async def _queue_one_script(
         self,
         block_uid: uuid.UUID,
@@ -1295,6 +1717,8 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         block_name: str,
         start_block: bool,
         block_size: int,
+        on_add_start: typing.Callable[[], None] | None = None,
+        no_add_retry_pending: asyncio.Event | None = None,
     ) -> int:
         """Queue one script to the script queue.
 
@@ -1312,6 +1736,13 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             `False` otherwise.
         block_size : `int`
             How many scripts are part of this block?
+        on_add_start : `typing.Callable`, optional
+            Function to call right before sending the add command. If it
+            raises, the script is not added.
+        no_add_retry_pending : `asyncio.Event`, optional
+            Event shared by the scripts added concurrently. The add command is
+            only sent when it is set, and it is cleared while the add command
+            is being retried, so other scripts are not added in the meantime.
 
         Returns
         -------
@@ -1334,38 +1765,53 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             # failed this will raise an exception and stop adding more
             # scripts
             await self.model.check_block_scripts(id=block_uid)
+            await self._script_add_rate_limiter.acquire()
+            if no_add_retry_pending is not None:
+                await no_add_retry_pending.wait()
+            if on_add_start is not None:
+                on_add_start()
             n_retries = 3
-            for retry in range(n_retries):
-                try:
-                    add_task = await self.queue_remote.cmd_add.set_start(
-                        path=script.name,
-                        config=script.get_script_configuration(),
-                        isStandard=script.standard,
-                        location=ScriptQueue.Location.LAST,
-                        logLevel=self.log.getEffectiveLevel(),
-                        block=block_name,
-                        blockSize=block_size,
-                        startBlock=start_block,
-                        timeout=self.parameters.cmd_timeout,
-                    )
-                    break
-                except salobj.AckError as ack:
-                    if "Bad Gateway" in ack.ackcmd.result:
-                        self.log.warning(
-                            f"Failed to add script to queue due to name server error: {ack!r}. "
-                            f"Waiting {self.heartbeat_interval*(retry+1)}s and trying again. "
-                            f"Attempt {retry+1} of {n_retries}."
+            retrying = False
+            try:
+                for retry in range(n_retries):
+                    try:
+                        add_task = await self.queue_remote.cmd_add.set_start(
+                            path=script.name,
+                            config=script.get_script_configuration(),
+                            isStandard=script.standard,
+                            location=ScriptQueue.Location.LAST,
+                            logLevel=self.log.getEffectiveLevel(),
+                            block=block_name,
+                            blockSize=block_size,
+                            startBlock=start_block,
+                            timeout=self.parameters.cmd_timeout,
                         )
-                        await asyncio.sleep(self.heartbeat_interval * (retry + 1))
-                    else:
-                        raise
-            else:
-                raise RuntimeError(
-                    "Failed to add scripts to the script queue. "
-                    "This is usually related to the camera name server not working correctly "
-                    "as the ScriptQueue used it to query for block ids. "
-                    "Contact support from camera team."
-                )
+                        break
+                    except salobj.AckError as ack:
+                        if "Bad Gateway" in ack.ackcmd.result:
+                            # Hold the other scripts of the block until this
+                            # one is added, so they don't get ahead of it.
+                            if no_add_retry_pending is not None:
+                                no_add_retry_pending.clear()
+                                retrying = True
+                            self.log.warning(
+                                f"Failed to add script to queue due to name server error: {ack!r}. "
+                                f"Waiting {self.heartbeat_interval*(retry+1)}s and trying again. "
+                                f"Attempt {retry+1} of {n_retries}."
+                            )
+                            await asyncio.sleep(self.heartbeat_interval * (retry + 1))
+                        else:
+                            raise
+                else:
+                    raise RuntimeError(
+                        "Failed to add scripts to the script queue. "
+                        "This is usually related to the camera name server not working correctly "
+                        "as the ScriptQueue used it to query for block ids. "
+                        "Contact support from camera team."
+                    )
+            finally:
+                if retrying:
+                    no_add_retry_pending.set()
             sal_index = int(add_task.result)
             script_final_state_future = await self.model.add_scheduled_script(
                 id=block_uid, sal_index=sal_index
@@ -1401,20 +1847,29 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
         """
 
-        sal_indices_to_remove = [target.get_sal_indices() for target in targets]
+        await self._stop_scripts(
+            [sal_index for target in targets for sal_index in target.get_sal_indices()]
+        )
+
+        for target in targets:
+            await self.model.mark_block_done(target.get_observing_block().id)
+
+    async def _stop_scripts(self, sal_indices: list[int]) -> None:
+        """Stop scripts in the ScriptQueue.
 
+        Parameters
+        ----------
+        sal_indices : `list` [`int`]
+            SAL indices of the scripts to stop. The script that is currently
+            running is not stopped.
+        """
         # exclude the script that is currently running.
-        queue = await self.queue_remote.evt_queue.aget(
-            timeout=self.parameters.cmd_timeout
-        )
+        queue = await self.get_queue(request=False)
 
         current_sal_index = queue.currentSalIndex
 
         scripts_to_stop = [
-            sal_index
-            for sal_indices in sal_indices_to_remove
-            for sal_index in sal_indices
-            if sal_index != current_sal_index
+            sal_index for sal_index in sal_indices if sal_index != current_sal_index
         ]
 
         stop_scripts = self.queue_remote.cmd_stopScripts.DataType()
@@ -1430,9 +1885,6 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                 stop_scripts, timeout=self.parameters.cmd_timeout
             )
 
-        for target in targets:
-            await self.model.mark_block_done(target.get_observing_block().id)
-
     @staticmethod
     def get_config_pkg():
         return "ts_config_scheduler"
@@ -1508,9 +1960,43 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         self.parameters.loop_sleep_time = settings.loop_sleep_time
         self.parameters.cmd_timeout = settings.cmd_timeout
         self.parameters.max_scripts = settings.max_scripts
+        self.parameters.max_concurrent_script_adds = getattr(
+            settings,
+            "max_concurrent_script_adds",
+            SchedulerCscParameters.max_concurrent_script_adds,
+        )
+        self.parameters.script_add_rate = getattr(
+            settings, "script_add_rate", SchedulerCscParameters.script_add_rate
+        )
+        self.parameters.speculative_target_tolerance = getattr(
+            settings,
+            "speculative_target_tolerance",
+            SchedulerCscParameters.speculative_target_tolerance,
+        )
+        self.parameters.telemetry_refresh_interval = getattr(
+            settings,
+            "telemetry_refresh_interval",
+            SchedulerCscParameters.telemetry_refresh_interval,
+        )
+        self.parameters.loop_monitor_interval = getattr(
+            settings,
+            "loop_monitor_interval",
+            SchedulerCscParameters.loop_monitor_interval,
+        )
+        self._script_add_rate_limiter.rate = self.parameters.script_add_rate
+        self._pipelined_script_submission = True
         self.parameters.observatory_status = ObservatoryStatus(
             **settings.observatory_status
         )
+        self.parameters.predicted_schedule_ensemble = PredictedScheduleEnsemble(
+            **getattr(settings, "predicted_schedule_ensemble", dict())
+        )
+        self.parameters.tracing = Tracing(**getattr(settings, "tracing", dict()))
+        self.parameters.dry_run = DryRun(**getattr(settings, "dry_run", dict()))
+        tracer.configure(
+            enabled=self.parameters.tracing.enable,
+            max_events=self.parameters.tracing.max_events,
+        )
         if self.parameters.observatory_status.enable:
             if not hasattr(self, "evt_observatoryStatus"):
                 raise salobj.ExpectedError(
@@ -1644,10 +2130,16 @@ class SchedulerCSC(salobj.ConfigurableCsc):
     async def get_queue(self, request: bool = True) -> salobj.type_hints.BaseMsgType:
         """Utility method to get the queue.
 
+        The queue state is mirrored from the ScriptQueue queue event, so this
+        method only communicates with the ScriptQueue if no queue state was
+        received yet.
+
         Parameters
         ----------
         request : `bool`
-            Issue request for queue state?
+            Issue request for queue state if none was received yet? If False,
+            wait for the queue event first and only issue the request if it
+            does not arrive in time.
 
         Returns
         -------
@@ -1655,9 +2147,10 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             SAL Topic with information about the queue.
         """
 
-        self.log.debug("Getting queue.")
+        if self._queue_state is not None:
+            return self._queue_state
 
-        self.queue_remote.evt_queue.flush()
+        self.log.debug("Getting queue.")
 
         queue: typing.Union[salobj.type_hints.BaseMsgType, None] = None
 
@@ -1666,8 +2159,9 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                 queue = await self._request_queue_state()
             else:
                 try:
-                    queue = await self.queue_remote.evt_queue.aget(
-                        timeout=self.parameters.cmd_timeout
+                    queue, _ = await self.queue_changed(
+                        since_version=self._queue_version,
+                        timeout=self.parameters.cmd_timeout,
                     )
                 except asyncio.TimeoutError:
                     self.log.debug("No state from queue. Requesting...")
@@ -1692,22 +2186,92 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         queue : `ScriptQueue.logevent_queue`
             Queue state.
         """
-        self.queue_remote.evt_queue.flush()
+        queue_version = self._queue_version
 
         await self.queue_remote.cmd_showQueue.start(timeout=self.parameters.cmd_timeout)
-        queue = await self.queue_remote.evt_queue.next(
-            flush=False, timeout=self.parameters.cmd_timeout
+        queue, _ = await self.queue_changed(
+            since_version=queue_version, timeout=self.parameters.cmd_timeout
         )
 
         return queue
 
+    @property
+    def queue_version(self) -> int:
+        """Number of queue states received from the ScriptQueue."""
+        return self._queue_version
+
+    def _update_queue_state(self, data: salobj.BaseDdsDataType) -> None:
+        """Callback for the ScriptQueue queue event.
+
+        Parameters
+        ----------
+        data : `ScriptQueue_logevent_queueC`
+            Queue state.
+        """
+        self._queue_state = data
+        self._queue_version += 1
+        self._queue_changed_event.set()
+        self._queue_changed_event = asyncio.Event()
+
+    async def queue_changed(
+        self, since_version: int, timeout: float | None = None
+    ) -> tuple[salobj.type_hints.BaseMsgType, int]:
+        """Wait for the queue state to change.
+
+        Parameters
+        ----------
+        since_version : `int`
+            Version of the last queue state seen by the caller, see
+            `queue_version`. Returns immediately if a newer state is
+            available.
+        timeout : `float`, optional
+            How long to wait for the queue state to change (in seconds).
+
+        Returns
+        -------
+        queue : `ScriptQueue_logevent_queueC`
+            Latest queue state.
+        queue_version : `int`
+            Version of the queue state.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the queue state does not change in the specified timeout.
+        """
+        while self._queue_version <= since_version or self._queue_state is None:
+            await asyncio.wait_for(self._queue_changed_event.wait(), timeout=timeout)
+
+        return self._queue_state, self._queue_version
+
+    async def _wait_queue_changed(self, since_version: int, timeout: float) -> bool:
+        """Wait for the queue state to change, without raising on timeout.
+
+        Parameters
+        ----------
+        since_version : `int`
+            Version of the last queue state seen by the caller.
+        timeout : `float`
+            How long to wait for the queue state to change (in seconds).
+
+        Returns
+        -------
+        `bool`
+            True if the queue state changed, False if it timed out.
+        """
+        try:
+            await self.queue_changed(since_version=since_version, timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     async def check_script_info(self, data: salobj.BaseDdsDataType) -> None:
         """A callback method to check script info.
 
         This method will first update the model with the incoming script info
-        then check the scheduled targets. This should allow the Scheduler to
-        cleanup remaining scripts from the ScriptQueue when one Script of
-        a block fails.
+        then, if any scheduled target reached a final status, check the
+        scheduled targets. This should allow the Scheduler to cleanup remaining
+        scripts from the ScriptQueue when one Script of a block fails.
 
         Parameters
         ----------
@@ -1716,6 +2280,10 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         """
         await self.model.callback_script_info(data=data)
 
+        if self.model.scheduled_targets_transitions.empty():
+            # No scheduled target changed status, nothing to check.
+            return
+
         task_name = "lock_target_loop_and_check_targets"
 
         task = self._tasks.get(task_name, utils.make_done_future())
@@ -1741,7 +2309,10 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             ended up a failed or unrecognized state.
         """
 
-        if self.model.get_number_of_scheduled_targets() == 0:
+        if (
+            self.model.get_number_of_scheduled_targets() == 0
+            and self.model.scheduled_targets_transitions.empty()
+        ):
             self.log.info("No scheduled targets to check.")
             return False
         scheduled_targets_info = await self.model.check_scheduled_targets()
@@ -1824,6 +2395,7 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                     # wait for the queue to change or get the latest if there's
                     # some
                     queue = await self.get_queue(first_pass)
+                    queue_version = self.queue_version
 
                     # This returns False if script failed, in which case next
                     # pass won't wait for queue to change
@@ -1881,7 +2453,10 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                             queue.currentSalIndex != 0,
                             queue.length == 0,
                         )
-                        await asyncio.sleep(self.parameters.loop_sleep_time)
+                        await self._wait_queue_changed(
+                            since_version=queue_version,
+                            timeout=self.parameters.loop_sleep_time,
+                        )
             except asyncio.CancelledError:
                 break
             except Exception:
@@ -1915,7 +2490,10 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
         self.targets_queue: list[DriverTarget] = []
         self.targets_queue_condition = utils.make_done_future()
+        self._targets_queue_validated_version = None
+        self._targets_queue_validated_telemetry = None
         self._should_compute_predicted_schedule = False
+        self._reset_predicted_schedule_checkpoint()
 
         self.log.info("Starting target production loop.")
 
@@ -1946,6 +2524,12 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
             try:
                 async with self.target_loop_lock:
+                    # The targets queue check plays the targets on the
+                    # observatory model in an executor thread, make sure it is
+                    # done before anything else touches the model.
+                    if not targets_queue_condition_task.done():
+                        await targets_queue_condition_task
+
                     if self.need_to_generate_target_queue:
                         await self.generate_target_queue()
 
@@ -1953,6 +2537,7 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                     # wait for the queue to change or get the latest if there's
                     # some
                     queue = await self.get_queue(first_pass)
+                    queue_version = self.queue_version
 
                     # This returns False if script failed, in which case next
                     # pass won't wait for queue to change
@@ -1970,7 +2555,15 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                         < self.parameters.n_targets + 1
                         and len(self.targets_queue) > 0
                     ):
-                        await self.queue_targets()
+                        if await self.targets_queue_telemetry_changed():
+                            self.log.info(
+                                "Telemetry changed since targets were generated. "
+                                "Regenerating targets queue."
+                            )
+                            self.discard_targets_queue()
+                            await self.generate_target_queue()
+                        if len(self.targets_queue) > 0:
+                            await self.queue_targets()
                     elif self._should_compute_predicted_schedule:
                         await self.compute_predicted_schedule()
                     else:
@@ -1990,6 +2583,18 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                             queue.length,
                         )
 
+                        if (
+                            len(self.targets_queue) == 0
+                            and self.next_target_timer.done()
+                            and targets_queue_condition_task.done()
+                            and self.model.get_number_of_scheduled_targets() > 0
+                        ):
+                            # Use the time waiting for the scheduled targets to
+                            # execute to generate the next targets, against the
+                            # projected observatory state, so they are ready
+                            # when a slot opens.
+                            await self.generate_target_queue()
+
                         if targets_queue_condition_task.done():
                             # Task to check the targets_queue condition.
                             targets_queue_condition_task = asyncio.create_task(
@@ -1998,15 +2603,19 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                             )
 
                         loop_sleep_task = asyncio.create_task(
-                            asyncio.sleep(self.parameters.loop_sleep_time)
+                            self._wait_queue_changed(
+                                since_version=queue_version,
+                                timeout=self.parameters.loop_sleep_time,
+                            )
                         )
                         # Using the asyncio.wait with a timeout will simply
                         # return at the end without cancelling the task. If the
                         # check takes less then the loop_sleep_time, we still
                         # want to wait the remaining time, so that is why we
                         # have the additional task.
-                        # The following await will not take more or less than
-                        # approximately self.parameters.loop_sleep_time.
+                        # The following await will not take more than
+                        # approximately self.parameters.loop_sleep_time, and
+                        # returns as soon as the queue state changes.
 
                         await asyncio.wait(
                             [
@@ -2022,6 +2631,8 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                                 "Waiting remaining sleep time."
                             )
                             await loop_sleep_task
+                        elif loop_sleep_task.result():
+                            self.log.debug("Queue state changed.")
                         else:
                             self.log.warning(
                                 "Checking targets condition took longer than expected. "
@@ -2069,6 +2680,134 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                 self.log.exception("Error on advance target production loop.")
                 break
 
+    async def dry_target_production_loop(self):
+        """DRY target production loop.
+
+        Once the Scheduler is resumed, run a simulation of the observations
+        with `run_dry_simulation`, then go back to idle and remove the
+        OPERATIONAL observatory status. The Scheduler can be resumed again to
+        run a new simulation.
+        """
+        self.run_loop = True
+
+        self.log.info("Starting DRY target production loop.")
+
+        while self.summary_state == salobj.State.ENABLED and self.run_loop:
+            await self.run_target_loop.wait()
+
+            try:
+                async with self.target_loop_lock:
+                    await self.run_dry_simulation()
+
+                    # If the Scheduler was stopped, the stop command already
+                    # transitioned it to idle.
+                    if self.run_target_loop.is_set():
+                        self.run_target_loop.clear()
+                        await self._transition_running_to_idle()
+                        await self.unset_observatory_status_operational()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                # If there is an exception and not in FAULT, go to FAULT state
+                # and log the exception...
+                if self.run_loop and self.summary_state != salobj.State.FAULT:
+                    await self.fault(
+                        code=DRY_LOOP_ERROR,
+                        report="Error on DRY target production loop.",
+                        traceback=traceback.format_exc(),
+                    )
+                self.log.exception("Error on DRY target production loop.")
+                break
+
+    async def run_dry_simulation(self) -> list[DriverTarget]:
+        """Simulate the observations as fast as possible.
+
+        This runs the target production, from the driver to formatting the
+        observing block scripts, against a simulated clock and observatory
+        state, instead of the ScriptQueue, and writes the resulting schedule
+        to the opsim database in the ``dry_run`` configuration.
+
+        The simulation stops at the end of the configured time window or when
+        the Scheduler is stopped, which is checked after each target. The
+        targets simulated so far are written to the database even if the
+        simulation fails or is cancelled.
+
+        Returns
+        -------
+        targets : `list`[`DriverTarget`]
+            Simulated targets, with ``obs_time`` set to the time they are
+            observed (MJD).
+        """
+        dry_run = self.parameters.dry_run
+
+        targets: list[DriverTarget] = []
+        wall_time_start = utils.current_tai()
+
+        async with self.current_scheduler_state(
+            publish_lfoa=False, reset_state=dry_run.reset_state, keep_state=False
+        ):
+            await self.model.update_telemetry()
+            self.model.synchronize_observatory_model()
+
+            start_time = utils.astropy_time_from_tai_unix(
+                dry_run.start_time if dry_run.start_time > 0 else wall_time_start
+            ).unix
+            sunset, sunrise = self.model.get_night_boundaries(start_time)
+            if dry_run.start_time == 0:
+                start_time = max(start_time, sunset)
+            end_time = (
+                start_time + dry_run.duration * 60.0 * 60.0
+                if dry_run.duration > 0
+                else sunrise
+            )
+
+            self.model.models["observatory_model"].update_state(start_time)
+            time_scheduler_evaluation = start_time
+
+            self.log.info(
+                f"Running DRY simulation for {(end_time - start_time) / 3600.0:.2f}h."
+            )
+
+            try:
+                while (
+                    self.run_target_loop.is_set()
+                    and time_scheduler_evaluation < end_time
+                ):
+                    (
+                        time_scheduler_evaluation,
+                        _,
+                        new_targets,
+                    ) = await self.model.generate_targets_in_time_window(
+                        max_targets=1,
+                        time_window=end_time - time_scheduler_evaluation,
+                    )
+
+                    for target in new_targets:
+                        observing_block = target.get_observing_block()
+                        for script in observing_block.scripts:
+                            script.get_script_configuration()
+
+                    targets += new_targets
+            finally:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None,
+                    self.model.write_opsim_database,
+                    targets,
+                    dry_run.output_database,
+                )
+
+        wall_time = utils.current_tai() - wall_time_start
+        simulated_time = time_scheduler_evaluation - start_time
+        self.log.info(
+            f"Finished DRY simulation of {simulated_time / 3600.0:.2f}h with "
+            f"{len(targets)} targets in {wall_time:.2f}s "
+            f"({simulated_time / max(wall_time, 1e-6):.1f}x real time); "
+            f"wrote {dry_run.output_database}."
+        )
+
+        return targets
+
     @property
     def need_to_generate_target_queue(self) -> bool:
         """Check if we need to generate target queue.
@@ -2103,6 +2842,9 @@ class SchedulerCSC(salobj.ConfigurableCsc):
         self.model.synchronize_observatory_model()
         await self.model.update_telemetry()
 
+        if len(self.targets_queue) == 0:
+            self._targets_queue_telemetry = self.model.get_telemetry_snapshot()
+
         for target in self.model.get_scheduled_targets():
             self.model.models["observatory_model"].observe(target)
 
@@ -2152,7 +2894,7 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                     )
                     no_targets = False
 
-            await self.check_targets_queue_condition()
+            await self.check_targets_queue_condition(validate_targets=False)
 
             if len(self.targets_queue) > self.parameters.n_targets + 1:
                 self.log.info(
@@ -2175,20 +2917,147 @@ class SchedulerCSC(salobj.ConfigurableCsc):
                 f"Current scheduled targets: {self.model.get_number_of_scheduled_targets()}."
             )
 
-    async def check_targets_queue_condition(self):
+    async def targets_queue_telemetry_changed(self) -> bool:
+        """Check if the telemetry changed materially since the targets in the
+        targets queue were generated.
+
+        Only the raw telemetry values are refreshed, which is much cheaper
+        than updating the scheduler conditions and regenerating the targets.
+
+        Returns
+        -------
+        `bool`
+            True if the targets queue needs to be regenerated.
+
+        Raises
+        ------
+        `UpdateTelemetryError`
+            If updating the telemetry fails.
+        """
+        if self._targets_queue_telemetry is None:
+            return False
+
+        try:
+            await self.model.update_telemetry_streams()
+        except Exception as exception:
+            raise UpdateTelemetryError("Failed to update telemetry.") from exception
+
+        return self.model.telemetry_changed(
+            self._targets_queue_telemetry,
+            tolerance=self.parameters.speculative_target_tolerance,
+        )
+
+    def discard_targets_queue(self, start: int = 0) -> None:
+        """Discard targets from the targets queue.
+
+        The scheduler state is reset to the state before the first discarded
+        target was generated, so the targets can be generated again.
+
+        Parameters
+        ----------
+        start : `int`, optional
+            Index of the first target to discard. All targets from this index
+            onward are discarded.
+        """
+        if start >= len(self.targets_queue):
+            return
+
+        self.log.debug(
+            f"Discarding {len(self.targets_queue) - start} targets from the "
+            "targets queue."
+        )
+
+        scheduler_state_filename = self.targets_queue[
+            start
+        ].get_scheduler_state_filename()
+        if scheduler_state_filename:
+            self.model.reset_state(scheduler_state_filename)
+
+        for target in self.targets_queue[start:]:
+            target.remove_scheduler_state()
+
+        del self.targets_queue[start:]
+
+        if start == 0:
+            self._targets_queue_telemetry = None
+
+    async def check_targets_queue_condition(self, validate_targets: bool = True):
         """Check targets queue condition.
 
-        For now the check is only verifying if more targets need to be added
-        to the internal queue. In the future this method will be responsible
-        for verifying that the predicted schedule is still fine and requesting
-        a re-scheduling if needed.
+        The targets in the targets queue are re-evaluated with the last
+        telemetry collected (see `Model.get_first_invalid_target`), and
+        discarded from the first invalid target onward. The targets are only
+        re-evaluated if the ScriptQueue or the telemetry changed since the
+        last check. If targets were discarded or the targets queue is empty,
+        the result of `targets_queue_condition` is set to `None`, to generate
+        the missing targets.
+
+        Parameters
+        ----------
+        validate_targets : `bool`, optional
+            Re-evaluate the targets in the targets queue? If False, only check
+            if the targets queue is empty.
         """
         if self.targets_queue_condition.done():
             self.targets_queue_condition = asyncio.Future()
 
-        if len(self.targets_queue) == 0:
+        n_discarded = 0
+        if (
+            validate_targets
+            and len(self.targets_queue) > 0
+            and self._targets_queue_validation_needed()
+        ):
+            self._targets_queue_validated_version = self.queue_version
+            self._targets_queue_validated_telemetry = (
+                self.model.get_telemetry_snapshot()
+            )
+            targets_queue = list(self.targets_queue)
+            async with self.scheduler_state_lock:
+                try:
+                    first_invalid = await self.model.get_first_invalid_target(
+                        targets_queue
+                    )
+                except Exception:
+                    self.log.exception(
+                        "Failed to check targets queue. Keeping targets."
+                    )
+                    first_invalid = len(targets_queue)
+
+                # The targets queue may have changed while the targets were
+                # checked, find where the first invalid target is now.
+                if (
+                    first_invalid < len(targets_queue)
+                    and targets_queue[first_invalid] in self.targets_queue
+                ):
+                    start = self.targets_queue.index(targets_queue[first_invalid])
+                    n_discarded = len(self.targets_queue) - start
+                    self.log.info(
+                        f"Target {targets_queue[first_invalid]!s} no longer valid. "
+                        f"Discarding {n_discarded} targets."
+                    )
+                    self.discard_targets_queue(start)
+
+        if n_discarded > 0 or len(self.targets_queue) == 0:
             self.targets_queue_condition.set_result(None)
 
+    def _targets_queue_validation_needed(self) -> bool:
+        """Check if the ScriptQueue or the telemetry changed since the targets
+        in the targets queue were last validated.
+
+        Returns
+        -------
+        `bool`
+            True if the targets need to be validated again.
+        """
+        return (
+            self._targets_queue_validated_telemetry is None
+            or self._targets_queue_validated_version != self.queue_version
+            or self.model.telemetry_changed(
+                self._targets_queue_validated_telemetry,
+                tolerance=self.parameters.speculative_target_tolerance,
+            )
+        )
+
     async def save_scheduler_state(self, publish_lfoa):
         """Save scheduler state to S3 bucket and publish event.
 
@@ -2211,7 +3080,8 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
         if publish_lfoa:
             try:
-                await self._handle_lfoa(saved_scheduler_state_filename)
+                with tracer.span("lfa_upload"):
+                    await self._handle_lfoa(saved_scheduler_state_filename)
             except Exception:
                 self.log.exception(
                     f"Could not upload file to S3 bucket. Keeping file {saved_scheduler_state_filename}."
@@ -2316,12 +3186,23 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             return delta_time
 
     @set_detailed_state(detailed_state=DetailedState.COMPUTING_PREDICTED_SCHEDULE)
-    async def compute_predicted_schedule(self):
+    async def compute_predicted_schedule(self, progress=None):
         """Compute the predicted schedule.
 
         This method will start from the current time, play any target in the
         queue, then compute targets for the next
         config.predicted_scheduler_window hours.
+
+        If the targets queue matches the previous predicted schedule, the
+        remaining targets from the previous prediction are reused and the
+        scheduler resumes from the state at the end of the previous
+        prediction, so only the tail of the predicted schedule is computed.
+
+        Parameters
+        ----------
+        progress : `asyncio.Queue`, optional
+            Queue to stream the progress of the computation, see
+            `Model.generate_targets_in_time_window`.
         """
 
         if not hasattr(self, "evt_predictedSchedule"):
@@ -2332,51 +3213,85 @@ class SchedulerCSC(salobj.ConfigurableCsc):
 
         self._should_compute_predicted_schedule = False
         predicted_schedule_start_time = utils.current_tai()
+        scenario_state = None
         async with self.current_scheduler_state(publish_lfoa=False, keep_state=False):
 
+            if (
+                self.parameters.predicted_schedule_ensemble.n_scenarios > 0
+                and self._tasks.get(
+                    "predicted_schedule_ensemble", utils.make_done_future()
+                ).done()
+            ):
+                # Copy of the scheduler to compute the weather scenarios from
+                # the same starting point as the nominal predicted schedule.
+                # Pickling the driver is slow, do it in an executor to keep
+                # the event loop responsive. Nothing else changes the driver
+                # while the scheduler state lock is held.
+                try:
+                    scenario_state = await asyncio.get_running_loop().run_in_executor(
+                        None,
+                        pickle.dumps,
+                        (self.model.driver, list(self.targets_queue)),
+                    )
+                except Exception:
+                    self.log.exception(
+                        "Failed to copy scheduler; skipping weather scenarios."
+                    )
+
+            reused_targets = self._get_reusable_predicted_targets()[
+                : max([self.max_predicted_targets - len(self.targets_queue), 0])
+            ]
+
+            if reused_targets:
+                self.log.debug(
+                    f"Reusing {len(reused_targets)} targets from previous "
+                    "predicted schedule."
+                )
+                self.model.reset_state(self._predicted_schedule_checkpoint)
+
             needed_targets = max(
+                [
+                    self.max_predicted_targets
+                    - len(self.targets_queue)
+                    - len(reused_targets),
+                    0,
+                ]
+            )
+
+            # The weather scenarios start from the state before the reused
+            # targets, so they compute the whole predicted schedule.
+            scenario_max_targets = max(
                 [self.max_predicted_targets - len(self.targets_queue), 0]
             )
 
+            if self._predicted_schedule_buffer.size != self.max_predicted_targets:
+                self._predicted_schedule_buffer = PredictedScheduleBuffer(
+                    size=self.max_predicted_targets
+                )
+            else:
+                self._predicted_schedule_buffer.clear()
+            self._predicted_schedule_buffer.extend(
+                self.targets_queue[: self.max_predicted_targets]
+            )
+            self._predicted_schedule_buffer.extend(reused_targets)
+
             (
                 _,
                 _,
-                targets,
+                new_targets,
             ) = await self.model.generate_targets_in_time_window(
                 max_targets=needed_targets,
                 time_window=self.parameters.predicted_scheduler_window * 60.0 * 60.0,
-                pre_computed_targets=self.targets_queue,
+                pre_computed_targets=self.targets_queue + reused_targets,
+                on_target=self._predicted_schedule_buffer.append,
+                progress=progress,
             )
 
-            targets_info = [
-                dataclasses.asdict(target.get_observation())
-                for target in self.targets_queue
-            ] + [dataclasses.asdict(target.get_observation()) for target in targets]
+            targets = reused_targets + new_targets
 
-            extra_nans = [np.nan] * (self.max_predicted_targets - len(targets))
+            self._save_predicted_schedule_checkpoint(self.targets_queue + targets)
 
-            predicted_schedule = dict(
-                [
-                    (
-                        param,
-                        np.array(
-                            [target[param] for target in targets_info] + extra_nans
-                        ),
-                    )
-                    for param in OBSERVATION_NAMED_PARAMETERS
-                    if param
-                    not in {
-                        "targetId",
-                    }
-                ]
-            )
-
-            predicted_schedule["numberOfTargets"] = len(targets_info)
-            predicted_schedule["instrumentConfiguration"] = ",".join(
-                predicted_schedule.pop("filter")[
-                    : predicted_schedule["numberOfTargets"]
-                ]
-            )
+            predicted_schedule = self._predicted_schedule_buffer.as_dict()
 
             await self.evt_predictedSchedule.set_write(**predicted_schedule)
 
@@ -2387,6 +3302,194 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             f"Finished computing predicted schedule; took {predicted_schedule_duration:.2f}s."
         )
 
+        if scenario_state is not None:
+            self._tasks["predicted_schedule_ensemble"] = asyncio.create_task(
+                self.compute_predicted_schedule_ensemble(
+                    scenario_state=scenario_state,
+                    nominal_targets=[
+                        ScenarioTarget.from_target(target) for target in targets
+                    ],
+                    max_targets=scenario_max_targets,
+                )
+            )
+
+    async def compute_predicted_schedule_ensemble(
+        self,
+        scenario_state: bytes,
+        nominal_targets: list[ScenarioTarget],
+        max_targets: int,
+    ) -> None:
+        """Compute the predicted schedule under several weather scenarios.
+
+        The scenarios run in a process pool, on copies of the scheduler, so
+        the live scheduler is not affected. The result is stored in
+        `predicted_schedule_ensemble_summary`.
+
+        Parameters
+        ----------
+        scenario_state : `bytes`
+            Pickled tuple with the driver and the targets queue, from the
+            start of the nominal predicted schedule.
+        nominal_targets : `list` [`ScenarioTarget`]
+            Targets in the nominal predicted schedule, after the targets
+            queue.
+        max_targets : `int`
+            Maximum number of targets in each scenario.
+        """
+        ensemble = self.parameters.predicted_schedule_ensemble
+
+        scenarios = make_weather_scenarios(
+            n_scenarios=ensemble.n_scenarios,
+            seeing_sigma=ensemble.seeing_sigma,
+            cloud_sigma=ensemble.cloud_sigma,
+            mounted_filters=ensemble.mounted_filters,
+            seed=ensemble.seed,
+        )
+
+        self.log.info(
+            f"Computing predicted schedule under {len(scenarios)} weather scenarios."
+        )
+
+        ensemble_start_time = utils.current_tai()
+
+        loop = asyncio.get_running_loop()
+
+        pool = ProcessPoolExecutor(
+            max_workers=min(ensemble.max_workers, len(scenarios)),
+            initializer=init_scenario_worker,
+            initargs=(scenario_state,),
+        )
+        try:
+            scenarios_targets = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        pool,
+                        functools.partial(
+                            run_weather_scenario,
+                            scenario,
+                            max_targets=max_targets,
+                            time_window=self.parameters.predicted_scheduler_window
+                            * 60.0
+                            * 60.0,
+                            time_delta_no_target=self.model.time_delta_no_target,
+                        ),
+                    )
+                    for scenario in scenarios
+                ]
+            )
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        summary = summarize_weather_scenarios(
+            nominal_targets=nominal_targets,
+            scenarios_targets=scenarios_targets,
+        )
+        self.predicted_schedule_ensemble_summary = summary
+
+        ensemble_duration = utils.current_tai() - ensemble_start_time
+
+        self.log.info(
+            f"Finished computing {len(scenarios)} weather scenarios; "
+            f"took {ensemble_duration:.2f}s."
+        )
+
+        if np.any(summary.probability > 0.0):
+            self.log.info(
+                "Probability of the predicted targets: "
+                f"mean={np.mean(summary.probability):.2f}, "
+                f"min={np.min(summary.probability):.2f}. "
+                f"Maximum start time spread: {np.nanmax(summary.start_time_std):.1f}s."
+            )
+
+    def _get_reusable_predicted_targets(self) -> list[DriverTarget]:
+        """Get the targets from the previous predicted schedule that can be
+        reused.
+
+        The previous predicted schedule can be reused if the targets queue
+        matches a contiguous section of it, which means the schedule evolved
+        as predicted.
+
+        Returns
+        -------
+        `list` [`DriverTarget`]
+            Targets from the previous predicted schedule after the targets
+            queue. Empty if the previous predicted schedule cannot be reused.
+        """
+        previous_targets = self._predicted_schedule_targets
+
+        if (
+            self._predicted_schedule_checkpoint is None
+            or len(self.targets_queue) == 0
+            or len(previous_targets) == 0
+        ):
+            return []
+
+        for start, target in enumerate(previous_targets):
+            if self._targets_match(target, self.targets_queue[0]):
+                break
+        else:
+            return []
+
+        end = start + len(self.targets_queue)
+
+        if end > len(previous_targets) or not all(
+            self._targets_match(target, previous_target)
+            for target, previous_target in zip(
+                self.targets_queue, previous_targets[start:end]
+            )
+        ):
+            return []
+
+        return previous_targets[end:]
+
+    @staticmethod
+    def _targets_match(target: DriverTarget, other_target: DriverTarget) -> bool:
+        """Check if two targets point to the same field, with the same filter
+        and for the same survey.
+
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Target.
+        other_target : `DriverTarget`
+            Target to compare with.
+
+        Returns
+        -------
+        `bool`
+            True if the targets match.
+        """
+        return (
+            target.note == other_target.note
+            and target.filter == other_target.filter
+            and np.isclose(target.ra, other_target.ra)
+            and np.isclose(target.dec, other_target.dec)
+        )
+
+    def _save_predicted_schedule_checkpoint(
+        self, predicted_targets: list[DriverTarget]
+    ) -> None:
+        """Store the predicted schedule and the current scheduler state, to
+        resume the next predicted schedule from.
+
+        Parameters
+        ----------
+        predicted_targets : `list` [`DriverTarget`]
+            Targets in the predicted schedule, including the targets queue.
+        """
+        self._reset_predicted_schedule_checkpoint()
+        self._predicted_schedule_checkpoint = self.model.get_state(targets_queue=[])
+        self._predicted_schedule_targets = predicted_targets
+
+    def _reset_predicted_schedule_checkpoint(self) -> None:
+        """Discard the previous predicted schedule."""
+        if self._predicted_schedule_checkpoint is not None and os.path.exists(
+            self._predicted_schedule_checkpoint
+        ):
+            os.remove(self._predicted_schedule_checkpoint)
+        self._predicted_schedule_checkpoint = None
+        self._predicted_schedule_targets = []
+
     async def execute_block(self):
         """Execute an individual block when the Scheduler is not running.
 
@@ -2669,13 +3772,19 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             )
 
     async def _publish_general_info(self):
-        """Publish general info event."""
+        """Publish general info event.
 
-        if self.evt_detailedState.data.substate == DetailedState.IDLE:
-            async with self._detailed_state_lock:
-                await self.model.update_telemetry()
+        When the Scheduler is idle, the driver conditions are not updated,
+        so whether it is night is computed from the last night boundaries.
+        These are kept up to date by `telemetry_refresh_loop`.
+        """
 
-        general_info = self.model.get_general_info()
+        if self.evt_detailedState.data.substate == DetailedState.IDLE:
+            general_info = self.model.get_general_info(
+                time=utils.astropy_time_from_tai_unix(utils.current_tai()).unix
+            )
+        else:
+            general_info = self.model.get_general_info()
 
         # TODO: (DM-34905) Remove backward compatibility.
         if hasattr(self, "evt_generalInfo"):
@@ -2727,6 +3836,12 @@ class SchedulerCSC(salobj.ConfigurableCsc):
             return await self._get_script_config_validator_from_path(
                 script_name=script_name, standard=standard
             )
+        elif self.parameters.mode == "DRY":
+            # There is no ScriptQueue in DRY mode, skip validation.
+            self.log.debug(
+                f"No script paths in DRY mode, skip validating {script_name}."
+            )
+            return None
         else:
             return await self._get_script_config_validator_from_script_queue(
                 script_name=script_name, standard=standard
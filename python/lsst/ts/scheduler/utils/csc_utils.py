@@ -28,12 +28,18 @@ __all__ = [
     "OBSERVATION_NAMED_PARAMETERS",
     "set_detailed_state",
     "BlockStatus",
+    "RateLimiter",
+    "PredictedScheduleBuffer",
 ]
 
+import asyncio
 import enum
 import re
+import time
+import typing
 from urllib.parse import urlparse
 
+import numpy as np
 from lsst.ts.xml.enums import Script
 
 NonFinalStates = frozenset(
@@ -202,3 +208,128 @@ def set_detailed_state(detailed_state):
         return detailed_state_wrapper
 
     return decorator
+
+
+class RateLimiter:
+    """Limit the rate at which an operation is executed.
+
+    Instead of sleeping a fixed amount of time after each operation, calls to
+    `acquire` are spaced by at least ``1/rate`` seconds, and only wait if the
+    previous operation happened too recently.
+
+    Parameters
+    ----------
+    rate : `float`
+        Maximum number of operations per second. If zero or negative, there is
+        no limit.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._next_time = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Maximum number of operations per second."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value: float) -> None:
+        self._rate = value
+        self._interval = 1.0 / value if value > 0.0 else 0.0
+
+    async def acquire(self) -> None:
+        """Wait until the next operation is allowed to execute."""
+        now = time.monotonic()
+        scheduled_time = max(now, self._next_time)
+        self._next_time = scheduled_time + self._interval
+
+        if scheduled_time > now:
+            await asyncio.sleep(scheduled_time - now)
+
+
+class PredictedScheduleBuffer:
+    """Column buffers to assemble the predicted schedule.
+
+    The buffers are allocated once, with the maximum number of targets in the
+    predicted schedule, and filled as targets are appended. Unused entries
+    are set to nan.
+
+    Parameters
+    ----------
+    size : `int`
+        Maximum number of targets in the predicted schedule.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.columns = dict(
+            [
+                (param, np.full(size, np.nan))
+                for param in OBSERVATION_NAMED_PARAMETERS
+                if param not in {"targetId", "filter"}
+            ]
+        )
+        self.filters: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.filters)
+
+    def clear(self) -> None:
+        """Remove all targets from the buffers."""
+        for column in self.columns.values():
+            column[: len(self)] = np.nan
+        self.filters = []
+
+    def append(self, target: typing.Any) -> None:
+        """Append a target to the buffers.
+
+        Parameters
+        ----------
+        target : `DriverTarget`
+            Target to append.
+
+        Raises
+        ------
+        RuntimeError
+            If the buffers are full.
+        """
+        index = len(self)
+        if index >= self.size:
+            raise RuntimeError(f"Predicted schedule buffer full ({self.size} targets).")
+
+        self.columns["ra"][index] = target.ra
+        self.columns["decl"][index] = target.dec
+        self.columns["mjd"][index] = target.obs_time
+        self.columns["exptime"][index] = np.sum(target.exp_times)
+        self.columns["rotSkyPos"][index] = target.ang
+        self.columns["nexp"][index] = len(target.exp_times)
+        self.filters.append(target.filter)
+
+    def extend(self, targets: typing.Iterable[typing.Any]) -> None:
+        """Append a sequence of targets to the buffers.
+
+        Parameters
+        ----------
+        targets : `list` [`DriverTarget`]
+            Targets to append.
+        """
+        for target in targets:
+            self.append(target)
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the predicted schedule payload.
+
+        The column arrays are returned without copying, so they should not be
+        modified while the payload is in use.
+
+        Returns
+        -------
+        `dict` [`str`, `typing.Any`]
+            Predicted schedule, with one entry per column, the number of
+            targets and the instrument configuration.
+        """
+        predicted_schedule: dict[str, typing.Any] = dict(self.columns)
+        predicted_schedule["numberOfTargets"] = len(self)
+        predicted_schedule["instrumentConfiguration"] = ",".join(self.filters)
+        return predicted_schedule
@@ -26,6 +26,7 @@ __all__ = [
     "SIMPLE_LOOP_ERROR",
     "ADVANCE_LOOP_ERROR",
     "UNABLE_TO_FIND_TARGET",
+    "DRY_LOOP_ERROR",
     "OBSERVATORY_STATE_UPDATE",
 ]
 
@@ -36,4 +37,5 @@ UPDATE_TELEMETRY_ERROR = 302
 SIMPLE_LOOP_ERROR = 400
 ADVANCE_LOOP_ERROR = 401
 UNABLE_TO_FIND_TARGET = 402
+DRY_LOOP_ERROR = 403
 OBSERVATORY_STATE_UPDATE = 500
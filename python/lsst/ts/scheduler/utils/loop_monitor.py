@@ -0,0 +1,251 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "EventLoopMonitor",
+    "InstrumentedThreadPoolExecutor",
+    "LoopMonitorSummary",
+]
+
+import asyncio
+import logging
+import threading
+import time
+import typing
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool executor that keeps track of how many calls are waiting
+    for a worker and how many are running.
+
+    Parameters
+    ----------
+    *args, **kwargs
+        Arguments for `concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._counter_lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting for a worker."""
+        return self._pending
+
+    @property
+    def running(self) -> int:
+        """Number of calls running."""
+        return self._running
+
+    def submit(
+        self, fn: typing.Callable, /, *args: typing.Any, **kwargs: typing.Any
+    ) -> Future:
+        with self._counter_lock:
+            self._pending += 1
+        try:
+            return super().submit(self._run, fn, *args, **kwargs)
+        except Exception:
+            with self._counter_lock:
+                self._pending -= 1
+            raise
+
+    def _run(
+        self, fn: typing.Callable, /, *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.Any:
+        with self._counter_lock:
+            self._pending -= 1
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._counter_lock:
+                self._running -= 1
+
+
+@dataclass
+class LoopMonitorSummary:
+    """Statistics of the event loop lag and executor queue depth."""
+
+    n_samples: int
+    # Number of samples.
+
+    lag_p50: float
+    lag_p90: float
+    lag_p99: float
+    lag_max: float
+    # Percentiles and maximum of the event loop lag (in seconds).
+
+    executor_pending_p50: float
+    executor_pending_p99: float
+    executor_pending_max: int
+    # Percentiles and maximum of the number of calls waiting for an executor
+    # worker.
+
+    executor_running_max: int
+    # Maximum number of calls running in the executor.
+
+    def __str__(self) -> str:
+        return (
+            f"Event loop lag over {self.n_samples} samples: "
+            f"p50={self.lag_p50 * 1000.0:.1f}ms, "
+            f"p90={self.lag_p90 * 1000.0:.1f}ms, "
+            f"p99={self.lag_p99 * 1000.0:.1f}ms, "
+            f"max={self.lag_max * 1000.0:.1f}ms. "
+            f"Executor queue depth: p50={self.executor_pending_p50:.1f}, "
+            f"p99={self.executor_pending_p99:.1f}, "
+            f"max={self.executor_pending_max}; "
+            f"max running={self.executor_running_max}."
+        )
+
+
+class EventLoopMonitor:
+    """Sample the event loop lag and the executor queue depth.
+
+    The lag is how late a sleep of ``sample_interval`` seconds wakes up,
+    which is how long the event loop was blocked by other coroutines.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    sample_interval : `float`
+        Time between samples (in seconds).
+    warning_lag : `float`
+        Log a warning when the lag is larger than this value (in seconds).
+        Only one warning is logged per report interval.
+    executor : `InstrumentedThreadPoolExecutor`, optional
+        Executor to sample the queue depth from.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        sample_interval: float,
+        warning_lag: float,
+        executor: InstrumentedThreadPoolExecutor | None = None,
+    ) -> None:
+        self.log = log
+        self.sample_interval = sample_interval
+        self.warning_lag = warning_lag
+        self.executor = executor
+
+        self._lags: list[float] = []
+        self._executor_pending: list[int] = []
+        self._executor_running: list[int] = []
+        self._warned = False
+
+    async def sample(self) -> float:
+        """Take a sample.
+
+        Returns
+        -------
+        lag : `float`
+            Event loop lag (in seconds).
+        """
+        start_time = time.monotonic()
+        await asyncio.sleep(self.sample_interval)
+        lag = max(time.monotonic() - start_time - self.sample_interval, 0.0)
+
+        self._lags.append(lag)
+        if self.executor is not None:
+            self._executor_pending.append(self.executor.pending)
+            self._executor_running.append(self.executor.running)
+
+        if lag > self.warning_lag and not self._warned:
+            self._warned = True
+            executor_info = (
+                f" Executor queue depth: {self.executor.pending}."
+                if self.executor is not None
+                else ""
+            )
+            self.log.warning(
+                f"Event loop blocked for {lag:.2f}s, heartbeats are at risk."
+                f"{executor_info}"
+            )
+
+        return lag
+
+    def get_summary(self) -> LoopMonitorSummary | None:
+        """Get the statistics of the samples taken since the last reset.
+
+        Returns
+        -------
+        `LoopMonitorSummary` or `None`
+            Statistics, None if there are no samples.
+        """
+        if not self._lags:
+            return None
+
+        lag_p50, lag_p90, lag_p99 = np.percentile(self._lags, [50.0, 90.0, 99.0])
+        executor_pending = self._executor_pending if self._executor_pending else [0]
+        executor_running = self._executor_running if self._executor_running else [0]
+        pending_p50, pending_p99 = np.percentile(executor_pending, [50.0, 99.0])
+
+        return LoopMonitorSummary(
+            n_samples=len(self._lags),
+            lag_p50=float(lag_p50),
+            lag_p90=float(lag_p90),
+            lag_p99=float(lag_p99),
+            lag_max=float(np.max(self._lags)),
+            executor_pending_p50=float(pending_p50),
+            executor_pending_p99=float(pending_p99),
+            executor_pending_max=int(np.max(executor_pending)),
+            executor_running_max=int(np.max(executor_running)),
+        )
+
+    def reset(self) -> None:
+        """Discard the samples."""
+        self._lags = []
+        self._executor_pending = []
+        self._executor_running = []
+        self._warned = False
+
+    async def run(
+        self, report_interval: float, keep_running: typing.Callable[[], bool]
+    ) -> None:
+        """Sample continuously and periodically log the statistics.
+
+        Parameters
+        ----------
+        report_interval : `float`
+            How often to log the statistics (in seconds).
+        keep_running : `callable`
+            Function returning whether to keep sampling.
+        """
+        self.reset()
+        report_time = time.monotonic() + report_interval
+
+        while keep_running():
+            await self.sample()
+
+            if time.monotonic() >= report_time:
+                summary = self.get_summary()
+                if summary is not None:
+                    self.log.info(str(summary))
+                self.reset()
+                report_time = time.monotonic() + report_interval
@@ -20,8 +20,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 __all__ = [
+    "DryRun",
     "ObservatoryStatus",
+    "PredictedScheduleEnsemble",
     "SchedulerCscParameters",
+    "Tracing",
 ]
 
 from dataclasses import dataclass, field
@@ -38,6 +41,72 @@ class ObservatoryStatus:
     # List of components that should be monitored for faults.
 
 
+@dataclass
+class PredictedScheduleEnsemble:
+    """Configuration for computing the predicted schedule under several
+    weather scenarios.
+    """
+
+    n_scenarios: int = 0
+    # Number of weather scenarios. If 0, only the nominal predicted schedule
+    # is computed.
+
+    seeing_sigma: float = 0.2
+    # Standard deviation of the log of the seeing scale factor.
+
+    cloud_sigma: float = 0.1
+    # Standard deviation of the bulk cloud coverage offset.
+
+    mounted_filters: list[list[str]] = field(default_factory=list)
+    # Alternative sets of mounted filters the scenarios cycle through.
+
+    max_workers: int = 4
+    # Maximum number of processes used to compute the scenarios.
+
+    seed: int = 42
+    # Seed for the random number generator.
+
+
+@dataclass
+class Tracing:
+    """Configuration for recording the duration of the stages of the target
+    production.
+    """
+
+    enable: bool = False
+    # Record the duration of the stages?
+
+    filename: str = "scheduler_trace.json"
+    # File to export the recorded spans to, in the Chrome trace event format.
+
+    max_events: int = 100000
+    # Maximum number of spans kept in memory.
+
+    export_interval: float = 300.0
+    # How often to export the recorded spans (in seconds).
+
+
+@dataclass
+class DryRun:
+    """Configuration for the DRY mode, where the scheduler simulates the
+    observations instead of sending them to the ScriptQueue.
+    """
+
+    start_time: float = 0.0
+    # Time to start the simulation (TAI unix seconds). If zero, start now or,
+    # if it is daytime, at the next sunset.
+
+    duration: float = 0.0
+    # How long to simulate (in hours). If zero, simulate until the end of the
+    # night.
+
+    output_database: str = "scheduler_dry_run.db"
+    # Opsim database to write the simulated observations to.
+
+    reset_state: bool = True
+    # Reset the scheduler to its state before the simulation when it is done?
+
+
 @dataclass
 class SchedulerCscParameters:
     """Configuration of the LSST Scheduler's Model."""
@@ -78,6 +147,9 @@ class SchedulerCscParameters:
     #     "monitor the telemetry stream, recompute the "
     #     "queue and change next target up to a "
     #     "certain lead time.",
+    #     "DRY": "The Scheduler will simulate the observations "
+    #     "as fast as possible, without the ScriptQueue, "
+    #     "and write them to an opsim database.",
     # },
 
     n_targets: int = 1
@@ -102,9 +174,41 @@ class SchedulerCscParameters:
     max_scripts: int = 100
     # Maximum number of scripts to keep track of.
 
+    max_concurrent_script_adds: int = 4
+    # Maximum number of scripts from a block being added to the ScriptQueue
+    # concurrently. If 1, scripts are added one at a time.
+
+    script_add_rate: float = 2.0
+    # Maximum number of scripts added to the ScriptQueue per second. If zero,
+    # there is no limit.
+
+    speculative_target_tolerance: float = 0.1
+    # Maximum relative change in the telemetry values since targets were
+    # generated ahead of time, before they are regenerated.
+
+    telemetry_refresh_interval: float = 60.0
+    # How often to refresh the telemetry and the driver conditions while the
+    # Scheduler is idle (in seconds). If zero, the telemetry is not refreshed
+    # while idle.
+
+    loop_monitor_interval: float = 60.0
+    # How often to log statistics of the event loop lag and executor queue
+    # depth (in seconds). If zero, the event loop is not monitored.
+
     observatory_status: ObservatoryStatus = field(default_factory=ObservatoryStatus)
     # Configuration for the observatory status features
 
+    predicted_schedule_ensemble: PredictedScheduleEnsemble = field(
+        default_factory=PredictedScheduleEnsemble
+    )
+    # Configuration for the predicted schedule weather scenarios
+
+    tracing: Tracing = field(default_factory=Tracing)
+    # Configuration for the target production stages timing
+
+    dry_run: DryRun = field(default_factory=DryRun)
+    # Configuration for the DRY mode
+
     def set_defaults(self):
         """Set defaults for the LSST Scheduler's Driver."""
         self.driver_type = "driver"
@@ -118,4 +222,12 @@ class SchedulerCscParameters:
         self.observing_script = "standard_visit.py"
         self.observing_script_is_standard = True
         self.max_scripts = 100
+        self.max_concurrent_script_adds = 4
+        self.script_add_rate = 2.0
+        self.speculative_target_tolerance = 0.1
+        self.telemetry_refresh_interval = 60.0
+        self.loop_monitor_interval = 60.0
         self.observatory_status = ObservatoryStatus()
+        self.predicted_schedule_ensemble = PredictedScheduleEnsemble()
+        self.tracing = Tracing()
+        self.dry_run = DryRun()
@@ -0,0 +1,38 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["PredictedScheduleProgress"]
+
+from dataclasses import dataclass
+
+
+@dataclass
+class PredictedScheduleProgress:
+    """Progress of the computation of a predicted schedule."""
+
+    number_of_targets: int
+    # Number of targets generated so far.
+
+    simulated_time: float
+    # Time reached by the simulation (unix utc, as the observatory model).
+
+    elapsed_time: float
+    # Wall clock time since the computation started (seconds).
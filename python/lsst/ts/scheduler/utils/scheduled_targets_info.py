@@ -19,15 +19,41 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["ScheduledTargetsInfo"]
+__all__ = ["ScheduledTargetStatus", "ScheduledTargetsInfo"]
 
+import enum
 from dataclasses import dataclass, field
 
 from ..driver.driver_target import DriverTarget
 
 
+class ScheduledTargetStatus(enum.Enum):
+    """Final status of a scheduled target."""
+
+    OBSERVED = enum.auto()
+    FAILED = enum.auto()
+    UNRECOGNIZED = enum.auto()
+
+
 @dataclass
 class ScheduledTargetsInfo:
     failed: list[DriverTarget] = field(default_factory=list)
     unrecognized: list[int] = field(default_factory=list)
     observed: list[DriverTarget] = field(default_factory=list)
+
+    def add(self, status: ScheduledTargetStatus, target: DriverTarget) -> None:
+        """Add a target that reached a final status.
+
+        Parameters
+        ----------
+        status : `ScheduledTargetStatus`
+            Final status of the target.
+        target : `DriverTarget`
+            Scheduled target.
+        """
+        if status == ScheduledTargetStatus.OBSERVED:
+            self.observed.append(target)
+        elif status == ScheduledTargetStatus.FAILED:
+            self.failed.append(target)
+        else:
+            self.unrecognized.extend(target.get_sal_indices())
@@ -21,3 +21,6 @@
 
 from .block_utils import *
 from .feature_scheduler_sim import *
+from .throughput_benchmark import *
+from .advance_loop_benchmark import *
+from .snapshot_benchmark import *
@@ -0,0 +1,333 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "AdvanceLoopBenchmark",
+    "AdvanceLoopBenchmarkResult",
+    "run_advance_loop_benchmark",
+]
+
+import argparse
+import asyncio
+import json
+import logging
+import pathlib
+import time
+import typing
+from dataclasses import asdict, dataclass, field
+
+from lsst.ts import salobj
+
+from ...mock import ObservatoryStateMock, ScriptQueueSimulator
+from ...scheduler_csc import SchedulerCSC
+from ..csc_utils import DetailedState, SchedulerModes
+from ..parameters import Tracing
+from ..tracing import tracer
+from .throughput_benchmark import LatencyStats
+
+# Spans recorded while taking snapshots of the scheduler.
+SNAPSHOT_SPANS = ("save_state", "lfa_upload")
+
+STD_TIMEOUT = 60.0
+
+
+@dataclass
+class AdvanceLoopBenchmarkResult:
+    """Result of the advance target production loop benchmark."""
+
+    override: str
+    # Configuration override used in the benchmark.
+
+    elapsed_time: float = 0.0
+    # Wall clock time the target production loop ran (in seconds).
+
+    number_of_targets: int = 0
+    # Number of targets (blocks) sent to the ScriptQueue.
+
+    number_of_scripts: int = 0
+    # Number of scripts executed by the ScriptQueue.
+
+    idle_gaps: LatencyStats = field(default_factory=LatencyStats)
+    # Time the ScriptQueue waited for the next script after finishing the
+    # previous one.
+
+    generation_latency: LatencyStats = field(default_factory=LatencyStats)
+    # Time spent generating the targets queue.
+
+    snapshot_time: dict[str, float] = field(default_factory=dict)
+    # Total time spent taking snapshots of the scheduler, for each stage
+    # (in seconds).
+
+    snapshot_time_per_block: float = 0.0
+    # Time spent taking snapshots of the scheduler per target (in seconds).
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the result as a dictionary that can be serialized to JSON.
+
+        Returns
+        -------
+        `dict`
+            Benchmark result.
+        """
+        from ... import __version__
+
+        return dict(version=__version__, **asdict(self))
+
+    def write_json(self, filename: str | pathlib.Path) -> None:
+        """Write the result to a JSON file.
+
+        Parameters
+        ----------
+        filename : `str` or `pathlib.Path`
+            Name of the file.
+        """
+        with open(filename, "w") as fp:
+            json.dump(self.as_dict(), fp, indent=2)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.number_of_targets} targets, {self.number_of_scripts} scripts "
+            f"in {self.elapsed_time:.1f}s; "
+            f"idle gaps p50={self.idle_gaps.p50:.3f}s "
+            f"p99={self.idle_gaps.p99:.3f}s max={self.idle_gaps.max:.3f}s; "
+            f"generation latency p50={self.generation_latency.p50:.3f}s "
+            f"p99={self.generation_latency.p99:.3f}s; "
+            f"snapshot time per block {self.snapshot_time_per_block:.3f}s."
+        )
+
+
+class AdvanceLoopBenchmark:
+    """Measure the dead time of the advance target production loop, running
+    the Scheduler CSC against a simulated ScriptQueue.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    config_dir : `str` or `pathlib.Path`
+        Scheduler CSC configuration directory.
+    override : `str`
+        Configuration override, which must select the ``ADVANCE`` mode.
+    index : `int`, optional
+        Scheduler and ScriptQueue SAL index.
+    max_targets : `int`, optional
+        Stop the benchmark after this many targets are sent to the
+        ScriptQueue.
+    timeout : `float`, optional
+        Maximum time to run the target production loop for (in seconds).
+    time_scale : `float`, optional
+        Factor applied to the duration of the scripts, see
+        `ScriptQueueSimulator`.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        config_dir: str | pathlib.Path,
+        override: str,
+        index: int = 1,
+        max_targets: int = 10,
+        timeout: float = 600.0,
+        time_scale: float = 1.0,
+    ) -> None:
+        self.log = log.getChild(type(self).__name__)
+
+        self.config_dir = pathlib.Path(config_dir)
+        self.override = override
+        self.index = index
+        self.max_targets = max_targets
+        self.timeout = timeout
+        self.time_scale = time_scale
+
+        self.number_of_targets = 0
+        self.generation_latencies: list[float] = []
+
+        self._generation_start: float | None = None
+        self._max_targets_reached = asyncio.Event()
+
+    async def run(self) -> AdvanceLoopBenchmarkResult:
+        """Run the benchmark.
+
+        Returns
+        -------
+        `AdvanceLoopBenchmarkResult`
+            Benchmark result.
+        """
+        self.number_of_targets = 0
+        self.generation_latencies = []
+        self._generation_start = None
+        self._max_targets_reached.clear()
+
+        result = AdvanceLoopBenchmarkResult(override=self.override)
+
+        async with ScriptQueueSimulator(
+            index=self.index, time_scale=self.time_scale, log=self.log
+        ) as script_queue, SchedulerCSC(
+            index=self.index,
+            config_dir=self.config_dir,
+            simulation_mode=SchedulerModes.MOCKS3,
+        ) as scheduler, salobj.Remote(
+            scheduler.domain, "Scheduler", index=self.index
+        ) as scheduler_remote, ObservatoryStateMock():
+            scheduler_remote.evt_detailedState.callback = self.handle_detailed_state
+            scheduler_remote.evt_target.callback = self.handle_target
+
+            await salobj.set_summary_state(
+                scheduler_remote,
+                salobj.State.ENABLED,
+                override=self.override,
+            )
+
+            tracer.configure(enabled=True, max_events=Tracing.max_events)
+
+            try:
+                time_start = time.monotonic()
+
+                await scheduler_remote.cmd_resume.start(timeout=STD_TIMEOUT)
+
+                try:
+                    await asyncio.wait_for(
+                        self._max_targets_reached.wait(), timeout=self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.log.warning(
+                        f"Only {self.number_of_targets} of {self.max_targets} "
+                        f"targets produced in {self.timeout}s."
+                    )
+
+                result.elapsed_time = time.monotonic() - time_start
+
+                await scheduler_remote.cmd_stop.set_start(
+                    abort=True, timeout=STD_TIMEOUT
+                )
+                await salobj.set_summary_state(scheduler_remote, salobj.State.STANDBY)
+
+                histograms = tracer.get_histograms()
+            finally:
+                tracer.configure(enabled=False, max_events=Tracing.max_events)
+
+            result.number_of_targets = self.number_of_targets
+            result.number_of_scripts = script_queue.number_of_scripts_done
+            result.idle_gaps = LatencyStats.from_samples(script_queue.idle_gaps)
+
+        result.generation_latency = LatencyStats.from_samples(self.generation_latencies)
+        result.snapshot_time = {
+            name: histograms[name].total
+            for name in SNAPSHOT_SPANS
+            if name in histograms
+        }
+        result.snapshot_time_per_block = (
+            sum(result.snapshot_time.values()) / result.number_of_targets
+            if result.number_of_targets > 0
+            else 0.0
+        )
+
+        return result
+
+    async def handle_detailed_state(self, data: salobj.type_hints.BaseMsgType) -> None:
+        """Callback for the Scheduler detailed state event, to measure how
+        long it takes to generate the targets queue.
+
+        Parameters
+        ----------
+        data : `Scheduler_logevent_detailedStateC`
+            Detailed state.
+        """
+        if self._generation_start is not None:
+            self.generation_latencies.append(
+                data.private_sndStamp - self._generation_start
+            )
+            self._generation_start = None
+
+        if data.substate == DetailedState.GENERATING_TARGET_QUEUE:
+            self._generation_start = data.private_sndStamp
+
+    async def handle_target(self, data: salobj.type_hints.BaseMsgType) -> None:
+        """Callback for the Scheduler target event, to count the targets sent
+        to the ScriptQueue.
+
+        Parameters
+        ----------
+        data : `Scheduler_logevent_targetC`
+            Target.
+        """
+        self.number_of_targets += 1
+        if self.number_of_targets >= self.max_targets:
+            self._max_targets_reached.set()
+
+
+def run_advance_loop_benchmark() -> None:
+    """Run the advance target production loop benchmark from the command
+    line.
+    """
+    parser = argparse.ArgumentParser(
+        description="Measure the dead time of the Scheduler advance target "
+        "production loop against a simulated ScriptQueue."
+    )
+    parser.add_argument("config_dir", help="Scheduler configuration directory.")
+    parser.add_argument(
+        "override", help="Configuration override, selecting the ADVANCE mode."
+    )
+    parser.add_argument(
+        "--index", type=int, default=1, help="Scheduler and ScriptQueue index."
+    )
+    parser.add_argument(
+        "--max-targets",
+        type=int,
+        default=10,
+        help="Stop after this many targets are sent to the ScriptQueue.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Maximum time to run the target production loop for (in seconds).",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="Factor applied to the duration of the scripts.",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the results to this JSON file."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    log = logging.getLogger("AdvanceLoopBenchmark")
+
+    benchmark = AdvanceLoopBenchmark(
+        log=log,
+        config_dir=args.config_dir,
+        override=args.override,
+        index=args.index,
+        max_targets=args.max_targets,
+        timeout=args.timeout,
+        time_scale=args.time_scale,
+    )
+
+    result = asyncio.run(benchmark.run())
+
+    log.info(f"{result}")
+
+    if args.output is not None:
+        result.write_json(args.output)
@@ -0,0 +1,429 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "SnapshotBenchmark",
+    "SnapshotBenchmarkResult",
+    "make_synthetic_observations",
+    "run_snapshot_benchmark",
+]
+
+import argparse
+import functools
+import json
+import logging
+import os
+import pathlib
+import pickle
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+from lsst.ts.salobj import AsyncS3Bucket
+from rubin_scheduler.scheduler.utils import ObservationArray
+
+from ..s3_utils import handle_lfoa
+from .feature_scheduler_sim import MJD_START, FeatureSchedulerSim
+from .throughput_benchmark import LatencyStats
+
+SYNTHETIC_FILTERS = ("u", "g", "r", "i", "z", "y")
+
+
+@dataclass
+class SnapshotBenchmarkResult:
+    """Result of the snapshot benchmark for one scheduler configuration and
+    observation history size.
+    """
+
+    scheduler_config: str
+    # Scheduler configuration used in the benchmark.
+
+    history_size: int
+    # Number of synthetic observations added to the scheduler.
+
+    snapshot_size: int = 0
+    # Size of the snapshot (in bytes).
+
+    save_time: LatencyStats = field(default_factory=LatencyStats)
+    # Time to save the snapshot with `FeatureScheduler.save_state`.
+
+    restore_time: LatencyStats = field(default_factory=LatencyStats)
+    # Time to restore the snapshot with `FeatureScheduler.reset_from_state`.
+
+    upload_time: LatencyStats = field(default_factory=LatencyStats)
+    # Time to upload the snapshot to the (mocked) S3 bucket with
+    # `handle_lfoa`, in a single worker process pool like the CSC.
+
+    component_sizes: dict[str, int] = field(default_factory=dict)
+    # Pickled size of the components of the snapshot (in bytes). Components
+    # may share objects, so the sizes are not additive; the basis functions
+    # and features are also included in the surveys.
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the result as a dictionary that can be serialized to JSON.
+
+        Returns
+        -------
+        `dict`
+            Benchmark result.
+        """
+        from ... import __version__
+
+        return dict(version=__version__, **asdict(self))
+
+    def write_json(self, filename: str | pathlib.Path) -> None:
+        """Write the result to a JSON file.
+
+        Parameters
+        ----------
+        filename : `str` or `pathlib.Path`
+            Name of the file.
+        """
+        with open(filename, "w") as fp:
+            json.dump(self.as_dict(), fp, indent=2)
+
+    def __str__(self) -> str:
+        components = ", ".join(
+            f"{name}={size}" for name, size in self.component_sizes.items()
+        )
+        return (
+            f"{pathlib.Path(self.scheduler_config).name}[{self.history_size}]: "
+            f"{self.snapshot_size} bytes, "
+            f"save {self.save_time.p50 * 1e3:.1f}ms, "
+            f"restore {self.restore_time.p50 * 1e3:.1f}ms, "
+            f"upload {self.upload_time.p50 * 1e3:.1f}ms; {components}."
+        )
+
+
+def make_synthetic_observations(
+    n_observations: int, mjd_end: float, seed: int = 42
+) -> ObservationArray:
+    """Make a synthetic history of observations.
+
+    Parameters
+    ----------
+    n_observations : `int`
+        Number of observations.
+    mjd_end : `float`
+        The observations are spread over the year before this date (MJD).
+    seed : `int`, optional
+        Seed for the random number generator.
+
+    Returns
+    -------
+    observations : `ObservationArray`
+        Observations, sorted by time.
+    """
+    rng = np.random.default_rng(seed)
+
+    observations = ObservationArray(n=n_observations)
+
+    observations["ID"] = np.arange(n_observations)
+    observations["RA"] = rng.uniform(0.0, 2.0 * np.pi, n_observations)
+    observations["dec"] = np.arcsin(rng.uniform(-1.0, 0.5, n_observations))
+    observations["mjd"] = np.sort(rng.uniform(mjd_end - 365.0, mjd_end, n_observations))
+    observations["exptime"] = 30.0
+    observations["nexp"] = 1
+    observations["rotSkyPos"] = rng.uniform(0.0, 2.0 * np.pi, n_observations)
+    observations["filter"] = rng.choice(SYNTHETIC_FILTERS, n_observations)
+    if "band" in observations.dtype.names:
+        observations["band"] = observations["filter"]
+    if "night" in observations.dtype.names:
+        observations["night"] = np.floor(
+            observations["mjd"] - observations["mjd"].min()
+        ).astype(int)
+
+    return observations
+
+
+class SnapshotBenchmark:
+    """Measure the cost of saving and restoring snapshots of the feature
+    scheduler, for schedulers with observation histories of growing size.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    scheduler_configs : `list` [`str` or `pathlib.Path`]
+        Feature scheduler configuration files.
+    history_sizes : `list` [`int`], optional
+        Number of synthetic observations in the scheduler history, in
+        increasing order.
+    repeat : `int`, optional
+        How many times to save, upload and restore each snapshot.
+    s3instance : `str`, optional
+        S3 instance used to make the name of the bucket the snapshots are
+        uploaded to. The bucket is always mocked.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        scheduler_configs: typing.Sequence[str | pathlib.Path],
+        history_sizes: typing.Sequence[int] = (0, 1000, 10000),
+        repeat: int = 3,
+        s3instance: str = "test",
+    ) -> None:
+        self.log = log.getChild(type(self).__name__)
+
+        self.scheduler_configs = [pathlib.Path(config) for config in scheduler_configs]
+        self.history_sizes = sorted(history_sizes)
+        self.repeat = repeat
+        self.s3bucket_name = AsyncS3Bucket.make_bucket_name(s3instance=s3instance)
+
+    def run(self) -> list[SnapshotBenchmarkResult]:
+        """Run the benchmark.
+
+        Returns
+        -------
+        `list` [`SnapshotBenchmarkResult`]
+            Benchmark results, for each configuration and history size.
+        """
+        results = []
+        for scheduler_config in self.scheduler_configs:
+            results += self.run_config(scheduler_config)
+        return results
+
+    def run_config(
+        self, scheduler_config: pathlib.Path
+    ) -> list[SnapshotBenchmarkResult]:
+        """Run the benchmark for one scheduler configuration.
+
+        The synthetic observations are added incrementally, so each history
+        contains the previous one.
+
+        Parameters
+        ----------
+        scheduler_config : `pathlib.Path`
+            Feature scheduler configuration file.
+
+        Returns
+        -------
+        `list` [`SnapshotBenchmarkResult`]
+            Benchmark results, for each history size.
+        """
+        feature_scheduler_sim = FeatureSchedulerSim(log=self.log)
+        feature_scheduler_sim.config.feature_scheduler_driver_configuration[
+            "scheduler_config"
+        ] = scheduler_config
+
+        driver = feature_scheduler_sim.driver
+        driver.configure_scheduler(feature_scheduler_sim.config)
+        driver.update_conditions()
+
+        observations = make_synthetic_observations(
+            n_observations=max(self.history_sizes, default=0),
+            mjd_end=MJD_START,
+        )
+
+        results = []
+        history_size = 0
+        for next_history_size in self.history_sizes:
+            if next_history_size > history_size:
+                driver.scheduler.add_observations_array(
+                    observations[history_size:next_history_size].copy()
+                )
+                history_size = next_history_size
+
+            result = self.measure(driver)
+            result.scheduler_config = scheduler_config.as_posix()
+            result.history_size = history_size
+
+            self.log.info(f"{result}")
+
+            results.append(result)
+
+        return results
+
+    def measure(self, driver: typing.Any) -> SnapshotBenchmarkResult:
+        """Measure the cost of saving, uploading and restoring a snapshot of
+        the scheduler.
+
+        The upload mirrors `SchedulerCSC._handle_lfoa`, running `handle_lfoa`
+        in a new single worker process pool against a mocked S3 bucket, so it
+        includes the cost of starting the worker process and reading the
+        snapshot, but not the network transfer.
+
+        Parameters
+        ----------
+        driver : `FeatureScheduler`
+            Feature scheduler driver.
+
+        Returns
+        -------
+        `SnapshotBenchmarkResult`
+            Benchmark result. The scheduler configuration and history size are
+            left for the caller to fill.
+        """
+        save_times = []
+        restore_times = []
+        upload_times = []
+        snapshot_size = 0
+
+        for _ in range(self.repeat):
+            time_start = time.perf_counter()
+            filename = driver.save_state()
+            save_times.append(time.perf_counter() - time_start)
+
+            try:
+                snapshot_size = os.path.getsize(filename)
+
+                time_start = time.perf_counter()
+                self.upload(filename)
+                upload_times.append(time.perf_counter() - time_start)
+
+                time_start = time.perf_counter()
+                driver.reset_from_state(filename)
+                restore_times.append(time.perf_counter() - time_start)
+            finally:
+                os.remove(filename)
+
+        return SnapshotBenchmarkResult(
+            scheduler_config="",
+            history_size=0,
+            snapshot_size=snapshot_size,
+            save_time=LatencyStats.from_samples(save_times),
+            restore_time=LatencyStats.from_samples(restore_times),
+            upload_time=LatencyStats.from_samples(upload_times),
+            component_sizes=self.get_component_sizes(driver),
+        )
+
+    def upload(self, filename: str) -> str:
+        """Upload a snapshot to the mocked S3 bucket, the same way the CSC
+        publishes it as a large file object.
+
+        Parameters
+        ----------
+        filename : `str`
+            Name of the snapshot file.
+
+        Returns
+        -------
+        `str`
+            Url of the uploaded file.
+        """
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            return pool.submit(
+                functools.partial(
+                    handle_lfoa,
+                    self.s3bucket_name,
+                    True,
+                    "Scheduler",
+                    1,
+                    filename,
+                )
+            ).result()
+
+    @staticmethod
+    def get_component_sizes(driver: typing.Any) -> dict[str, int]:
+        """Get the pickled size of the components of a scheduler snapshot.
+
+        Parameters
+        ----------
+        driver : `FeatureScheduler`
+            Feature scheduler driver.
+
+        Returns
+        -------
+        `dict` [`str`, `int`]
+            Size of the scheduler, surveys, basis functions, features and
+            conditions (in bytes).
+        """
+        surveys = [
+            survey
+            for survey_list in driver.scheduler.survey_lists
+            for survey in survey_list
+        ]
+        basis_functions = [
+            basis_function
+            for survey in surveys
+            for basis_function in getattr(survey, "basis_functions", [])
+        ]
+        features = [getattr(survey, "extra_features", dict()) for survey in surveys]
+        features += [
+            getattr(basis_function, "survey_features", dict())
+            for basis_function in basis_functions
+        ]
+
+        return dict(
+            scheduler=len(pickle.dumps(driver.scheduler)),
+            surveys=sum(len(pickle.dumps(survey)) for survey in surveys),
+            basis_functions=sum(
+                len(pickle.dumps(basis_function)) for basis_function in basis_functions
+            ),
+            features=sum(len(pickle.dumps(feature)) for feature in features),
+            conditions=len(pickle.dumps(driver.conditions)),
+        )
+
+
+def run_snapshot_benchmark() -> None:
+    """Run the feature scheduler snapshot benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Measure the cost of saving and restoring snapshots of the "
+        "feature scheduler."
+    )
+    parser.add_argument(
+        "scheduler_configs", nargs="+", help="Feature scheduler configuration files."
+    )
+    parser.add_argument(
+        "--history-sizes",
+        type=int,
+        nargs="+",
+        default=[0, 1000, 10000],
+        help="Number of synthetic observations in the scheduler history.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="How many times to save, upload and restore each snapshot.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Write the results to JSON files with this name, suffixed by the "
+        "scheduler configuration and history size.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    log = logging.getLogger("SnapshotBenchmark")
+
+    benchmark = SnapshotBenchmark(
+        log=log,
+        scheduler_configs=args.scheduler_configs,
+        history_sizes=args.history_sizes,
+        repeat=args.repeat,
+    )
+
+    results = benchmark.run()
+
+    if args.output is not None:
+        output = pathlib.Path(args.output)
+        for result in results:
+            result.write_json(
+                output.with_name(
+                    f"{output.stem}_{pathlib.Path(result.scheduler_config).stem}"
+                    f"_{result.history_size}{output.suffix}"
+                )
+            )
@@ -0,0 +1,458 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "LatencyStats",
+    "ThroughputBenchmark",
+    "ThroughputBenchmarkResult",
+    "run_throughput_benchmark",
+]
+
+import argparse
+import json
+import logging
+import os
+import pathlib
+import resource
+import sys
+import time
+import typing
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+from .feature_scheduler_sim import FeatureSchedulerSim
+
+# Driver calls timed by the benchmark.
+BENCHMARK_CALLS = (
+    "update_conditions",
+    "select_next_target",
+    "register_observed_target",
+    "save_state",
+)
+
+
+@dataclass
+class LatencyStats:
+    """Latency distribution of a call."""
+
+    count: int = 0
+    # Number of calls.
+
+    mean: float = 0.0
+    # Mean duration (in seconds).
+
+    p50: float = 0.0
+    # Median duration (in seconds).
+
+    p90: float = 0.0
+    # 90th percentile of the duration (in seconds).
+
+    p99: float = 0.0
+    # 99th percentile of the duration (in seconds).
+
+    max: float = 0.0
+    # Maximum duration (in seconds).
+
+    @classmethod
+    def from_samples(cls, samples: typing.Sequence[float]) -> "LatencyStats":
+        """Compute the latency distribution from a set of samples.
+
+        Parameters
+        ----------
+        samples : `list` [`float`]
+            Duration of each call (in seconds).
+
+        Returns
+        -------
+        `LatencyStats`
+            Latency distribution.
+        """
+        if len(samples) == 0:
+            return cls()
+
+        p50, p90, p99 = np.percentile(samples, [50.0, 90.0, 99.0])
+
+        return cls(
+            count=len(samples),
+            mean=float(np.mean(samples)),
+            p50=float(p50),
+            p90=float(p90),
+            p99=float(p99),
+            max=float(np.max(samples)),
+        )
+
+
+@dataclass
+class ThroughputBenchmarkResult:
+    """Result of a throughput benchmark."""
+
+    scheduler_config: str
+    # Scheduler configuration used in the benchmark.
+
+    n_nights: int
+    # Number of nights simulated.
+
+    number_of_targets: int = 0
+    # Number of targets observed in all nights.
+
+    elapsed_time: float = 0.0
+    # Wall clock time spent simulating the nights (in seconds).
+
+    targets_per_second: float = 0.0
+    # Number of targets produced per second of wall clock time.
+
+    peak_rss: int = 0
+    # Peak resident set size of the process (in bytes).
+
+    snapshot_sizes: list[int] = field(default_factory=list)
+    # Size of the scheduler snapshot at the end of each night (in bytes).
+
+    latencies: dict[str, LatencyStats] = field(default_factory=dict)
+    # Latency distribution of each driver call.
+
+    slew_time_tables_computed: int = 0
+    # Number of slew time tables computed, 0 if the table is disabled.
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the result as a dictionary that can be serialized to JSON.
+
+        Returns
+        -------
+        `dict`
+            Benchmark result.
+        """
+        from ... import __version__
+
+        return dict(version=__version__, **asdict(self))
+
+    def write_json(self, filename: str | pathlib.Path) -> None:
+        """Write the result to a JSON file.
+
+        Parameters
+        ----------
+        filename : `str` or `pathlib.Path`
+            Name of the file.
+        """
+        with open(filename, "w") as fp:
+            json.dump(self.as_dict(), fp, indent=2)
+
+    def __str__(self) -> str:
+        latencies = ", ".join(
+            f"{name}: p50={stats.p50 * 1e3:.1f}ms p99={stats.p99 * 1e3:.1f}ms"
+            for name, stats in self.latencies.items()
+        )
+        return (
+            f"{self.number_of_targets} targets in {self.n_nights} night(s), "
+            f"{self.targets_per_second:.2f} targets/s, "
+            f"peak RSS {self.peak_rss / 2**20:.1f} MiB, "
+            f"snapshot sizes {self.snapshot_sizes} bytes; {latencies}."
+        )
+
+
+class ThroughputBenchmark:
+    """Measure the throughput of the feature scheduler driver when simulating
+    full nights of observations.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    scheduler_config : `str` or `pathlib.Path`
+        Feature scheduler configuration file.
+    n_nights : `int`, optional
+        Number of nights to simulate.
+    max_targets_per_night : `int` or `None`, optional
+        Maximum number of targets to observe each night, None to observe
+        until sunrise.
+    observation_database_name : `str` or `pathlib.Path` or `None`, optional
+        Observation database used by the scheduler, None to use the driver
+        default.
+    slew_time_table_resolution : `float`, optional
+        Resolution of the slew time lookup table (degrees), 0 to compute the
+        slew times with the observatory model.
+
+    Notes
+    -----
+    The nights are simulated with `FeatureSchedulerSim`, which provides the
+    observatory model and mock telemetry, calling the driver directly. This
+    measures the cost of the scheduling algorithm only. The `Model` layer
+    used by the CSC is not exercised: telemetry retrieval
+    (`Model.update_telemetry`), `Model.generate_targets_in_time_window`,
+    `Model.register_observations` and formatting the targets into observing
+    blocks are not included.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        scheduler_config: str | pathlib.Path,
+        n_nights: int = 1,
+        max_targets_per_night: int | None = None,
+        observation_database_name: str | pathlib.Path | None = None,
+        slew_time_table_resolution: float = 0.0,
+    ) -> None:
+        self.log = log.getChild(type(self).__name__)
+
+        self.scheduler_config = pathlib.Path(scheduler_config)
+        self.n_nights = n_nights
+        self.max_targets_per_night = max_targets_per_night
+
+        self.feature_scheduler_sim = FeatureSchedulerSim(log=self.log)
+
+        driver_configuration = (
+            self.feature_scheduler_sim.config.feature_scheduler_driver_configuration
+        )
+        driver_configuration["scheduler_config"] = self.scheduler_config
+        if observation_database_name is not None:
+            driver_configuration["observation_database_name"] = (
+                observation_database_name
+            )
+        driver_configuration["slew_time_table_resolution"] = slew_time_table_resolution
+
+        self.latencies: dict[str, list[float]] = {name: [] for name in BENCHMARK_CALLS}
+
+    @property
+    def driver(self) -> typing.Any:
+        return self.feature_scheduler_sim.driver
+
+    @property
+    def models(self) -> dict[str, typing.Any]:
+        return self.feature_scheduler_sim.models
+
+    def run(self) -> ThroughputBenchmarkResult:
+        """Run the benchmark, calling the driver directly (see Notes in the
+        class docstring for what is not measured).
+
+        Returns
+        -------
+        `ThroughputBenchmarkResult`
+            Benchmark result.
+        """
+        self.driver.configure_scheduler(self.feature_scheduler_sim.config)
+
+        for samples in self.latencies.values():
+            samples.clear()
+
+        result = ThroughputBenchmarkResult(
+            scheduler_config=self.scheduler_config.as_posix(),
+            n_nights=self.n_nights,
+        )
+
+        time_start = time.perf_counter()
+
+        self._timed("update_conditions", self.driver.update_conditions)
+
+        for night in range(self.n_nights):
+            number_of_targets = self.run_night()
+            result.snapshot_sizes.append(self.get_snapshot_size())
+            result.number_of_targets += number_of_targets
+            self.log.info(f"Night {night + 1}: {number_of_targets} targets.")
+
+        result.elapsed_time = time.perf_counter() - time_start
+        result.targets_per_second = (
+            result.number_of_targets / result.elapsed_time
+            if result.elapsed_time > 0.0
+            else 0.0
+        )
+        result.peak_rss = self.get_peak_rss()
+        result.latencies = {
+            name: LatencyStats.from_samples(samples)
+            for name, samples in self.latencies.items()
+        }
+        if self.driver.slew_time_table is not None:
+            result.slew_time_tables_computed = self.driver.slew_time_table.n_computed
+
+        return result
+
+    def run_night(self) -> int:
+        """Simulate observations from sunset to sunrise of the current night.
+
+        Each target is selected with `FeatureScheduler.update_conditions` and
+        `FeatureScheduler.select_next_target`, observed on the observatory
+        model and registered with `FeatureScheduler.register_observed_target`.
+        When the night is over, the observatory is moved to sunrise so the
+        driver computes the boundaries of the next night.
+
+        Returns
+        -------
+        number_of_targets : `int`
+            Number of targets observed.
+        """
+        sunset_time = self.driver.current_sunset
+        sunrise_time = self.driver.current_sunrise
+
+        current_time = max(self.models["observatory_state"].time, sunset_time)
+        self._set_observatory_time(current_time)
+
+        number_of_targets = 0
+
+        while current_time < sunrise_time and (
+            self.max_targets_per_night is None
+            or number_of_targets < self.max_targets_per_night
+        ):
+            self._timed("update_conditions", self.driver.update_conditions)
+
+            target = self._timed("select_next_target", self.driver.select_next_target)
+
+            if target is None:
+                current_time += self.feature_scheduler_sim.no_target_time_step
+                self._set_observatory_time(current_time)
+            else:
+                self.models["observatory_model"].observe(target)
+                self.models["observatory_state"].set(
+                    self.models["observatory_model"].current_state
+                )
+                current_time = self.models["observatory_state"].time
+                self._timed(
+                    "register_observed_target",
+                    self.driver.register_observed_target,
+                    target,
+                )
+                number_of_targets += 1
+
+        self._set_observatory_time(max(current_time, sunrise_time))
+        self._timed("update_conditions", self.driver.update_conditions)
+
+        return number_of_targets
+
+    def get_snapshot_size(self) -> int:
+        """Save a snapshot of the scheduler and return its size.
+
+        The snapshot file is removed afterwards.
+
+        Returns
+        -------
+        `int`
+            Size of the snapshot (in bytes).
+        """
+        filename = self._timed("save_state", self.driver.save_state)
+        try:
+            return os.path.getsize(filename)
+        finally:
+            os.remove(filename)
+
+    @staticmethod
+    def get_peak_rss() -> int:
+        """Return the peak resident set size of the process.
+
+        Returns
+        -------
+        `int`
+            Peak resident set size (in bytes).
+        """
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on linux and in bytes on macOS.
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def _set_observatory_time(self, current_time: float) -> None:
+        """Move the observatory model to a given time.
+
+        Parameters
+        ----------
+        current_time : `float`
+            Time (unix timestamp).
+        """
+        self.models["observatory_model"].update_state(current_time)
+        self.models["observatory_state"].set(
+            self.models["observatory_model"].current_state
+        )
+
+    def _timed(
+        self, name: str, func: typing.Callable[..., typing.Any], *args: typing.Any
+    ) -> typing.Any:
+        """Call a function and record how long it took.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the call.
+        func : `callable`
+            Function to call.
+        *args
+            Arguments passed to the function.
+
+        Returns
+        -------
+        `typing.Any`
+            Value returned by the function.
+        """
+        time_start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.latencies[name].append(time.perf_counter() - time_start)
+
+
+def run_throughput_benchmark() -> None:
+    """Run the feature scheduler throughput benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput of the feature scheduler driver "
+        "simulating full nights of observations, calling the driver directly "
+        "(the CSC Model layer is not included)."
+    )
+    parser.add_argument(
+        "scheduler_config", help="Feature scheduler configuration file."
+    )
+    parser.add_argument(
+        "--nights", type=int, default=1, help="Number of nights to simulate."
+    )
+    parser.add_argument(
+        "--max-targets-per-night",
+        type=int,
+        default=None,
+        help="Maximum number of targets per night, default is until sunrise.",
+    )
+    parser.add_argument(
+        "--observation-database",
+        default=None,
+        help="Observation database used by the scheduler.",
+    )
+    parser.add_argument(
+        "--slew-time-table-resolution",
+        type=float,
+        default=0.0,
+        help="Resolution of the slew time lookup table (degrees), "
+        "default is to compute the slew times with the observatory model.",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the results to this JSON file."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    log = logging.getLogger("ThroughputBenchmark")
+
+    benchmark = ThroughputBenchmark(
+        log=log,
+        scheduler_config=args.scheduler_config,
+        n_nights=args.nights,
+        max_targets_per_night=args.max_targets_per_night,
+        observation_database_name=args.observation_database,
+        slew_time_table_resolution=args.slew_time_table_resolution,
+    )
+
+    result = benchmark.run()
+
+    log.info(f"{result}")
+
+    if args.output is not None:
+        result.write_json(args.output)
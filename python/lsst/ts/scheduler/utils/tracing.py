@@ -0,0 +1,233 @@
+# This file is part of ts_scheduler.
+#
+# Developed for the Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["SpanHistogram", "Tracer", "tracer"]
+
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import typing
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Upper edges of the span duration histogram bins (in seconds), from 0.1 ms
+# to about 100 s, doubling at each bin. The last bin holds longer spans.
+SPAN_HISTOGRAM_EDGES = 1.0e-4 * 2.0 ** np.arange(21)
+
+
+@dataclass
+class SpanHistogram:
+    """Histogram of the duration of a span."""
+
+    count: int = 0
+    # Number of times the span was recorded.
+
+    total: float = 0.0
+    # Total duration (in seconds).
+
+    max: float = 0.0
+    # Maximum duration (in seconds).
+
+    bins: np.ndarray = field(
+        default_factory=lambda: np.zeros(len(SPAN_HISTOGRAM_EDGES) + 1, dtype=int)
+    )
+    # Number of spans in each bin, see `SPAN_HISTOGRAM_EDGES`.
+
+    def add(self, duration: float) -> None:
+        """Add a span duration to the histogram.
+
+        Parameters
+        ----------
+        duration : `float`
+            Span duration (in seconds).
+        """
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.bins[np.searchsorted(SPAN_HISTOGRAM_EDGES, duration)] += 1
+
+    @property
+    def mean(self) -> float:
+        """Mean duration (in seconds)."""
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the histogram as a json serializable dictionary."""
+        return dict(
+            count=self.count,
+            total=self.total,
+            mean=self.mean,
+            max=self.max,
+            bin_edges=SPAN_HISTOGRAM_EDGES.tolist(),
+            bins=self.bins.tolist(),
+        )
+
+
+class Tracer:
+    """Record the duration of the stages of the target production.
+
+    Spans are recorded as complete events of the Chrome trace event format,
+    which can be opened with Perfetto or chrome://tracing, and aggregated in
+    a histogram per span name.
+
+    Recording is disabled by default, in which case `span` does nothing.
+
+    Parameters
+    ----------
+    max_events : `int`, optional
+        Maximum number of events to keep. Older events are discarded; they
+        are still accounted for in the histograms.
+    """
+
+    def __init__(self, max_events: int = 100000) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._events: collections.deque = collections.deque(maxlen=max_events)
+        self._histograms: dict[str, SpanHistogram] = dict()
+
+    def configure(self, enabled: bool, max_events: int) -> None:
+        """Configure the tracer, discarding all recorded spans.
+
+        Parameters
+        ----------
+        enabled : `bool`
+            Record spans?
+        max_events : `int`
+            Maximum number of events to keep.
+        """
+        with self._lock:
+            self.enabled = enabled
+            self._events = collections.deque(maxlen=max_events)
+            self._histograms = dict()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: typing.Any) -> typing.Iterator[None]:
+        """Record the duration of a block of code.
+
+        This can be used from coroutines and from threads.
+
+        Parameters
+        ----------
+        name : `str`
+            Span name.
+        **args
+            Additional information to include in the trace event.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            event = dict(
+                name=name,
+                ph="X",
+                ts=start_time * 1.0e6,
+                dur=duration * 1.0e6,
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+            )
+            if args:
+                event["args"] = args
+            with self._lock:
+                self._events.append(event)
+                self._histograms.setdefault(name, SpanHistogram()).add(duration)
+
+    def get_histograms(self) -> dict[str, SpanHistogram]:
+        """Get a copy of the span histograms.
+
+        Returns
+        -------
+        `dict` [`str`, `SpanHistogram`]
+            Histograms, by span name.
+        """
+        with self._lock:
+            return {
+                name: SpanHistogram(
+                    count=histogram.count,
+                    total=histogram.total,
+                    max=histogram.max,
+                    bins=histogram.bins.copy(),
+                )
+                for name, histogram in self._histograms.items()
+            }
+
+    def get_summary(self) -> str:
+        """Get a summary of the spans, sorted by total duration.
+
+        Returns
+        -------
+        `str`
+            Summary, one line per span name.
+        """
+        histograms = sorted(
+            self.get_histograms().items(),
+            key=lambda item: item[1].total,
+            reverse=True,
+        )
+        return "\n".join(
+            [
+                f"{name}: count={histogram.count}, total={histogram.total:.3f}s, "
+                f"mean={histogram.mean * 1000.0:.1f}ms, "
+                f"max={histogram.max * 1000.0:.1f}ms"
+                for name, histogram in histograms
+            ]
+        )
+
+    def export_chrome_trace(self, filename: str) -> None:
+        """Write the recorded spans to a file in the Chrome trace event
+        format.
+
+        The histograms are included in the ``otherData`` entry.
+
+        Parameters
+        ----------
+        filename : `str`
+            Name of the file.
+        """
+        with self._lock:
+            events = list(self._events)
+
+        trace = dict(
+            traceEvents=events,
+            displayTimeUnit="ms",
+            otherData=dict(
+                histograms={
+                    name: histogram.as_dict()
+                    for name, histogram in self.get_histograms().items()
+                }
+            ),
+        )
+
+        with open(filename, "w") as fp:
+            json.dump(trace, fp)
+
+
+tracer = Tracer()
+"""Tracer shared by the Scheduler components."""
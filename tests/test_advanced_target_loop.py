@@ -25,6 +25,7 @@ import logging
 import os
 import pathlib
 import time
+import typing
 import unittest
 
 import numpy as np
@@ -32,7 +33,7 @@ import pytest
 import yaml
 from lsst.ts import salobj, utils
 from lsst.ts.scheduler import SchedulerCSC
-from lsst.ts.scheduler.mock import ObservatoryStateMock
+from lsst.ts.scheduler.mock import ObservatoryStateMock, ScriptQueueSimulator
 from lsst.ts.scheduler.utils import SchedulerModes
 from lsst.ts.scheduler.utils.csc_utils import BlockStatus, DetailedState
 from lsst.ts.scheduler.utils.error_codes import NO_QUEUE, UPDATE_TELEMETRY_ERROR
@@ -844,6 +845,90 @@ class AdvancedTargetLoopTestCase(
                 block_status_expected=BlockStatus.COMPLETED,
             )
 
+    async def test_telemetry_changed_regenerates_targets_queue(self) -> None:
+        async with ScriptQueueSimulator(
+            index=1, time_scale=0.2, log=self.log
+        ), SchedulerCSC(
+            index=1, config_dir=TEST_CONFIG_DIR, simulation_mode=SchedulerModes.MOCKS3
+        ) as self.scheduler, salobj.Remote(
+            self.scheduler.domain, "Scheduler", index=1
+        ) as self.scheduler_remote, ObservatoryStateMock():
+            await salobj.set_summary_state(
+                self.scheduler_remote,
+                salobj.State.ENABLED,
+                override="advance_target_loop_sequential_std_visit.yaml",
+            )
+
+            try:
+                await self.scheduler_remote.cmd_resume.start(timeout=STD_TIMEOUT)
+
+                # While the scheduled targets execute, the loop generates the
+                # next targets ahead of time.
+                await self.wait_for_condition(
+                    lambda: len(self.scheduler.targets_queue) > 0
+                    and self.scheduler._targets_queue_telemetry is not None
+                )
+
+                model = self.scheduler.model
+                targets = list(self.scheduler.targets_queue)
+                scheduler_state_filename = targets[0].get_scheduler_state_filename()
+                seeing = 2.0 * self.scheduler._targets_queue_telemetry["seeing"] + 1.0
+
+                async def update_telemetry_streams():
+                    model.raw_telemetry["seeing"] = seeing
+
+                with unittest.mock.patch.object(
+                    model,
+                    "update_telemetry_streams",
+                    side_effect=update_telemetry_streams,
+                ), unittest.mock.patch.object(
+                    model, "reset_state", wraps=model.reset_state
+                ) as reset_state, unittest.mock.patch.object(
+                    self.scheduler,
+                    "discard_targets_queue",
+                    wraps=self.scheduler.discard_targets_queue,
+                ) as discard_targets_queue:
+                    # Seeing changed beyond speculative_target_tolerance, the
+                    # targets queue is discarded and generated again.
+                    await self.wait_for_condition(
+                        lambda: unittest.mock.call()
+                        in discard_targets_queue.call_args_list
+                        and self.scheduler._targets_queue_telemetry is not None
+                        and self.scheduler._targets_queue_telemetry["seeing"] == seeing
+                    )
+
+                    reset_state.assert_any_call(scheduler_state_filename)
+                    assert not any(
+                        target in self.scheduler.targets_queue for target in targets
+                    )
+                    assert not os.path.exists(scheduler_state_filename)
+            finally:
+                await self.scheduler_remote.cmd_stop.set_start(
+                    abort=True, timeout=STD_TIMEOUT
+                )
+                await salobj.set_summary_state(
+                    self.scheduler_remote, salobj.State.STANDBY
+                )
+
+    async def wait_for_condition(
+        self, condition: typing.Callable[[], bool], timeout: float = SCRIPT_TIMEOUT
+    ) -> None:
+        """Wait for a condition to become true.
+
+        Parameters
+        ----------
+        condition : `typing.Callable`
+            Function that returns True when the condition is met.
+        timeout : `float`, optional
+            How long to wait for (in seconds).
+        """
+        start_time = time.monotonic()
+        while not condition():
+            assert (
+                time.monotonic() - start_time < timeout
+            ), "Timeout waiting for condition."
+            await asyncio.sleep(0.1)
+
     def tearDown(self):
         for filename in glob.glob("./sequential_*.p"):
             os.remove(filename)
@@ -0,0 +1,64 @@
+# This file is part of ts_scheduler
+#
+# Developed for the Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+
+import numpy as np
+from astropy import units
+from astropy.coordinates import Angle
+from lsst.ts.scheduler.driver.angle_format import format_dec, format_ra
+
+
+class TestAngleFormat(unittest.TestCase):
+    def setUp(self) -> None:
+        random_generator = np.random.default_rng(seed=123)
+        self.values = np.concatenate(
+            [
+                random_generator.uniform(-90.0, 90.0, size=500),
+                random_generator.uniform(0.0, 360.0, size=500),
+                [0.0, -0.0, -1e-4, 1e-12, 10.5, 180.0, 359.9999999999, -89.99999999],
+            ]
+        )
+
+    def test_format_ra(self) -> None:
+        expected = Angle(self.values, unit=units.degree).to_string(
+            unit=units.hourangle, sep=":", alwayssign=True
+        )
+
+        np.testing.assert_array_equal(format_ra(self.values), expected)
+
+        for value, expected_value in zip(self.values, expected):
+            assert format_ra(value) == expected_value
+
+    def test_format_dec(self) -> None:
+        expected = Angle(self.values, unit=units.degree).to_string(
+            unit=units.degree, sep=":", alwayssign=True
+        )
+
+        np.testing.assert_array_equal(format_dec(self.values), expected)
+
+        for value, expected_value in zip(self.values, expected):
+            assert format_dec(value) == expected_value
+
+    def test_format_nan(self) -> None:
+        assert format_dec(np.nan) == "nan"
+        np.testing.assert_array_equal(format_ra([np.nan, 0.0]), ["nan", "+0:00:00"])
@@ -25,17 +25,22 @@ import logging
 import os
 import pathlib
 import unittest
+import unittest.mock
 
 import numpy as np
 import pytest
-from lsst.ts import salobj
+from lsst.ts import observing, salobj
 from lsst.ts.scheduler import SchedulerCSC
-from lsst.ts.scheduler.mock import ObservatoryStateMock
+from lsst.ts.scheduler.driver.driver_target import DriverTarget
+from lsst.ts.scheduler.exceptions import TargetScriptFailedError
+from lsst.ts.scheduler.mock import ObservatoryStateMock, ScriptQueueSimulator
 from lsst.ts.scheduler.utils import SchedulerModes
 from lsst.ts.scheduler.utils.csc_utils import DetailedState
 from lsst.ts.scheduler.utils.error_codes import OBSERVATORY_STATE_UPDATE
+from lsst.ts.scheduler.utils.fbs_utils import SchemaConverter
+from lsst.ts.scheduler.utils.test.block_utils import get_test_obs_block
 from lsst.ts.xml.component_info import ComponentInfo
-from lsst.ts.xml.enums import Scheduler
+from lsst.ts.xml.enums import Scheduler, ScriptQueue
 
 SHORT_TIMEOUT = 10.0
 LONG_TIMEOUT = 30.0
@@ -553,6 +558,47 @@ class TestSchedulerCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase)
                     salobj.State.STANDBY,
                 )
 
+    async def test_get_reusable_predicted_targets(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.SIMULATION,
+        ):
+            observing_block = get_test_obs_block()
+            predicted_targets = [
+                DriverTarget(
+                    observing_block=observing_block,
+                    band_filter="r",
+                    ra_rad=0.1 * i,
+                    dec_rad=-0.5,
+                    note=f"target {i}",
+                )
+                for i in range(5)
+            ]
+
+            # Simulate a previous predicted schedule.
+            self.csc._predicted_schedule_targets = predicted_targets
+            self.csc._predicted_schedule_checkpoint = "checkpoint.p"
+
+            # Targets queue generated again, matching the prediction after
+            # the first target was sent to the queue.
+            self.csc.targets_queue = [
+                DriverTarget(
+                    observing_block=observing_block,
+                    band_filter="r",
+                    ra_rad=0.1 * i,
+                    dec_rad=-0.5,
+                    note=f"target {i}",
+                )
+                for i in range(1, 3)
+            ]
+
+            assert self.csc._get_reusable_predicted_targets() == predicted_targets[3:]
+
+            self.csc.targets_queue[1].filter = "g"
+
+            assert self.csc._get_reusable_predicted_targets() == []
+
     async def test_disable_while_computing_predicted_schedule(self):
         async with self.make_csc(
             config_dir=TEST_CONFIG_DIR,
@@ -599,6 +645,156 @@ class TestSchedulerCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase)
                     salobj.State.STANDBY,
                 )
 
+    async def test_stop_while_computing_predicted_schedule(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.MOCKS3,
+        ), ObservatoryStateMock(), self.make_script_queue(running=True):
+            try:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    override="advance_target_loop_fbs.yaml",
+                )
+
+                self.remote.evt_detailedState.flush()
+
+                compute_predicted_schedule_cmd_task = asyncio.create_task(
+                    self.remote.cmd_computePredictedSchedule.start(
+                        timeout=SHORT_TIMEOUT
+                    )
+                )
+
+                while True:
+                    detailed_state = await self.remote.evt_detailedState.next(
+                        flush=False,
+                        timeout=SHORT_TIMEOUT,
+                    )
+                    if (
+                        detailed_state.substate
+                        == DetailedState.COMPUTING_PREDICTED_SCHEDULE
+                    ):
+                        self.log.info("Stopping predicted schedule computation.")
+                        await self.remote.cmd_stop.start(timeout=SHORT_TIMEOUT)
+                        break
+
+                with self.assertRaises(salobj.AckError):
+                    await compute_predicted_schedule_cmd_task
+
+                assert self.csc._tasks["compute_predicted_schedule"].cancelled()
+
+            finally:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.STANDBY,
+                )
+
+    async def test_dry_mode(self):
+        output_database = pathlib.Path("dry_run_test_observations.db")
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.MOCKS3,
+        ), ObservatoryStateMock():
+            try:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    override="dry_target_loop_fbs.yaml",
+                )
+
+                self.remote.evt_detailedState.flush()
+
+                await self.remote.cmd_resume.start(timeout=SHORT_TIMEOUT)
+
+                await self.assert_next_sample(
+                    self.remote.evt_detailedState,
+                    flush=False,
+                    substate=DetailedState.RUNNING,
+                )
+                await self.assert_next_sample(
+                    self.remote.evt_detailedState,
+                    flush=False,
+                    timeout=LONG_LONG_TIMEOUT,
+                    substate=DetailedState.IDLE,
+                )
+
+                observations = SchemaConverter().opsim2obs(
+                    filename=output_database.as_posix()
+                )
+
+                assert len(observations) > 0
+                assert np.all(np.diff(observations["mjd"]) > 0.0)
+                assert (observations["mjd"][-1] - observations["mjd"][0]) * 24.0 < 1.0
+                assert self.csc.summary_state == salobj.State.ENABLED
+                if supports_observatory_status:
+                    assert not (
+                        self.csc.evt_observatoryStatus.data.status
+                        & Scheduler.ObservatoryStatus.OPERATIONAL
+                    )
+
+            finally:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.STANDBY,
+                )
+                if output_database.exists():
+                    output_database.unlink()
+
+    async def test_dry_mode_stop(self):
+        output_database = pathlib.Path("dry_run_test_observations.db")
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.MOCKS3,
+        ), ObservatoryStateMock():
+            try:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    override="dry_target_loop_fbs_night.yaml",
+                )
+
+                self.remote.evt_detailedState.flush()
+
+                await self.remote.cmd_resume.start(timeout=SHORT_TIMEOUT)
+
+                await self.assert_next_sample(
+                    self.remote.evt_detailedState,
+                    flush=False,
+                    substate=DetailedState.RUNNING,
+                )
+
+                # Let the simulation run for a while, it takes much longer to
+                # simulate the whole night.
+                await asyncio.sleep(SHORT_TIMEOUT)
+
+                # Stopping the simulation does not wait for it to finish and
+                # keeps the targets simulated so far.
+                await self.remote.cmd_stop.start(timeout=SHORT_TIMEOUT)
+
+                await self.assert_next_sample(
+                    self.remote.evt_detailedState,
+                    flush=False,
+                    substate=DetailedState.IDLE,
+                )
+
+                observations = SchemaConverter().opsim2obs(
+                    filename=output_database.as_posix()
+                )
+
+                assert len(observations) > 0
+                assert self.csc.summary_state == salobj.State.ENABLED
+
+            finally:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.STANDBY,
+                )
+                if output_database.exists():
+                    output_database.unlink()
+
     @pytest.mark.skipif(
         not supports_observatory_status,
         reason="CSC interface does not support observatory status feature.",
@@ -1793,6 +1989,193 @@ class TestSchedulerCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase)
             finally:
                 await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
 
+    async def test_queue_changed(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.SIMULATION,
+        ), self.make_script_queue(running=False) as queue:
+            queue_state, queue_version = await self.csc.queue_changed(
+                since_version=0, timeout=SHORT_TIMEOUT
+            )
+
+            assert not queue_state.running
+            assert queue_version == self.csc.queue_version
+            assert await self.csc.get_queue(request=True) is queue_state
+
+            await queue.evt_queue.set_write(running=True)
+
+            queue_state, new_queue_version = await self.csc.queue_changed(
+                since_version=queue_version, timeout=SHORT_TIMEOUT
+            )
+
+            assert queue_state.running
+            assert new_queue_version > queue_version
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.csc.queue_changed(
+                    since_version=new_queue_version, timeout=1.0
+                )
+
+    async def test_check_targets_queue_condition(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.SIMULATION,
+        ):
+            targets = [
+                unittest.mock.Mock(
+                    get_scheduler_state_filename=unittest.mock.Mock(
+                        return_value=f"scheduler_state_{i}.p"
+                    )
+                )
+                for i in range(4)
+            ]
+            self.csc.targets_queue = list(targets)
+            self.csc._targets_queue_validated_version = None
+            self.csc._targets_queue_validated_telemetry = None
+
+            with unittest.mock.patch.object(
+                self.csc.model,
+                "get_first_invalid_target",
+                new=unittest.mock.AsyncMock(return_value=2),
+            ) as get_first_invalid_target, unittest.mock.patch.object(
+                self.csc.model, "get_telemetry_snapshot", return_value=dict()
+            ), unittest.mock.patch.object(
+                self.csc.model, "telemetry_changed", return_value=False
+            ) as telemetry_changed, unittest.mock.patch.object(
+                self.csc.model, "reset_state"
+            ) as reset_state:
+                await self.csc.check_targets_queue_condition()
+
+                # Targets are discarded from the first invalid one onward,
+                # resetting the scheduler to the state before it.
+                get_first_invalid_target.assert_awaited_once_with(targets)
+                assert self.csc.targets_queue == targets[:2]
+                reset_state.assert_called_once_with("scheduler_state_2.p")
+                for target in targets[:2]:
+                    target.remove_scheduler_state.assert_not_called()
+                for target in targets[2:]:
+                    target.remove_scheduler_state.assert_called_once()
+                assert self.csc.targets_queue_condition.done()
+                assert self.csc.targets_queue_condition.result() is None
+
+                # Nothing changed since the last check, the targets are not
+                # validated again.
+                assert not self.csc._targets_queue_validation_needed()
+
+                await self.csc.check_targets_queue_condition()
+
+                get_first_invalid_target.assert_awaited_once()
+                assert self.csc.targets_queue == targets[:2]
+                assert not self.csc.targets_queue_condition.done()
+
+                # Telemetry or the ScriptQueue changed.
+                telemetry_changed.return_value = True
+                assert self.csc._targets_queue_validation_needed()
+
+                telemetry_changed.return_value = False
+                self.csc._queue_version += 1
+                assert self.csc._targets_queue_validation_needed()
+
+    async def test_queue_block_scripts_pipelined(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.SIMULATION,
+        ), ScriptQueueSimulator(time_scale=0.1, log=self.log) as script_queue:
+            observing_block = self.get_visits_block(n_scripts=4)
+            self.csc.model.register_new_block(id=observing_block.id)
+
+            sal_indices = [
+                sal_index
+                async for sal_index in self.csc._queue_block_scripts(observing_block)
+            ]
+
+            # The simulator assigns SAL indices in the order the add commands
+            # are received, starting from 100000.
+            assert sal_indices == [100000 + i for i in range(4)]
+            assert script_queue._next_sal_index == 100004
+            assert self.csc._pipelined_script_submission
+
+    async def test_queue_block_scripts_pipelined_out_of_order(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.SIMULATION,
+        ), ScriptQueueSimulator(log=self.log) as script_queue:
+            blocking_sal_index = await self.add_blocking_script()
+
+            # Make the ScriptQueue assign the SAL indices of the first two
+            # scripts in reverse order.
+            do_add = script_queue.do_add
+            out_of_order_sal_indices = [blocking_sal_index + 2, blocking_sal_index + 1]
+
+            async def do_add_out_of_order(data):
+                if out_of_order_sal_indices:
+                    script_queue._next_sal_index = out_of_order_sal_indices.pop(0)
+                    ackcmd = await do_add(data)
+                    if not out_of_order_sal_indices:
+                        script_queue._next_sal_index = blocking_sal_index + 3
+                    return ackcmd
+                return await do_add(data)
+
+            script_queue.controller.cmd_add.callback = do_add_out_of_order
+
+            observing_block = self.get_visits_block(n_scripts=2)
+            self.csc.model.register_new_block(id=observing_block.id)
+
+            sal_indices = [
+                sal_index
+                async for sal_index in self.csc._queue_block_scripts(observing_block)
+            ]
+
+            assert sal_indices == [blocking_sal_index + 3, blocking_sal_index + 4]
+            assert not self.csc._pipelined_script_submission
+            assert script_queue.queue == sal_indices
+            assert blocking_sal_index + 1 in script_queue.past_queue
+            assert blocking_sal_index + 2 in script_queue.past_queue
+
+    async def test_queue_block_scripts_pipelined_script_failed(self):
+        async with self.make_csc(
+            config_dir=TEST_CONFIG_DIR,
+            initial_state=salobj.State.STANDBY,
+            simulation_mode=SchedulerModes.SIMULATION,
+        ), ScriptQueueSimulator(log=self.log) as script_queue:
+            blocking_sal_index = await self.add_blocking_script()
+
+            observing_block = self.get_visits_block(n_scripts=4)
+            self.csc.model.register_new_block(id=observing_block.id)
+
+            # Fail the first script of the block as soon as it is added.
+            add_scheduled_script = self.csc.model.add_scheduled_script
+
+            async def add_scheduled_script_failed(id, sal_index):
+                script_final_state = await add_scheduled_script(
+                    id=id, sal_index=sal_index
+                )
+                if sal_index == blocking_sal_index + 1:
+                    script_final_state.set_exception(RuntimeError("Script failed."))
+                return script_final_state
+
+            sal_indices = []
+            with unittest.mock.patch.object(
+                self.csc.model,
+                "add_scheduled_script",
+                side_effect=add_scheduled_script_failed,
+            ), pytest.raises(TargetScriptFailedError):
+                async for sal_index in self.csc._queue_block_scripts(observing_block):
+                    sal_indices.append(sal_index)
+
+            # The scripts added before the failure was detected are yielded
+            # and no other script is added.
+            assert 0 < len(sal_indices) < 4
+            assert sal_indices == [
+                blocking_sal_index + 1 + i for i in range(len(sal_indices))
+            ]
+            assert script_queue._next_sal_index == sal_indices[-1] + 1
+            assert self.csc._pipelined_script_submission
+
     @pytest.mark.skipif(
         supports_observatory_status,
         reason="CSC interface supports observatory status feature.",
@@ -1857,6 +2240,62 @@ additionalProperties: true
             await queue.evt_queue.set_write(running=running)
             yield queue
 
+    @staticmethod
+    def get_visits_block(n_scripts: int) -> observing.ObservingBlock:
+        """Make an observing block with a number of visit scripts that the
+        `ScriptQueueSimulator` can run.
+
+        Parameters
+        ----------
+        n_scripts : `int`
+            Number of scripts in the block.
+
+        Returns
+        -------
+        `observing.ObservingBlock`
+            Observing block.
+        """
+        return observing.ObservingBlock(
+            name="OBS-123",
+            program="SITCOM-456",
+            scripts=[
+                observing.ObservingScript(
+                    name="standard_visit.py",
+                    standard=True,
+                    parameters={"exp_times": [1.0]},
+                )
+                for _ in range(n_scripts)
+            ],
+            constraints=[],
+        )
+
+    async def add_blocking_script(self) -> int:
+        """Add a long script to the ScriptQueue simulator and wait for it to
+        start executing, so the scripts added afterwards stay in the queue.
+
+        Returns
+        -------
+        `int`
+            SAL index of the blocking script.
+        """
+        ackcmd = await self.csc.queue_remote.cmd_add.set_start(
+            path="standard_visit.py",
+            config="exp_times: [1000.0]",
+            isStandard=True,
+            location=ScriptQueue.Location.LAST,
+            timeout=SHORT_TIMEOUT,
+        )
+        blocking_sal_index = int(ackcmd.result)
+
+        while self.csc._queue_state is None or (
+            self.csc._queue_state.currentSalIndex != blocking_sal_index
+        ):
+            await self.csc.queue_changed(
+                since_version=self.csc.queue_version, timeout=SHORT_TIMEOUT
+            )
+
+        return blocking_sal_index
+
     @contextlib.asynccontextmanager
     async def make_csc_cleanup_afterward(self):
         async with self.make_csc(
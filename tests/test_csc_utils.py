@@ -18,12 +18,21 @@
 #
 # You should have received a copy of the GNU General Public License
 
+import asyncio
+import time
+import types
 import unittest
 
-from lsst.ts.scheduler.utils.csc_utils import is_uri
+import numpy as np
+import pytest
+from lsst.ts.scheduler.utils.csc_utils import (
+    PredictedScheduleBuffer,
+    RateLimiter,
+    is_uri,
+)
 
 
-class TestCSCUtils(unittest.TestCase):
+class TestCSCUtils(unittest.IsolatedAsyncioTestCase):
     def test_is_uri_with_valid_uris(self):
         for valid_uri in self.get_valid_uris():
             assert is_uri(valid_uri)
@@ -32,6 +41,81 @@ class TestCSCUtils(unittest.TestCase):
         for invalid_uri in self.get_invalid_uris():
             assert not is_uri(invalid_uri)
 
+    async def test_rate_limiter(self):
+        rate_limiter = RateLimiter(rate=20.0)
+
+        start_time = time.monotonic()
+        for _ in range(5):
+            await rate_limiter.acquire()
+        elapsed_time = time.monotonic() - start_time
+
+        # First call does not wait, the following are spaced by 1/rate.
+        assert elapsed_time >= 4 / 20.0
+
+    async def test_rate_limiter_waits_only_if_needed(self):
+        rate_limiter = RateLimiter(rate=20.0)
+
+        await rate_limiter.acquire()
+        await asyncio.sleep(0.1)
+
+        start_time = time.monotonic()
+        await rate_limiter.acquire()
+        assert time.monotonic() - start_time < 1.0 / 20.0
+
+    async def test_rate_limiter_no_limit(self):
+        rate_limiter = RateLimiter(rate=0.0)
+
+        start_time = time.monotonic()
+        for _ in range(100):
+            await rate_limiter.acquire()
+
+        assert time.monotonic() - start_time < 0.1
+
+    def test_predicted_schedule_buffer(self):
+        buffer = PredictedScheduleBuffer(size=3)
+
+        buffer.extend(
+            [
+                types.SimpleNamespace(
+                    ra=10.0 * i,
+                    dec=-30.0,
+                    obs_time=60000.0 + i,
+                    exp_times=[15.0, 15.0],
+                    ang=0.0,
+                    filter=band_filter,
+                )
+                for i, band_filter in enumerate(["r", "i"])
+            ]
+        )
+
+        predicted_schedule = buffer.as_dict()
+
+        assert predicted_schedule["numberOfTargets"] == 2
+        assert predicted_schedule["instrumentConfiguration"] == "r,i"
+        np.testing.assert_array_equal(predicted_schedule["ra"][:2], [0.0, 10.0])
+        np.testing.assert_array_equal(predicted_schedule["exptime"][:2], [30.0, 30.0])
+        np.testing.assert_array_equal(predicted_schedule["nexp"][:2], [2.0, 2.0])
+        for param in ["ra", "decl", "mjd", "exptime", "rotSkyPos", "nexp"]:
+            assert len(predicted_schedule[param]) == 3
+            assert np.isnan(predicted_schedule[param][2])
+
+        buffer.clear()
+
+        assert len(buffer) == 0
+        assert buffer.as_dict()["instrumentConfiguration"] == ""
+        assert np.all(np.isnan(buffer.as_dict()["ra"]))
+
+    def test_predicted_schedule_buffer_full(self):
+        buffer = PredictedScheduleBuffer(size=1)
+        target = types.SimpleNamespace(
+            ra=0.0, dec=0.0, obs_time=60000.0, exp_times=[30.0], ang=0.0, filter="r"
+        )
+
+        buffer.append(target)
+
+        with pytest.raises(RuntimeError):
+            buffer.append(target)
+
     def get_valid_uris(self):
         return [
             "file:///home/saluser/rubin_sim_data/fbs_scheduler_2022-04-01T15:49:53.662.p",
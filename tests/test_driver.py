@@ -19,9 +19,11 @@
 # You should have received a copy of the GNU General Public License
 
 import logging
+import math
 import pathlib
 import types
 import unittest
+from unittest.mock import Mock
 
 from lsst.ts import observing
 from lsst.ts.observatory.model import Target
@@ -105,6 +107,32 @@ class TestSchedulerDriver(unittest.TestCase):
         assert target.num_exp > 0
         assert len(target.exp_times) == target.num_exp
 
+    def test_get_first_invalid_target(self):
+        targets = [self.driver.select_next_target() for _ in range(3)]
+
+        # Last target is at airmass ~2.9, above the default maximum.
+        altitudes = iter([math.radians(80.0), math.radians(60.0), math.radians(20.0)])
+
+        def get_slew_delay(target):
+            target.alt_rad = next(altitudes)
+            return 5.0, 0
+
+        self.driver.models["observatory_model"] = Mock(
+            get_slew_delay=Mock(side_effect=get_slew_delay)
+        )
+
+        assert self.driver.get_first_invalid_target(targets) == 2
+        assert self.driver.models["observatory_model"].observe.call_count == 2
+
+    def test_get_first_invalid_target_slew_error(self):
+        targets = [self.driver.select_next_target() for _ in range(3)]
+
+        self.driver.models["observatory_model"] = Mock(
+            get_slew_delay=Mock(return_value=(0.0, 1))
+        )
+
+        assert self.driver.get_first_invalid_target(targets) == 0
+
     def test_load(self):
         config = (
             pathlib.Path(__file__)
@@ -27,7 +27,10 @@ from astropy import units
 from astropy.coordinates import Angle
 from astropy.time import Time
 from lsst.ts.observatory.model import ObservatoryModel
-from lsst.ts.scheduler.driver.driver_target import DriverTarget
+from lsst.ts.scheduler.driver.driver_target import (
+    DriverTarget,
+    get_block_configuration_validator,
+)
 from lsst.ts.scheduler.exceptions import NonConsecutiveIndexError
 from lsst.ts.scheduler.utils.test.block_utils import get_test_obs_block
 
@@ -120,6 +123,41 @@ class TestDriverTarget(unittest.TestCase):
         assert script1_config == script1_expected_parameters
         assert script2_config == script2_expected_parameters
 
+    def test_get_observing_block_does_not_modify_template(self) -> None:
+        observing_block = get_test_obs_block()
+        template_parameters = [
+            script.get_script_configuration() for script in observing_block.scripts
+        ]
+
+        target = DriverTarget(
+            observing_block=observing_block,
+            band_filter="r",
+        )
+
+        target_observing_block = target.get_observing_block()
+
+        assert target_observing_block is not observing_block
+        assert target_observing_block.id == observing_block.id
+        assert target.get_observing_block() is target_observing_block
+        assert [
+            script.get_script_configuration() for script in observing_block.scripts
+        ] == template_parameters
+
+    def test_get_block_configuration_validator(self) -> None:
+        schema = """
+type: object
+properties:
+  grating:
+    type: string
+    default: empty_1
+additionalProperties: false
+"""
+        validator = get_block_configuration_validator(schema)
+
+        assert get_block_configuration_validator(schema) is validator
+        assert get_block_configuration_validator(schema + "\n") is not validator
+        assert validator.validate(dict()) == dict(grating="empty_1")
+
     def test_sal_index(self) -> None:
         observing_block = get_test_obs_block()
 
@@ -21,10 +21,20 @@
 import logging
 import os
 import pathlib
+import time
+import types
 import unittest
+import unittest.mock
 
+import numpy as np
 import pytest
-from lsst.ts.scheduler.driver import NoNsideError, NoSchedulerError, SurveyTopology
+from lsst.ts.scheduler.driver import (
+    Driver,
+    NoNsideError,
+    NoSchedulerError,
+    SurveyTopology,
+)
+from lsst.ts.scheduler.driver.reward_profiler import ProfiledCall, RewardProfiler
 from lsst.ts.scheduler.utils.test.feature_scheduler_sim import FeatureSchedulerSim
 from numpy import isscalar
 
@@ -178,6 +188,162 @@ class TestFeatureSchedulerDriver(unittest.TestCase):
             self.assertAlmostEqual(observed_dec, target_dec)
             self.assertEqual(observed_note, target_note)
 
+    def test_select_next_targets(self):
+        self.configure_scheduler_for_test()
+
+        self.driver.update_conditions()
+        current_time = self.driver.current_sunset
+        self.models["observatory_model"].update_state(current_time)
+        self.driver.update_conditions()
+
+        targets = self.driver.select_next_targets()
+
+        assert targets is not None
+        assert len(targets) > 0
+
+        for target in targets:
+            assert target is not None
+            assert target.slewtime >= 0.0
+            assert target.observation["slewtime"][0] == target.slewtime
+            assert target.observation["airmass"][0] == target.airmass
+
+    def test_get_validated_targets_from_observations(self):
+        self.configure_scheduler_for_test()
+
+        self.driver.update_conditions()
+        current_time = self.driver.current_sunset
+        self.models["observatory_model"].update_state(current_time)
+        self.driver.update_conditions()
+
+        observations = self.driver.scheduler.request_observation(
+            mjd=self.driver.next_observation_mjd, whole_queue=True
+        )
+
+        assert observations is not None
+
+        batch_targets = self.driver._get_validated_targets_from_observations(
+            [observation.copy() for observation in observations]
+        )
+        targets = [
+            self.driver._get_validated_target_from_observation(observation.copy())
+            for observation in observations
+        ]
+
+        assert len(batch_targets) == len(targets)
+
+        for batch_target, target in zip(batch_targets, targets):
+            if target is None:
+                assert batch_target is None
+                continue
+            for item in ["mjd", "slewtime", "skybrightness", "FWHMeff", "airmass"]:
+                assert batch_target.observation[item][0] == pytest.approx(
+                    target.observation[item][0]
+                )
+
+    def test_get_first_invalid_target_sky_brightness(self):
+        targets = self.get_targets_to_validate(n_targets=3)
+        conditions = self.driver.conditions
+        sky_brightness = conditions.skybrightness
+
+        # Sky gets brighter (2 mag/arcsec^2) when the second target would be
+        # observed.
+        format_conditions, mjds = self.make_format_conditions([20.0, 18.0, 20.0])
+
+        with unittest.mock.patch.object(
+            Driver, "_is_queued_target_valid", return_value=True
+        ), unittest.mock.patch.object(
+            self.driver, "_format_conditions", side_effect=format_conditions
+        ), unittest.mock.patch.object(
+            self.driver, "_get_survey_reward", return_value=1.0
+        ):
+            assert self.driver.get_first_invalid_target(targets) == 1
+
+        # Conditions are formatted at the time each target would be observed
+        # and the current conditions are restored afterwards.
+        assert len(mjds) == 2
+        assert mjds[1] > mjds[0]
+        assert self.driver.conditions is conditions
+        assert self.driver.conditions.skybrightness is sky_brightness
+
+    def test_get_first_invalid_target_masked_reward(self):
+        targets = self.get_targets_to_validate(n_targets=3)
+
+        format_conditions, _ = self.make_format_conditions([20.0, 20.0, 20.0])
+
+        with unittest.mock.patch.object(
+            Driver, "_is_queued_target_valid", return_value=True
+        ), unittest.mock.patch.object(
+            self.driver, "_format_conditions", side_effect=format_conditions
+        ), unittest.mock.patch.object(
+            self.driver, "_get_survey_reward", side_effect=[1.0, np.ma.masked]
+        ):
+            assert self.driver.get_first_invalid_target(targets) == 1
+
+        assert self.driver._get_survey_reward("no_such_survey", hpid=0) is None
+
+    def test_slew_time_table(self):
+        self.config.feature_scheduler_driver_configuration[
+            "slew_time_table_resolution"
+        ] = 1.0
+        self.configure_scheduler_for_test()
+
+        assert self.driver.slew_time_table is not None
+
+        self.driver.update_conditions()
+        current_time = self.driver.current_sunset
+        self.models["observatory_model"].update_state(current_time)
+        self.driver.update_conditions()
+
+        n_computed = self.driver.slew_time_table.n_computed
+
+        observations = self.driver.scheduler.request_observation(
+            mjd=self.driver.next_observation_mjd, whole_queue=True
+        )
+
+        assert observations is not None
+
+        targets = self.driver._get_validated_targets_from_observations(
+            [observation.copy() for observation in observations]
+        )
+        valid_targets = [target for target in targets if target is not None]
+
+        assert len(valid_targets) > 0
+
+        approximate_slew_times = [
+            self.models["observatory_model"].get_approximate_slew_delay(
+                alt_rad=np.array([target.alt_rad]),
+                az_rad=np.array([target.az_rad]),
+                goal_filter=target.filter,
+                lax_dome=True,
+            )[0]
+            for target in valid_targets
+        ]
+
+        for target, approximate_slew_time in zip(valid_targets, approximate_slew_times):
+            assert target.slewtime == pytest.approx(approximate_slew_time, abs=1.0)
+            assert target.observation["slewtime"][0] == target.slewtime
+
+        # The table for the current filter, computed with the conditions, is
+        # reused to validate the targets.
+        current_filter = self.models["observatory_model"].current_state.filter
+        if all(target.filter == current_filter for target in valid_targets):
+            assert self.driver.slew_time_table.n_computed == n_computed
+
+        # Targets in a filter that is not mounted are rejected.
+        unmounted_filter = valid_targets[0].filter
+        self.driver.conditions.mounted_bands = [
+            band_filter
+            for band_filter in self.driver.conditions.mounted_bands
+            if band_filter != unmounted_filter
+        ]
+        targets = self.driver._get_validated_targets_from_observations(
+            [observation.copy() for observation in observations]
+        )
+
+        assert all(
+            target is None or target.filter != unmounted_filter for target in targets
+        )
+
     def test_save_and_reset_from_file(self):
         self.configure_scheduler_for_test()
 
@@ -206,6 +372,62 @@ class TestFeatureSchedulerDriver(unittest.TestCase):
             with self.subTest(target_1=target_1, target_2=target_2):
                 self.assertEqual(f"{target_1}", f"{target_2}")
 
+    def test_reward_profiler(self):
+        self.config.feature_scheduler_driver_configuration["profile_rewards"] = True
+        self.config.feature_scheduler_driver_configuration["reward_profile_window"] = 5
+        self.configure_scheduler_for_test()
+
+        assert self.driver.reward_profiler is not None
+
+        filename = self.driver.save_state()
+        self.files_to_delete.append(filename)
+
+        self.run_observations(register_observations=False)
+
+        top_offenders = self.driver.reward_profiler.get_top_offenders()
+
+        assert 0 < len(top_offenders) <= self.driver.reward_profiler.top
+        assert all(duration >= 0.0 for _, duration in top_offenders)
+
+        # Profiler is not saved with the scheduler state, but is reinstalled
+        # when the state is restored.
+        self.driver.reset_from_state(filename)
+        for survey_list in self.driver.scheduler.survey_lists:
+            for survey in survey_list:
+                assert isinstance(
+                    survey.__dict__.get("calc_reward_function"), ProfiledCall
+                )
+
+    def test_reward_profiler_survey_time(self):
+        class BasisFunction:
+            def _calc_value(self):
+                time.sleep(0.05)
+
+        class Survey:
+            survey_name = "survey"
+
+            def __init__(self):
+                self.basis_functions = [BasisFunction()]
+
+            def calc_reward_function(self):
+                for basis_function in self.basis_functions:
+                    basis_function._calc_value()
+
+        survey = Survey()
+        reward_profiler = RewardProfiler(window=1, top=2, log=self.log)
+
+        assert (
+            reward_profiler.install(types.SimpleNamespace(survey_lists=[[survey]])) == 2
+        )
+
+        with reward_profiler.profile_request():
+            survey.calc_reward_function()
+
+        # The survey time does not include the time of its basis functions.
+        top_offenders = dict(reward_profiler.get_top_offenders())
+        assert top_offenders["survey/BasisFunction[0]"] >= 0.05
+        assert top_offenders["survey"] < 0.05
+
     def test_parse_observation_database(self):
         self.configure_scheduler_for_test()
         # self.files_to_delete.append(self.driver.observation_database_name)
@@ -284,6 +506,39 @@ class TestFeatureSchedulerDriver(unittest.TestCase):
 
         self.driver.configure_scheduler(self.config)
 
+    def get_targets_to_validate(self, n_targets):
+        """Select targets to validate, with the sky brightness of 20
+        mag/arcsec^2.
+        """
+        self.configure_scheduler_for_test()
+
+        self.driver.update_conditions()
+        self.models["observatory_model"].update_state(self.driver.current_sunset)
+        self.driver.update_conditions()
+
+        target = self.driver.select_next_target()
+        target.sky_brightness = 20.0
+
+        return [target] * n_targets
+
+    def make_format_conditions(self, sky_brightness_values):
+        """Make a replacement for `FeatureScheduler._format_conditions` that
+        sets a uniform sky brightness and records the time of the observatory
+        model when called.
+        """
+        sky_brightness_values = iter(sky_brightness_values)
+        mjds = []
+
+        def format_conditions():
+            mjds.append(self.models["observatory_model"].dateprofile.mjd)
+            value = next(sky_brightness_values)
+            self.driver.conditions.skybrightness = {
+                band: np.full_like(sky_brightness, value)
+                for band, sky_brightness in self.driver.conditions.skybrightness.items()
+            }
+
+        return format_conditions, mjds
+
     def run_observations(self, register_observations):
         return self.feature_scheduler_sim.run_observations(
             register_observations=register_observations
@@ -0,0 +1,92 @@
+# This file is part of ts_scheduler
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import asyncio
+import logging
+import time
+import unittest
+
+from lsst.ts.scheduler.utils.loop_monitor import (
+    EventLoopMonitor,
+    InstrumentedThreadPoolExecutor,
+)
+
+
+class TestLoopMonitor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.log = logging.getLogger("TestLoopMonitor")
+        self.executor = InstrumentedThreadPoolExecutor(max_workers=1)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    async def test_sample_lag(self):
+        loop_monitor = EventLoopMonitor(
+            log=self.log, sample_interval=0.05, warning_lag=0.1
+        )
+
+        sample_task = asyncio.create_task(loop_monitor.sample())
+        await asyncio.sleep(0)
+        # Block the event loop while the sample is being taken.
+        time.sleep(0.2)
+
+        with self.assertLogs(self.log, level=logging.WARNING):
+            lag = await sample_task
+
+        assert lag >= 0.1
+
+        summary = loop_monitor.get_summary()
+
+        assert summary.n_samples == 1
+        assert summary.lag_max == lag
+
+        loop_monitor.reset()
+
+        assert loop_monitor.get_summary() is None
+
+    async def test_executor_queue_depth(self):
+        loop_monitor = EventLoopMonitor(
+            log=self.log,
+            sample_interval=0.01,
+            warning_lag=1.0,
+            executor=self.executor,
+        )
+        loop = asyncio.get_running_loop()
+
+        tasks = [loop.run_in_executor(self.executor, time.sleep, 0.2) for _ in range(3)]
+        await loop_monitor.sample()
+
+        assert self.executor.running == 1
+        assert self.executor.pending == 2
+
+        await asyncio.gather(*tasks)
+
+        assert self.executor.running == 0
+        assert self.executor.pending == 0
+
+        summary = loop_monitor.get_summary()
+
+        assert summary.executor_pending_max == 2
+        assert summary.executor_running_max == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,11 +22,13 @@ import logging
 import pathlib
 import types
 import unittest
+import uuid
 from unittest.mock import AsyncMock, Mock, patch
 
 import yaml
 from lsst.ts.salobj import DefaultingValidator
 from lsst.ts.scheduler.driver.driver_target import DriverTarget
+from lsst.ts.scheduler.exceptions import TargetScriptFailedError
 from lsst.ts.scheduler.model import _MAX_OBSERVATIONS_FOR_SYNC_REGISTER, Model
 from lsst.ts.scheduler.utils.csc_utils import BlockStatus
 from lsst.ts.scheduler.utils.types import ValidationRules
@@ -190,10 +192,11 @@ class TestModel(unittest.IsolatedAsyncioTestCase):
         assert scheduled_target_info.unrecognized == []
         assert len(self.model.script_info) == 3
 
-        # targets done
-        self.model.script_info[10000].scriptState = ScriptState.DONE
-        self.model.script_info[10001].scriptState = ScriptState.DONE
-        self.model.script_info[10002].scriptState = ScriptState.DONE
+        # targets done, the target status is updated as the script
+        # information arrives.
+        await self.add_script(sal_index=10000, script_state=ScriptState.DONE)
+        await self.add_script(sal_index=10001, script_state=ScriptState.DONE)
+        await self.add_script(sal_index=10002, script_state=ScriptState.DONE)
 
         scheduled_target_info = await self.model.check_scheduled_targets()
 
@@ -221,9 +224,9 @@ class TestModel(unittest.IsolatedAsyncioTestCase):
         await self.add_script(sal_index=10005)
 
         # One target failed
-        self.model.script_info[10003].scriptState = ScriptState.DONE
-        self.model.script_info[10004].scriptState = ScriptState.DONE
-        self.model.script_info[10005].scriptState = ScriptState.FAILED
+        await self.add_script(sal_index=10003, script_state=ScriptState.DONE)
+        await self.add_script(sal_index=10004, script_state=ScriptState.DONE)
+        await self.add_script(sal_index=10005, script_state=ScriptState.FAILED)
 
         scheduled_target_info = await self.model.check_scheduled_targets()
 
@@ -238,13 +241,111 @@ class TestModel(unittest.IsolatedAsyncioTestCase):
         assert len(self.model.script_info) == 0
         assert len(self.model.get_scheduled_targets()) == 0
 
-    async def add_script(self, sal_index: int) -> None:
+    async def test_callback_script_info_block_scripts(self) -> None:
+        self.model.max_scripts = 3
+
+        block_uid = uuid.uuid4()
+        self.model.register_new_block(id=block_uid)
+
+        script_final_states = [
+            await self.model.add_scheduled_script(id=block_uid, sal_index=sal_index)
+            for sal_index in range(10000, 10003)
+        ]
+
+        await self.add_script(sal_index=10000, script_state=ScriptState.DONE)
+        await self.add_script(sal_index=10001, script_state=ScriptState.RUNNING)
+
+        assert script_final_states[0].result() == ScriptState.DONE
+        assert not script_final_states[1].done()
+        assert block_uid in self.model._block_scripts_final_state
+
+        await self.add_script(sal_index=10001, script_state=ScriptState.FAILED)
+
+        with self.assertRaises(TargetScriptFailedError):
+            await self.model.check_block_scripts(id=block_uid)
+
+        # Unrelated scripts should push the old script info out.
+        for sal_index in range(20000, 20003):
+            await self.add_script(sal_index=sal_index)
+
+        assert list(self.model.script_info) == [20000, 20001, 20002]
+
+        await self.model.mark_block_done(id=block_uid)
+
+        assert all(
+            script_final_state.done() for script_final_state in script_final_states
+        )
+        assert block_uid in self.model._blocks_done
+
+    async def add_script(
+        self, sal_index: int, script_state: ScriptState = ScriptState.UNKNOWN
+    ) -> None:
         script_info = types.SimpleNamespace(
             scriptSalIndex=sal_index,
-            scriptState=ScriptState.UNKNOWN,
+            scriptState=script_state,
         )
         await self.model.callback_script_info(script_info)
 
+    async def test_telemetry_changed(self) -> None:
+        self.model.raw_telemetry["seeing"] = 1.0
+        self.model.raw_telemetry["wind_speed"] = float("nan")
+
+        telemetry_snapshot = self.model.get_telemetry_snapshot()
+
+        assert telemetry_snapshot.keys() == {"seeing", "wind_speed"}
+        assert not self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+        self.model.raw_telemetry["seeing"] = 1.05
+        assert not self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+        self.model.raw_telemetry["seeing"] = 1.2
+        assert self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+        self.model.raw_telemetry["seeing"] = 1.0
+        self.model.raw_telemetry["wind_speed"] = 5.0
+        assert self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+    async def test_telemetry_changed_stream_tolerances(self) -> None:
+        self.model.telemetry_stream_handler = types.SimpleNamespace(
+            telemetry_streams=dict(
+                wind_speed=dict(change_tolerance=1.0, period=None),
+                wind_direction=dict(change_tolerance=20.0, period=360.0),
+            )
+        )
+        self.model.raw_telemetry["wind_speed"] = 0.0
+        self.model.raw_telemetry["wind_direction"] = 359.0
+
+        telemetry_snapshot = self.model.get_telemetry_snapshot()
+
+        # Small changes from zero are within the absolute tolerance.
+        self.model.raw_telemetry["wind_speed"] = 0.5
+        assert not self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+        self.model.raw_telemetry["wind_speed"] = 2.0
+        assert self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+        # Angles are compared with wrap-around.
+        self.model.raw_telemetry["wind_speed"] = 0.0
+        self.model.raw_telemetry["wind_direction"] = 1.0
+        assert not self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+        self.model.raw_telemetry["wind_direction"] = 30.0
+        assert self.model.telemetry_changed(telemetry_snapshot, tolerance=0.1)
+
+    async def test_get_general_info_from_night_boundaries(self) -> None:
+        config = self.get_sample_configuration()
+
+        await self.model.configure(config)
+
+        self.model.driver.is_night = False
+        self.model.driver.current_sunset = 1000.0
+        self.model.driver.current_sunrise = 2000.0
+
+        assert not self.model.get_general_info()["isNight"]
+        assert self.model.get_general_info(time=1500.0)["isNight"]
+        assert not self.model.get_general_info(time=2500.0)["isNight"]
+        assert self.model.get_general_info(time=1500.0)["sunset"] == 1000.0
+
     async def test_register_observations(self):
 
         config = self.get_sample_configuration()
@@ -0,0 +1,195 @@
+# This file is part of ts_scheduler
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+import logging
+import os
+import pathlib
+import pickle
+import types
+import unittest
+
+import numpy as np
+import pytest
+from lsst.ts.scheduler.driver import FeatureScheduler
+from lsst.ts.scheduler.predicted_schedule_ensemble import (
+    ScenarioTarget,
+    WeatherScenario,
+    init_scenario_worker,
+    make_weather_scenarios,
+    run_weather_scenario,
+    summarize_weather_scenarios,
+)
+from lsst.ts.scheduler.utils.test import FeatureSchedulerSim
+
+TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
+
+
+class TestPredictedScheduleEnsemble(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.log = logging.getLogger("TestPredictedScheduleEnsemble")
+        return super().setUpClass()
+
+    def test_make_weather_scenarios(self):
+        scenarios = make_weather_scenarios(
+            n_scenarios=4,
+            seeing_sigma=0.2,
+            cloud_sigma=0.1,
+            mounted_filters=[["g", "r", "i"], ["r", "i", "z"]],
+            seed=42,
+        )
+
+        assert len(scenarios) == 4
+        assert all(scenario.seeing_scale > 0.0 for scenario in scenarios)
+        assert [scenario.mounted_filters for scenario in scenarios] == [
+            ["g", "r", "i"],
+            ["r", "i", "z"],
+            ["g", "r", "i"],
+            ["r", "i", "z"],
+        ]
+        assert scenarios == make_weather_scenarios(
+            n_scenarios=4,
+            seeing_sigma=0.2,
+            cloud_sigma=0.1,
+            mounted_filters=[["g", "r", "i"], ["r", "i", "z"]],
+            seed=42,
+        )
+
+    def test_weather_scenario_apply(self):
+        observatory_state = types.SimpleNamespace(mountedfilters=["g", "r", "i"])
+        observatory_model = types.SimpleNamespace(
+            current_state=types.SimpleNamespace(mountedfilters=["g", "r", "i"])
+        )
+        driver = types.SimpleNamespace(
+            raw_telemetry=dict(seeing=1.0, bulk_cloud=0.95),
+            models=dict(
+                observatory_state=observatory_state,
+                observatory_model=observatory_model,
+            ),
+        )
+
+        WeatherScenario(
+            seeing_scale=1.5, cloud_offset=0.1, mounted_filters=["r", "i", "z"]
+        ).apply(driver)
+
+        assert driver.raw_telemetry["seeing"] == pytest.approx(1.5)
+        assert driver.raw_telemetry["bulk_cloud"] == pytest.approx(1.0)
+        assert observatory_state.mountedfilters == ["r", "i", "z"]
+        assert observatory_model.current_state.mountedfilters == ["r", "i", "z"]
+
+    def test_summarize_weather_scenarios(self):
+        nominal_targets = [
+            ScenarioTarget(
+                note="target 1", band_filter="r", ra=10.0, dec=-30.0, start_time=60000.0
+            ),
+            ScenarioTarget(
+                note="target 2", band_filter="r", ra=20.0, dec=-30.0, start_time=60000.1
+            ),
+            ScenarioTarget(
+                note="target 3", band_filter="g", ra=30.0, dec=-30.0, start_time=60000.2
+            ),
+        ]
+        one_second = 1.0 / 24.0 / 60.0 / 60.0
+        scenarios_targets = [
+            [
+                nominal_targets[0],
+                ScenarioTarget(
+                    note="target 2",
+                    band_filter="r",
+                    ra=20.0,
+                    dec=-30.0,
+                    start_time=60000.1 + 2.0 * one_second,
+                ),
+            ],
+            [nominal_targets[0], nominal_targets[1]],
+        ]
+
+        summary = summarize_weather_scenarios(
+            nominal_targets=nominal_targets, scenarios_targets=scenarios_targets
+        )
+
+        assert summary.n_scenarios == 2
+        np.testing.assert_array_equal(summary.probability, [1.0, 1.0, 0.0])
+        assert summary.start_time_mean[0] == pytest.approx(60000.0)
+        assert summary.start_time_std[0] == pytest.approx(0.0)
+        assert summary.start_time_std[1] == pytest.approx(1.0, rel=1e-3)
+        assert np.isnan(summary.start_time_mean[2])
+        assert np.isnan(summary.start_time_std[2])
+
+    def test_run_weather_scenario(self):
+        feature_scheduler_sim = FeatureSchedulerSim(log=self.log)
+        feature_scheduler_sim.configure_scheduler_for_test(TEST_CONFIG_DIR)
+        self.addCleanup(self.delete_files, feature_scheduler_sim.files_to_delete)
+
+        driver = feature_scheduler_sim.driver
+        observatory_model = feature_scheduler_sim.models["observatory_model"]
+
+        driver.update_conditions()
+        observatory_model.update_state(driver.current_sunset)
+        driver.update_conditions()
+
+        scenario_state = pickle.dumps((driver, []))
+
+        # The driver is restored with a new target id generator.
+        restored_driver, restored_targets = pickle.loads(scenario_state)
+        assert isinstance(restored_driver, FeatureScheduler)
+        assert restored_targets == []
+        assert "index_gen" not in restored_driver.__getstate__()
+        assert next(restored_driver.index_gen) == 1
+
+        init_scenario_worker(scenario_state)
+
+        nominal_targets = run_weather_scenario(
+            WeatherScenario(),
+            max_targets=5,
+            time_window=60.0 * 60.0,
+            time_delta_no_target=feature_scheduler_sim.no_target_time_step,
+        )
+
+        assert 0 < len(nominal_targets) <= 5
+        assert all(isinstance(target, ScenarioTarget) for target in nominal_targets)
+        assert all(
+            next_target.start_time > target.start_time
+            for target, next_target in zip(nominal_targets, nominal_targets[1:])
+        )
+
+        # Each scenario starts from the same state, and the live driver is
+        # not affected.
+        assert (
+            run_weather_scenario(
+                WeatherScenario(),
+                max_targets=5,
+                time_window=60.0 * 60.0,
+                time_delta_no_target=feature_scheduler_sim.no_target_time_step,
+            )
+            == nominal_targets
+        )
+        assert observatory_model.current_state.time == pytest.approx(
+            driver.current_sunset
+        )
+
+    def delete_files(self, filenames):
+        for filename in filenames:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# This file is part of ts_scheduler
+#
+# Developed for the Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from string import Template
+
+import yaml
+from lsst.ts.scheduler.driver.driver_target import DriverTarget
+from lsst.ts.scheduler.driver.script_configuration_template import (
+    ScriptConfigurationTemplate,
+    get_script_configuration_templates,
+)
+from lsst.ts.scheduler.utils.test.block_utils import get_test_obs_block
+
+
+class TestScriptConfigurationTemplate(unittest.TestCase):
+    def test_format(self) -> None:
+        configuration = yaml.safe_dump(
+            dict(
+                name="$name",
+                ra="$ra",
+                dec="${dec}",
+                num_exp="$num_exp",
+                exp_times="$exp_times",
+                note="Static note will be preserved.",
+                nested=dict(values=["$band_filter", "Target $name"]),
+            )
+        )
+
+        script_config = dict(
+            name="tile1",
+            ra=repr("+12:00:00.5"),
+            dec=repr("-30:00:00"),
+            num_exp=2,
+            exp_times=[15.0, 15.0],
+            band_filter="r",
+        )
+
+        expected_parameters = yaml.safe_load(
+            Template(configuration).substitute(**script_config)
+        )
+
+        parameters = ScriptConfigurationTemplate(configuration).format(script_config)
+
+        assert parameters == expected_parameters
+
+    def test_format_missing_placeholder(self) -> None:
+        configuration = yaml.safe_dump(dict(name="$name"))
+
+        with self.assertRaises(KeyError):
+            ScriptConfigurationTemplate(configuration).format(dict())
+
+    def test_get_script_configuration_templates(self) -> None:
+        observing_block = get_test_obs_block()
+
+        templates = get_script_configuration_templates(observing_block)
+
+        assert len(templates) == len(observing_block.scripts)
+        assert get_script_configuration_templates(observing_block) is templates
+
+    def test_format_config(self) -> None:
+        observing_block = get_test_obs_block()
+
+        target = DriverTarget(
+            observing_block=observing_block,
+            band_filter="r",
+        )
+
+        script_config = target.get_script_config()
+
+        for script, formatted_script in zip(
+            observing_block.scripts, target.format_config().scripts
+        ):
+            expected_parameters = yaml.safe_load(
+                Template(script.get_script_configuration()).substitute(**script_config)
+            )
+            assert formatted_script.parameters == expected_parameters
+
+
+if __name__ == "__main__":
+    unittest.main()
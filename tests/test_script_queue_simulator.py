@@ -0,0 +1,136 @@
+# This file is part of ts_scheduler
+#
+# Developed for the LSST Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import logging
+import pathlib
+import typing
+import unittest
+
+import pytest
+from lsst.ts import salobj, utils
+from lsst.ts.scheduler.mock import ScriptQueueSimulator
+from lsst.ts.scheduler.utils.test import AdvanceLoopBenchmark
+from lsst.ts.xml.enums import Script, ScriptQueue
+
+STD_TIMEOUT = 15.0
+TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
+
+
+class TestScriptQueueSimulator(unittest.IsolatedAsyncioTestCase):
+    def run(self, result: typing.Any) -> None:
+        salobj.set_random_lsst_dds_partition_prefix()
+        with utils.modify_environ(LSST_SITE="test"):
+            super().run(result)
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.log = logging.getLogger("TestScriptQueueSimulator")
+
+    async def test_get_script_duration(self):
+        async with ScriptQueueSimulator(
+            time_scale=0.5, script_overhead=2.0, log=self.log
+        ) as script_queue:
+            assert script_queue.get_script_duration("") == pytest.approx(1.0)
+            assert script_queue.get_script_duration(
+                "exp_times: [15, 15]\nband_filter: r"
+            ) == pytest.approx(16.0)
+            assert script_queue.get_script_duration(
+                "estimated_slew_time: 4.0"
+            ) == pytest.approx(3.0)
+
+    async def test_add_and_stop_scripts(self):
+        async with ScriptQueueSimulator(
+            time_scale=0.1, log=self.log
+        ) as script_queue, salobj.Remote(
+            script_queue.controller.domain, "ScriptQueue", index=1
+        ) as remote:
+            ack_1 = await remote.cmd_add.set_start(
+                path="standard_visit.py",
+                config="exp_times: [1.0]",
+                isStandard=True,
+                location=ScriptQueue.Location.LAST,
+                timeout=STD_TIMEOUT,
+            )
+            ack_2 = await remote.cmd_add.set_start(
+                path="standard_visit.py",
+                config="exp_times: [100.0]",
+                isStandard=True,
+                location=ScriptQueue.Location.LAST,
+                timeout=STD_TIMEOUT,
+            )
+
+            sal_index_1, sal_index_2 = int(ack_1.result), int(ack_2.result)
+
+            assert sal_index_2 == sal_index_1 + 1
+
+            script = await remote.evt_script.next(flush=False, timeout=STD_TIMEOUT)
+            while not (
+                script.scriptSalIndex == sal_index_1
+                and script.scriptState == Script.ScriptState.DONE
+            ):
+                script = await remote.evt_script.next(flush=False, timeout=STD_TIMEOUT)
+
+            remote.evt_queue.flush()
+            await remote.cmd_showQueue.start(timeout=STD_TIMEOUT)
+            queue = await remote.evt_queue.next(flush=False, timeout=STD_TIMEOUT)
+
+            assert queue.running
+            assert queue.currentSalIndex == sal_index_2
+            assert queue.length == 0
+            assert queue.pastSalIndices[0] == sal_index_1
+
+            stop_scripts = remote.cmd_stopScripts.DataType()
+            stop_scripts.length = 1
+            stop_scripts.terminate = False
+            stop_scripts.salIndices[0] = sal_index_2
+            await remote.cmd_stopScripts.start(stop_scripts, timeout=STD_TIMEOUT)
+
+            script = await remote.evt_script.next(flush=False, timeout=STD_TIMEOUT)
+            while not (
+                script.scriptSalIndex == sal_index_2
+                and script.scriptState == Script.ScriptState.STOPPED
+            ):
+                script = await remote.evt_script.next(flush=False, timeout=STD_TIMEOUT)
+
+            assert script_queue.number_of_scripts_done == 2
+            assert len(script_queue.idle_gaps) == 1
+            assert script_queue.idle_gaps[0] >= 0.0
+
+    async def test_advance_loop_benchmark(self):
+        benchmark = AdvanceLoopBenchmark(
+            log=self.log,
+            config_dir=TEST_CONFIG_DIR,
+            override="advance_target_loop_sequential_std_visit.yaml",
+            max_targets=2,
+            timeout=120.0,
+            time_scale=0.1,
+        )
+
+        result = await benchmark.run()
+
+        assert result.number_of_targets >= 2
+        assert result.number_of_scripts > 0
+        assert result.generation_latency.count > 0
+        assert result.idle_gaps.count <= result.number_of_scripts
+
+
+if __name__ == "__main__":
+    unittest.main()
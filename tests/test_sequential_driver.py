@@ -28,6 +28,7 @@ from lsst.ts.astrosky.model import AstronomicalSkyModel
 from lsst.ts.dateloc import ObservatoryLocation
 from lsst.ts.observatory.model import ObservatoryModel, ObservatoryState
 from lsst.ts.scheduler.driver import SequentialScheduler, SurveyTopology
+from lsst.ts.scheduler.driver.driver_target import DriverTarget
 from lsst.ts.scheduler.utils.test import FeatureSchedulerSim
 from lsst.ts.utils import current_tai
 from rubin_scheduler.site_models.cloud_model import CloudModel
@@ -107,6 +108,36 @@ class TestSequentialScheduler(unittest.TestCase):
 
         self.assertGreater(n_targets, 0)
 
+    def test_select_next_target_candidates(self):
+        self.driver.configure_scheduler(self.config)
+
+        n_observing_list = len(self.driver.observing_list_dict)
+
+        n_targets = self.run_observations()
+
+        # Targets are removed from the observing list and its index.
+        assert len(self.driver.observing_list_dict) == n_observing_list - n_targets
+        assert self.driver._observing_list_ids == list(self.driver.observing_list_dict)
+        assert len(self.driver._observing_list_ra_rad) == len(
+            self.driver._observing_list_ids
+        )
+
+        # None of the remaining targets can be observed.
+        for index in self.driver._get_observing_list_candidates():
+            config = self.driver.observing_list_dict[
+                self.driver._observing_list_ids[index]
+            ]
+            target = DriverTarget(
+                observing_block=self.driver.get_survey_observing_block(
+                    survey_name=config["program"]
+                ),
+                ra_rad=self.driver._observing_list_ra_rad[index],
+                dec_rad=self.driver._observing_list_dec_rad[index],
+                band_filter=config["instrument_setup"][0]["filter"],
+            )
+            _, error = self.models["observatory_model"].get_slew_delay(target)
+            assert error > 0
+
     def test_load(self):
         config = (
             pathlib.Path(__file__)
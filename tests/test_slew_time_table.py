@@ -0,0 +1,149 @@
+# This file is part of ts_scheduler
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import math
+import pickle
+import types
+import unittest
+
+import numpy as np
+import pytest
+from lsst.ts.scheduler.driver.slew_time_table import SlewTimeTable, radec2altaz
+
+
+class TestSlewTimeTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.current_state = types.SimpleNamespace(
+            telalt_rad=math.radians(60.0),
+            telaz_rad=math.radians(90.0),
+            telrot_rad=0.0,
+            domalt_rad=math.radians(60.0),
+            domaz_rad=math.radians(90.0),
+            filter="r",
+        )
+        self.observatory_model = types.SimpleNamespace(
+            current_state=self.current_state,
+            params=types.SimpleNamespace(
+                telalt_minpos_rad=math.radians(20.0),
+                telalt_maxpos_rad=math.radians(86.5),
+            ),
+            get_approximate_slew_delay=self.get_approximate_slew_delay,
+        )
+
+    def get_approximate_slew_delay(self, alt_rad, az_rad, goal_filter, lax_dome):
+        # Slew time linear on the distance in altitude and azimuth, plus a
+        # filter change.
+        return (
+            3.0 * np.abs(alt_rad - self.current_state.telalt_rad)
+            + 2.0 * np.abs(az_rad - self.current_state.telaz_rad)
+            + (120.0 if goal_filter != self.current_state.filter else 0.0)
+        )
+
+    def test_get_slew_delay(self):
+        slew_time_table = SlewTimeTable(resolution=1.0)
+
+        rng = np.random.default_rng(42)
+        alt_rad = rng.uniform(math.radians(20.0), math.radians(86.5), 100)
+        az_rad = rng.uniform(0.0, math.radians(359.0), 100)
+
+        for band_filter in ["r", "g"]:
+            np.testing.assert_allclose(
+                slew_time_table.get_slew_delay(
+                    observatory_model=self.observatory_model,
+                    alt_rad=alt_rad,
+                    az_rad=az_rad,
+                    goal_filter=band_filter,
+                ),
+                self.get_approximate_slew_delay(alt_rad, az_rad, band_filter, True),
+                atol=0.05,
+            )
+
+        assert slew_time_table.n_computed == 2
+
+        # Same state, the tables are reused.
+        slew_time_table.get_slew_delay(
+            observatory_model=self.observatory_model,
+            alt_rad=alt_rad,
+            az_rad=az_rad,
+            goal_filter="r",
+        )
+        assert slew_time_table.n_computed == 2
+
+        # The telescope moved less than the table resolution, for instance
+        # while tracking, the tables are reused.
+        self.current_state.telaz_rad += math.radians(0.1)
+        self.current_state.domaz_rad += math.radians(0.1)
+        slew_time_table.get_slew_delay(
+            observatory_model=self.observatory_model,
+            alt_rad=alt_rad,
+            az_rad=az_rad,
+            goal_filter="r",
+        )
+        assert slew_time_table.n_computed == 2
+
+        # Observatory state changed, the table is computed again.
+        self.current_state.telaz_rad = math.radians(180.0)
+        slew_time = slew_time_table.get_slew_delay(
+            observatory_model=self.observatory_model,
+            alt_rad=alt_rad,
+            az_rad=az_rad,
+            goal_filter="r",
+        )
+        assert slew_time_table.n_computed == 3
+        np.testing.assert_allclose(
+            slew_time,
+            self.get_approximate_slew_delay(alt_rad, az_rad, "r", True),
+            atol=0.05,
+        )
+
+    def test_pickle(self):
+        slew_time_table = SlewTimeTable(resolution=1.0)
+        slew_time_table.get_slew_delay(
+            observatory_model=self.observatory_model,
+            alt_rad=np.array([1.0]),
+            az_rad=np.array([1.0]),
+            goal_filter="r",
+        )
+
+        unpickled_slew_time_table = pickle.loads(pickle.dumps(slew_time_table))
+
+        assert unpickled_slew_time_table.resolution == 1.0
+        assert unpickled_slew_time_table.update(self.observatory_model)
+
+    def test_radec2altaz(self):
+        latitude_rad = math.radians(-30.0)
+
+        alt_rad, az_rad = radec2altaz(
+            ra_rad=np.array([1.0, 1.0, 1.0]),
+            dec_rad=np.array([latitude_rad, latitude_rad - 0.5, latitude_rad]),
+            lst_rad=np.array([1.0, 1.0, 1.5]),
+            latitude_rad=latitude_rad,
+        )
+
+        assert alt_rad[0] == pytest.approx(math.pi / 2.0)
+        assert alt_rad[1] == pytest.approx(math.pi / 2.0 - 0.5)
+        assert az_rad[1] == pytest.approx(math.pi)
+        # West of the meridian.
+        assert math.pi < az_rad[2] < 2.0 * math.pi
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# This file is part of ts_scheduler
+#
+# Developed for the LSST Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import json
+import logging
+import pathlib
+import tempfile
+import unittest
+
+from lsst.ts.scheduler.utils.test import (
+    SnapshotBenchmark,
+    SnapshotBenchmarkResult,
+    make_synthetic_observations,
+)
+
+TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
+
+
+class TestSnapshotBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.log = logging.getLogger("TestSnapshotBenchmark")
+        return super().setUpClass()
+
+    def test_make_synthetic_observations(self):
+        observations = make_synthetic_observations(n_observations=100, mjd_end=60000.0)
+
+        assert len(observations) == 100
+        assert all(observations["mjd"] < 60000.0)
+        assert all(observations["mjd"][1:] >= observations["mjd"][:-1])
+
+    def test_run(self):
+        benchmark = SnapshotBenchmark(
+            log=self.log,
+            scheduler_configs=[TEST_CONFIG_DIR.joinpath("fbs_config_good.py")],
+            history_sizes=[100, 0],
+            repeat=2,
+        )
+
+        results = benchmark.run()
+
+        assert len(results) == 2
+        assert [result.history_size for result in results] == [0, 100]
+
+        for result in results:
+            assert isinstance(result, SnapshotBenchmarkResult)
+            assert result.snapshot_size > 0
+            assert result.save_time.count == 2
+            assert result.restore_time.count == 2
+            assert result.upload_time.count == 2
+            assert set(result.component_sizes) == {
+                "scheduler",
+                "surveys",
+                "basis_functions",
+                "features",
+                "conditions",
+            }
+            assert result.component_sizes["surveys"] > 0
+
+    def test_write_json(self):
+        result = SnapshotBenchmarkResult(
+            scheduler_config="fbs_config_good.py",
+            history_size=100,
+            snapshot_size=1000,
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = pathlib.Path(tmpdir).joinpath("result.json")
+            result.write_json(filename)
+
+            with open(filename) as fp:
+                data = json.load(fp)
+
+        assert data["history_size"] == 100
+        assert data["snapshot_size"] == 1000
+        assert "upload_time" in data
+        assert "version" in data
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# This file is part of ts_scheduler
+#
+# Developed for the LSST Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import json
+import logging
+import pathlib
+import tempfile
+import unittest
+
+import pytest
+from lsst.ts.scheduler.utils.test import (
+    LatencyStats,
+    ThroughputBenchmark,
+    ThroughputBenchmarkResult,
+)
+
+
+class TestThroughputBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.log = logging.getLogger("TestThroughputBenchmark")
+        return super().setUpClass()
+
+    def test_latency_stats(self):
+        stats = LatencyStats.from_samples([0.1, 0.2, 0.3, 0.4])
+
+        assert stats.count == 4
+        assert stats.mean == pytest.approx(0.25)
+        assert stats.p50 == pytest.approx(0.25)
+        assert stats.max == pytest.approx(0.4)
+
+        assert LatencyStats.from_samples([]) == LatencyStats()
+
+    def test_run(self):
+        data_dir = pathlib.Path(__file__).parent.joinpath("data")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            benchmark = ThroughputBenchmark(
+                log=self.log,
+                scheduler_config=data_dir.joinpath("config", "fbs_config_good.py"),
+                n_nights=2,
+                max_targets_per_night=5,
+                observation_database_name=pathlib.Path(tmp_dir).joinpath(
+                    "observation_database"
+                ),
+            )
+
+            result = benchmark.run()
+
+            assert isinstance(result, ThroughputBenchmarkResult)
+            assert result.n_nights == 2
+            assert result.number_of_targets == 10
+            assert result.targets_per_second > 0.0
+            assert result.peak_rss > 0
+            assert len(result.snapshot_sizes) == 2
+            assert all(size > 0 for size in result.snapshot_sizes)
+            assert result.latencies["select_next_target"].count >= 10
+            assert result.latencies["register_observed_target"].count == 10
+            assert result.latencies["save_state"].count == 2
+
+            filename = pathlib.Path(tmp_dir).joinpath("benchmark.json")
+            result.write_json(filename)
+
+            with open(filename) as fp:
+                data = json.load(fp)
+
+        assert data["number_of_targets"] == 10
+        assert "p99" in data["latencies"]["update_conditions"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# This file is part of ts_scheduler
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from lsst.ts.scheduler.utils.tracing import Tracer
+
+
+class TestTracing(unittest.TestCase):
+    def test_span_disabled(self):
+        tracer = Tracer()
+
+        with tracer.span("stage"):
+            pass
+
+        assert tracer.get_histograms() == dict()
+
+    def test_span(self):
+        tracer = Tracer()
+        tracer.configure(enabled=True, max_events=2)
+
+        for _ in range(3):
+            with tracer.span("stage", target="target"):
+                time.sleep(0.01)
+
+        def run_in_thread():
+            with tracer.span("thread_stage"):
+                pass
+
+        thread = threading.Thread(target=run_in_thread)
+        thread.start()
+        thread.join()
+
+        histograms = tracer.get_histograms()
+
+        assert histograms.keys() == {"stage", "thread_stage"}
+        assert histograms["stage"].count == 3
+        assert histograms["stage"].bins.sum() == 3
+        assert histograms["stage"].total >= 0.03
+        assert histograms["stage"].max >= histograms["stage"].mean
+        assert tracer.get_summary().startswith("stage:")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "trace.json")
+            tracer.export_chrome_trace(filename)
+
+            with open(filename) as fp:
+                trace = json.load(fp)
+
+        # Only the last events are kept, the histograms have all of them.
+        assert [event["name"] for event in trace["traceEvents"]] == [
+            "stage",
+            "thread_stage",
+        ]
+        assert trace["traceEvents"][0]["ph"] == "X"
+        assert trace["traceEvents"][0]["args"] == dict(target="target")
+        assert trace["traceEvents"][0]["tid"] != trace["traceEvents"][1]["tid"]
+        assert trace["otherData"]["histograms"]["stage"]["count"] == 3
+
+
+if __name__ == "__main__":
+    unittest.main()